@@ -30,12 +30,10 @@ RESULTS_DIR="results/run_$TIMESTAMP"
 mkdir -p "$RESULTS_DIR"
 
 # Run the appropriate algorithm
-if [ "$ALGORITHM" == "figdp" ]; then
-    echo "Running FIG-DP algorithm with size=$SIZE, k=$K..."
-    python -c "from src.FIG_DP.fig_dp import FIGDP; import numpy as np; seq1 = ''.join(np.random.choice(['A', 'C', 'G', 'T'], size=$SIZE)); seq2 = ''.join(np.random.choice(['A', 'C', 'G', 'T'], size=$SIZE)); solver = FIGDP(seq1, seq2, $K); length, seq, time = solver.solve(); print(f'Length: {length}, Time: {time:.4f}s')"
-elif [ "$ALGORITHM" == "rmqfig" ]; then
-    echo "Running RMQ-FIG algorithm with size=$SIZE, k=$K..."
-    python -c "from src.RMQ_FIG.rmq_fig import RMQFIG; import numpy as np; seq1 = ''.join(np.random.choice(['A', 'C', 'G', 'T'], size=$SIZE)); seq2 = ''.join(np.random.choice(['A', 'C', 'G', 'T'], size=$SIZE)); solver = RMQFIG(seq1, seq2, $K); length, seq, time = solver.solve(); print(f'Length: {length}, Time: {time:.4f}s')"
+if [ "$ALGORITHM" == "figdp" ] || [ "$ALGORITHM" == "rmqfig" ] || [ "$ALGORITHM" == "greedy" ]; then
+    echo "Running $ALGORITHM with size=$SIZE, k=$K..."
+    python -c "import sys; sys.path.insert(0, 'src'); from workload import uniform_pair; print(*uniform_pair($SIZE, seed=None))" \
+        | python src/lcsfig.py --algorithm "$ALGORITHM" --gap "$K" | tee "$RESULTS_DIR/results.jsonl"
 else
     echo "Running comparison with size=$SIZE, k=$K..."
     python src/compare_algorithms.py --size $SIZE --gap $K
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Banded LCS-FIG table for closely related sequences.
+
+Every gap-window maximum is the cell (i-1,j-1), so the table is the plain
+LCS table and a cell only depends on its three neighbours. BandedTable
+keeps the cells on the diagonals j-i = lo..hi, lo = min(0, m-n) - width and
+hi = max(0, m-n) + width: n+1 rows of |m-n| + 2*width + 1 cells, i.e.
+O(n * (|n-m| + width)) instead of (n+1)(m+1), each holding the best common
+subsequence over paths that stay in the band. The band only saves memory
+when the lengths are close.
+
+A path leaving the band needs so many unmatched steps that it can reach at
+most max(j-hi-1, i+lo-1) at cell (i,j), so a band cell holding at least
+that is proven equal to the full table. Cells outside the band are read as
+the last band cell of their row (right of the band) or column (left of the
+band), which keeps the table monotone for the traceback.
+"""
+
+import numpy as np
+from typing import List, Optional, Union
+from encoding import encode_pair, table_dtype
+from predecessors import monotone_backtrack
+
+# Initial width of band='auto', doubled until the result is proven exact
+AUTO_BAND = 16
+
+class BandedTable:
+    """The diagonals lo..hi of the LCS-FIG table of two sequences."""
+    def __init__(self, X: str, Y: str, width: int):
+        """
+        Compute the band of the table of X and Y.
+
+        Args:
+            X: First sequence
+            Y: Second sequence
+            width: Diagonals kept on each side of the ones joining the corners
+        """
+        if width < 0:
+            raise ValueError(f"Band width must be non-negative, got {width}")
+        n, m = len(X), len(Y)
+        self.lo = min(0, m - n) - width
+        self.hi = max(0, m - n) + width
+        self.n, self.m = n, m
+        size = self.hi - self.lo + 1
+        self.band = np.zeros((n+1, size), dtype=table_dtype(n, m))
+        # Entry d of row i is the cell (i, i+lo+d). Cells left of column 0
+        # stay 0, cells right of column m are never read
+        x, y = encode_pair(X, Y)
+        y = np.concatenate((np.zeros(1, dtype=y.dtype), y))
+        j = np.arange(1, n+1)[:, None] + self.lo + np.arange(size)
+        match = (y[np.clip(j, 0, m)] == x[:, None]) & (j >= 1) & (j <= m)
+        match = match.astype(self.band.dtype)
+        for i in range(1, n+1):
+            prev = self.band[i-1]
+            cand = prev + match[i-1]
+            np.maximum(cand[:-1], prev[1:], out=cand[:-1])
+            np.maximum.accumulate(cand, out=self.band[i])
+        self.proven = True
+        self._traced = {}
+
+    def __len__(self) -> int:
+        """Get the length of LCS-FIG within the band, the bottom-right cell."""
+        return int(self.value(self.n, self.m))
+
+    def value(self, i: int, j: int) -> int:
+        """Get the band value of cell (i,j), clearing proven unless it is exact."""
+        if i == 0 or j == 0:
+            return 0
+        d = j - i
+        if d > self.hi:
+            j = i + self.hi
+            self.proven = False
+        elif d < self.lo:
+            i = j - self.lo
+            self.proven = False
+        v = self.band.item(i, j - i - self.lo)
+        if v < max(j - self.hi - 1, i + self.lo - 1):
+            self.proven = False
+        return v
+
+    def backtrack(self, X: str, Y: str, K: int) -> List[str]:
+        """Recover the subsequence PredecessorTable.backtrack gives for K within the band."""
+        if K not in self._traced:
+            self._traced[K] = monotone_backtrack(X, Y, K, self.value)
+        return list(self._traced[K])
+
+    @classmethod
+    def fit(cls, X: str, Y: str, K: Optional[int], band: Union[int, str]) -> 'BandedTable':
+        """
+        Get the band table of X and Y.
+
+        Args:
+            X: First sequence
+            Y: Second sequence
+            K: Gap constraint the traceback is proven for, or None to only
+                prove the length
+            band: Band width, or 'auto' to start at AUTO_BAND and double the
+                width until every cell the result is read from is proven
+                exact, so the result is the one of the full table
+
+        Returns:
+            The band table
+        """
+        width = AUTO_BAND if band == 'auto' else band
+        while True:
+            table = cls(X, Y, width)
+            if band != 'auto':
+                return table
+            len(table)
+            if K is not None:
+                table.backtrack(X, Y, K)
+            if table.proven:
+                return table
+            width *= 2
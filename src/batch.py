@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Batch solving of many LCS-FIG pairs across a process pool.
+
+Distinct sequences are written once, UTF-8 encoded, into a shared memory
+buffer with an offset index, so tasks sent to the workers are only
+(pair index, sequence index, sequence index) triples instead of pickled
+strings. Sequences already in a memory-mapped seqio.SequenceFile are not
+copied at all: every worker maps the same file. Pairs are grouped into
+chunks, at most a few chunks per worker are in flight, and results are
+yielded as soon as their chunk completes. solve_stream() instead sends
+chunks of strings as it reads them, for inputs too large to index first.
+"""
+
+import itertools
+import os
+import numpy as np
+# concurrent.futures only loads the process pool, and multiprocessing the
+# shared memory module, when a pool is first used
+from concurrent import futures
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from fig_dp import FIGDP
+from rmq_fig import RMQFIG
+from lcs_fig_greedy import GreedyLCSFIG
+from encoding import smallest_uint
+from seqio import SequenceFile
+
+ALGORITHMS = ('figdp', 'rmqfig', 'greedy')
+
+class SequenceStore:
+    """Distinct sequences packed into one byte buffer with an offset index."""
+    def __init__(self):
+        self._index = {}
+        self._chunks = []
+        self.offsets = [0]
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def add(self, seq: str) -> int:
+        """Add a sequence unless already stored and return its index."""
+        k = self._index.get(seq)
+        if k is None:
+            data = seq.encode('utf-8')
+            k = self._index[seq] = len(self._chunks)
+            self._chunks.append(data)
+            self.offsets.append(self.offsets[-1] + len(data))
+        return k
+
+    def to_shared_memory(self) -> 'shared_memory.SharedMemory':
+        """Copy the sequences into a new shared memory block."""
+        from multiprocessing import shared_memory
+        shm = shared_memory.SharedMemory(create=True, size=max(1, self.offsets[-1]))
+        shm.buf[:self.offsets[-1]] = b''.join(self._chunks)
+        return shm
+
+def make_solver(algorithm: str, engine: Optional[str] = None):
+    """Create the solver for algorithm, or None for the stateless greedy."""
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm '{algorithm}', expected one of {list(ALGORITHMS)}")
+    if algorithm == 'figdp':
+        return FIGDP(engine or 'python')
+    if algorithm == 'rmqfig':
+        return RMQFIG(engine=engine or 'python')
+    return None
+
+def solve_one(solver, X: str, Y: str, K: int,
+              length_only: bool = False) -> Tuple[int, Optional[List[str]]]:
+    """
+    Solve one pair without recording performance data.
+
+    Returns:
+        Tuple of (length, subsequence), the subsequence being None for
+        length_only and for the greedy algorithm (solver None)
+    """
+    if solver is None:
+        return GreedyLCSFIG(X, Y, K).solve()[0], None
+    if length_only:
+        return solver.score(X, Y, K), None
+    return solver.solve(X, Y, K, record=False)
+
+class _Context:
+    """Sequences and solver a worker (or the calling process) solves with."""
+    def __init__(self, buf, offsets, records: Optional[List[int]], algorithm: str,
+                 engine: Optional[str], K: int, length_only: bool):
+        self.buf = buf
+        self.offsets = offsets
+        # Sequence k is stored sequence records[k] when given
+        self.records = records
+        self.solver = make_solver(algorithm, engine)
+        self.K = K
+        self.length_only = length_only
+
+    def sequence(self, k: int) -> str:
+        if self.records is not None:
+            k = self.records[k]
+        return bytes(self.buf[self.offsets[k]:self.offsets[k+1]]).decode('utf-8')
+
+    def run_chunk(self, tasks: List[Tuple[int, int, int]]) -> List[Tuple[int, int, Optional[List[str]]]]:
+        results = []
+        for index, xi, yi in tasks:
+            length, subsequence = solve_one(self.solver, self.sequence(xi), self.sequence(yi),
+                                            self.K, self.length_only)
+            results.append((index, length, subsequence))
+        return results
+
+    def run_pairs(self, tasks: List[Tuple[int, str, str]]) -> List[Tuple[int, int, Optional[List[str]]]]:
+        """Solve pairs sent as strings, see solve_stream()."""
+        return [(index,) + solve_one(self.solver, X, Y, self.K, self.length_only)
+                for index, X, Y in tasks]
+
+    def run_tile(self, tile: Tuple[int, int, int, int]) -> Tuple[Tuple[int, int, int, int], np.ndarray]:
+        """Score sequences a0..a1-1 against b0..b1-1, skipping the lower triangle."""
+        a0, a1, b0, b1 = tile
+        scores = np.zeros((a1 - a0, b1 - b0), dtype=np.int64)
+        for a in range(a0, a1):
+            X = self.sequence(a)
+            for b in range(max(a, b0), b1):
+                scores[a - a0, b - b0] = solve_one(self.solver, X, self.sequence(b), self.K, True)[0]
+        return tile, scores
+
+_context = None
+
+def _init_worker(source: Optional[Tuple[str, str]], offsets: np.ndarray, records: Optional[List[int]],
+                 algorithm: str, engine: Optional[str], K: int, length_only: bool) -> None:
+    global _context
+    if source is None:
+        # Tasks carry their own sequences
+        _context = _Context(b'', offsets, records, algorithm, engine, K, length_only)
+        return
+    kind, name = source
+    if kind == 'file':
+        store = SequenceFile(name)
+        _context = _Context(store.data, offsets, records, algorithm, engine, K, length_only)
+    else:
+        # Workers share the parent's resource tracker, so attaching is safe
+        from multiprocessing import shared_memory
+        shm = shared_memory.SharedMemory(name=name)
+        _context = _Context(shm.buf, offsets, records, algorithm, engine, K, length_only)
+        _context.shm = shm
+
+def _run_chunk(tasks: List[Tuple[int, int, int]]) -> List[Tuple[int, int, Optional[List[str]]]]:
+    return _context.run_chunk(tasks)
+
+def _run_pairs(tasks: List[Tuple[int, str, str]]) -> List[Tuple[int, int, Optional[List[str]]]]:
+    return _context.run_pairs(tasks)
+
+def _run_tile(tile: Tuple[int, int, int, int]) -> Tuple[Tuple[int, int, int, int], np.ndarray]:
+    return _context.run_tile(tile)
+
+def _local_context(store: Union[SequenceStore, SequenceFile], records: Optional[List[int]],
+                   algorithm: str, engine: Optional[str], K: int, length_only: bool) -> _Context:
+    """Create the context for solving in this process."""
+    if isinstance(store, SequenceFile):
+        return _Context(store.data, store.offsets, records, algorithm, engine, K, length_only)
+    return _Context(memoryview(b''.join(store._chunks)), store.offsets, records,
+                    algorithm, engine, K, length_only)
+
+def _pool_map(store: Optional[Union[SequenceStore, SequenceFile]], records: Optional[List[int]], fn,
+              tasks: Iterable, workers: int, algorithm: str, engine: Optional[str], K: int,
+              length_only: bool) -> Iterator:
+    """
+    Run fn over tasks in a pool sharing store, yielding results as they
+    complete. A SequenceFile is mapped by every worker, a SequenceStore is
+    copied into shared memory once; without a store the tasks carry the
+    sequences. Tasks are consumed lazily, a few per worker at a time.
+    """
+    shm = source = None
+    if isinstance(store, SequenceFile):
+        source = ('file', store.path)
+    elif store is not None:
+        shm = store.to_shared_memory()
+        source = ('shm', shm.name)
+    offsets = [0] if store is None else store.offsets
+    pool = futures.ProcessPoolExecutor(
+        workers, initializer=_init_worker,
+        initargs=(source, np.array(offsets), records, algorithm, engine, K, length_only))
+    try:
+        pending = set()
+        for task in tasks:
+            if len(pending) >= 4 * workers:
+                done, pending = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(pool.submit(fn, task))
+        while pending:
+            done, pending = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        pool.shutdown(cancel_futures=True)
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+def solve_batch(pairs: Iterable[Tuple], K: int, workers: Optional[int] = None,
+                algorithm: str = 'rmqfig', engine: Optional[str] = None,
+                length_only: bool = False, chunk_size: int = 64,
+                sequences: Optional[SequenceFile] = None
+                ) -> Iterator[Tuple[int, int, Optional[List[str]]]]:
+    """
+    Solve LCS-FIG for many pairs, streaming results as they complete.
+
+    Args:
+        pairs: (X, Y) sequence pairs, or (x, y) index pairs into sequences
+        K: Gap constraint
+        workers: Number of worker processes (default os.cpu_count());
+            1 solves in this process
+        algorithm: One of ALGORITHMS
+        engine: Engine passed to FIGDP/RMQFIG (default 'python')
+        length_only: Only compute lengths with score()
+        chunk_size: Pairs per task sent to a worker
+        sequences: Memory-mapped sequences the pairs index into; workers
+            map the file instead of receiving copies
+
+    Yields:
+        Tuples of (pair index, length, subsequence or None), in completion
+        order when workers > 1
+    """
+    workers = workers or os.cpu_count() or 1
+    solver = make_solver(algorithm, engine)
+    if workers == 1:
+        for index, (X, Y) in enumerate(pairs):
+            if sequences is not None:
+                X, Y = sequences[X], sequences[Y]
+            yield (index,) + solve_one(solver, X, Y, K, length_only)
+        return
+
+    if sequences is not None:
+        store = sequences
+        tasks = [(index, x, y) for index, (x, y) in enumerate(pairs)]
+    else:
+        store = SequenceStore()
+        tasks = [(index, store.add(X), store.add(Y)) for index, (X, Y) in enumerate(pairs)]
+    chunks = (tasks[start:start + chunk_size] for start in range(0, len(tasks), chunk_size))
+    for results in _pool_map(store, None, _run_chunk, chunks, workers, algorithm, engine, K,
+                             length_only):
+        yield from results
+
+def solve_stream(pairs: Iterable[Tuple[str, str]], K: int, workers: Optional[int] = None,
+                 algorithm: str = 'rmqfig', engine: Optional[str] = None,
+                 length_only: bool = False, chunk_size: int = 64
+                 ) -> Iterator[Tuple[int, int, Optional[List[str]]]]:
+    """
+    Solve LCS-FIG for an unbounded stream of pairs in bounded memory.
+
+    Unlike solve_batch(), which indexes every sequence into shared memory
+    before starting, pairs are read lazily and sent to the workers as
+    chunks of strings, so at most a few chunks per worker are held at any
+    time and the first results arrive while the input is still being read.
+
+    Args:
+        pairs: (X, Y) sequence pairs, e.g. read from a pipe
+        K: Gap constraint
+        workers: Number of worker processes (default os.cpu_count());
+            1 solves in this process
+        algorithm: One of ALGORITHMS
+        engine: Engine passed to FIGDP/RMQFIG (default 'python')
+        length_only: Only compute lengths with score()
+        chunk_size: Pairs per task sent to a worker
+
+    Yields:
+        Tuples of (pair index, length, subsequence or None), in completion
+        order when workers > 1
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        yield from solve_batch(pairs, K, 1, algorithm, engine, length_only)
+        return
+    make_solver(algorithm, engine)
+    indexed = ((index, X, Y) for index, (X, Y) in enumerate(pairs))
+    chunks = iter(lambda: list(itertools.islice(indexed, chunk_size)), [])
+    for results in _pool_map(None, None, _run_pairs, chunks, workers, algorithm, engine, K,
+                             length_only):
+        yield from results
+
+def all_pairs(sequences: Union[Sequence[str], SequenceFile], K: int, workers: Optional[int] = None,
+              algorithm: str = 'rmqfig', engine: Optional[str] = None,
+              out: Optional[str] = None, tile: int = 32) -> np.ndarray:
+    """
+    Compute the N x N matrix of LCS-FIG lengths between all sequences.
+
+    LCS-FIG lengths are symmetric, so each pair of distinct sequences is
+    scored once and mirrored. Identical sequences are detected by hashing
+    and scored once. The upper triangle over the distinct sequences is cut
+    into tile x tile blocks that are scored with score() across the pool.
+
+    Args:
+        sequences: The N sequences, or a SequenceFile that workers map
+            instead of receiving copies
+        K: Gap constraint
+        workers: Number of worker processes (default os.cpu_count());
+            1 scores in this process
+        algorithm: One of ALGORITHMS
+        engine: Engine passed to FIGDP/RMQFIG (default 'python')
+        out: If given, the matrix is a memory-mapped .npy file at this path
+        tile: Distinct sequences per block side
+
+    Returns:
+        The score matrix, an np.memmap when out is given
+    """
+    workers = workers or os.cpu_count() or 1
+    make_solver(algorithm, engine)
+    if isinstance(sequences, SequenceFile):
+        store = sequences
+        ids, records = sequences.unique()
+        count = len(records)
+        dtype = smallest_uint(int(sequences.lengths().max(initial=0)))
+    else:
+        store = SequenceStore()
+        ids = np.array([store.add(seq) for seq in sequences], dtype=np.int64)
+        records = None
+        count = len(store)
+        dtype = smallest_uint(max((len(seq) for seq in sequences), default=0))
+    shape = (len(sequences), len(sequences))
+    if out is not None:
+        matrix = np.lib.format.open_memmap(out, mode='w+', dtype=dtype, shape=shape)
+    else:
+        matrix = np.zeros(shape, dtype=dtype)
+
+    # Positions of the copies of distinct sequences a0..a1-1 are
+    # order[starts[a0]:starts[a1]]
+    order = np.argsort(ids, kind='stable')
+    starts = np.searchsorted(ids[order], np.arange(count + 1))
+
+    tiles = ((a0, min(a0 + tile, count), b0, min(b0 + tile, count))
+             for a0 in range(0, count, tile) for b0 in range(a0, count, tile))
+    if workers == 1:
+        results = map(_local_context(store, records, algorithm, engine, K, True).run_tile, tiles)
+    else:
+        results = _pool_map(store, records, _run_tile, tiles, workers, algorithm, engine, K, True)
+    for (a0, a1, b0, b1), scores in results:
+        rows = order[starts[a0]:starts[a1]]
+        cols = order[starts[b0]:starts[b1]]
+        block = scores[ids[rows] - a0][:, ids[cols] - b0]
+        if a0 == b0:
+            # Diagonal tiles only hold their upper triangle
+            block = np.maximum(block, block.T)
+        matrix[np.ix_(rows, cols)] = block
+        matrix[np.ix_(cols, rows)] = block.T
+    if out is not None:
+        matrix.flush()
+    return matrix
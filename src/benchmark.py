@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Parallel, resumable benchmark runner for the LCS-FIG solvers.
+
+A benchmark is a grid of cells (algorithm, engine, size, K, trial). Every
+cell solves one pair of generated sequences, the same for every algorithm
+and K at a given size and trial: first `warmup` untimed solves (the first
+one tracing its allocation peak, see instrument), then `repeat` solves
+timed with perf_counter. Cells run across a process pool, largest first,
+and every finished cell is appended as one JSON line to a checkpoint file,
+so an interrupted run resumes where it stopped; records measured with
+other warmup, repeat or seed settings, or timed out under a smaller limit,
+are run again. A cell taking longer than the timeout is stopped with
+SIGALRM (where available) and recorded as such.
+"""
+
+import json
+import os
+import signal
+import time
+from concurrent import futures
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from batch import make_solver, solve_one
+from instrument import Instrumentation
+from workload import UPPERCASE, uniform_pair
+
+# (algorithm, engine, size, K, trial); engine is '' for greedy
+Cell = Tuple[str, str, int, int, int]
+
+class CellTimeout(Exception):
+    """Raised in a worker when its cell exceeds the timeout."""
+
+def _alarm(signum, frame):
+    raise CellTimeout()
+
+def grid(algorithms: Iterable[str], sizes: Iterable[int], k_values: Iterable[int],
+         trials: int, engine: str = 'python') -> List[Cell]:
+    """
+    Build the cells of a benchmark grid.
+
+    Args:
+        algorithms: Names from batch.ALGORITHMS
+        sizes: Sequence lengths
+        k_values: Gap constraints
+        trials: Sequence pairs per size
+        engine: Engine of FIGDP and RMQFIG
+
+    Returns:
+        The cells, one per combination
+    """
+    return [(algorithm, '' if algorithm == 'greedy' else engine, size, K, trial)
+            for algorithm in algorithms for size in sizes for K in k_values
+            for trial in range(trials)]
+
+def cell_key(cell: Cell) -> str:
+    """Get the checkpoint key of a cell."""
+    return '/'.join(map(str, cell))
+
+def sequence_pair(size: int, trial: int, seed: int = 0) -> Tuple[str, str]:
+    """Generate the deterministic uniform sequence pair of a size and trial."""
+    return uniform_pair(size, alphabet=UPPERCASE, seed=(seed, size, trial))
+
+def run_cell(cell: Cell, warmup: int = 1, repeat: int = 3,
+             timeout: Optional[float] = None, seed: int = 0) -> dict:
+    """
+    Benchmark one cell.
+
+    Args:
+        cell: The cell to run
+        warmup: Untimed solves before the timed ones; the first traces
+            its allocation peak
+        repeat: Timed solves
+        timeout: Seconds after which the cell is stopped (needs SIGALRM;
+            compiled Numba code is only interrupted once it returns)
+        seed: Seed of the generated sequences
+
+    Returns:
+        The cell's record: its fields, the settings, 'status' ('ok',
+        'timeout' or 'error'), 'length', 'times' in seconds and
+        'peak_memory_mb'
+    """
+    algorithm, engine, size, K, trial = cell
+    record = {'key': cell_key(cell), 'algorithm': algorithm, 'engine': engine,
+              'size': size, 'k': K, 'trial': trial,
+              'warmup': warmup, 'repeat': repeat, 'seed': seed, 'timeout': timeout,
+              'status': 'ok', 'length': None, 'times': [], 'peak_memory_mb': None}
+    alarm = timeout is not None and hasattr(signal, 'SIGALRM')
+    if alarm:
+        handler = signal.signal(signal.SIGALRM, _alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        X, Y = sequence_pair(size, trial, seed)
+        solver = make_solver(algorithm, engine or None)
+        for w in range(warmup):
+            if w == 0:
+                inst = Instrumentation()
+                with inst.measure():
+                    solve_one(solver, X, Y, K)
+                record['peak_memory_mb'] = inst.last_peak / 1024 / 1024
+            else:
+                solve_one(solver, X, Y, K)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            length, _ = solve_one(solver, X, Y, K)
+            record['times'].append(time.perf_counter() - start)
+            record['length'] = length
+    except CellTimeout:
+        record['status'] = 'timeout'
+    except Exception as e:
+        record['status'] = 'error'
+        record['error'] = repr(e)
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, handler)
+    return record
+
+def load_checkpoint(path: str) -> Dict[str, dict]:
+    """
+    Read the records of a checkpoint file by key, later lines winning.
+
+    A line cut short by an interrupted write is ignored.
+    """
+    records = {}
+    if not os.path.exists(path):
+        return records
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            records[record['key']] = record
+    return records
+
+def run_benchmark(cells: Iterable[Cell], checkpoint: Optional[str] = None,
+                  workers: Optional[int] = None, warmup: int = 1, repeat: int = 3,
+                  timeout: Optional[float] = None, seed: int = 0) -> List[dict]:
+    """
+    Run the cells of a benchmark, resuming from a checkpoint file.
+
+    Cells whose record in the checkpoint is 'ok', or 'timeout' under at
+    least the current timeout, and was measured with the same warmup,
+    repeat and seed are not run again; failed cells, cells that timed out
+    under a smaller limit and cells measured with other settings are
+    rerun, their new record replacing the old one.
+
+    Args:
+        cells: Cells to run, see grid()
+        checkpoint: JSON-lines file finished cells are appended to
+        workers: Number of worker processes (default os.cpu_count());
+            1 runs in this process
+        warmup: Untimed solves per cell, see run_cell()
+        repeat: Timed solves per cell
+        timeout: Seconds per cell, see run_cell()
+        seed: Seed of the generated sequences
+
+    Returns:
+        The record of every cell, in the order of cells
+    """
+    cells = list(cells)
+    done = load_checkpoint(checkpoint) if checkpoint else {}
+    settings = {'warmup': warmup, 'repeat': repeat, 'seed': seed}
+
+    def finished(cell: Cell) -> bool:
+        record = done.get(cell_key(cell), {})
+        if not all(record.get(name) == value for name, value in settings.items()):
+            return False
+        if record.get('status') == 'timeout':
+            # Retried when the limit grew (None being no limit)
+            limit = record.get('timeout')
+            return limit is not None and timeout is not None and timeout <= limit
+        return record.get('status') == 'ok'
+
+    # Largest cells first, so the pool does not wait on one at the end
+    pending = sorted((cell for cell in cells if not finished(cell)), key=lambda cell: -cell[2])
+    out = None
+    if checkpoint:
+        out = open(checkpoint, 'a')
+        # End a line cut short by an interrupted run before appending
+        if out.tell():
+            with open(checkpoint, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    out.write('\n')
+
+    def finish(record: dict) -> None:
+        done[record['key']] = record
+        if out is not None:
+            out.write(json.dumps(record) + '\n')
+            out.flush()
+
+    workers = workers or os.cpu_count() or 1
+    try:
+        if workers == 1:
+            for cell in pending:
+                finish(run_cell(cell, warmup, repeat, timeout, seed))
+        elif pending:
+            pool = futures.ProcessPoolExecutor(min(workers, len(pending)))
+            try:
+                pending_futures = [pool.submit(run_cell, cell, warmup, repeat, timeout, seed)
+                                   for cell in pending]
+                for future in futures.as_completed(pending_futures):
+                    finish(future.result())
+            finally:
+                pool.shutdown(cancel_futures=True)
+    finally:
+        if out is not None:
+            out.close()
+    return [done[cell_key(cell)] for cell in cells]
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Micro and macro benchmarks of the solver hot paths.
+
+Kept apart from the unit tests (pytest only collects test_*.py). Every
+benchmark in BENCHMARKS belongs to a group and measures a unit of work:
+
+    fill       table cells per second of each engine's fill loop (score)
+    rmq-query  gap-window queries per second of each RMQ backend vs K
+    traceback  bases (n + m) per second of each traceback
+    greedy     bases per second of the greedy algorithm
+    macro      pairs per second of whole solves
+    import     seconds to start an interpreter and import a module, the
+               fixed cost of every short-lived worker or CLI call
+
+In the style of pytest-benchmark, a benchmark is called once to warm up,
+then timed for `rounds` rounds of as many iterations as fill min_time, and
+reported with min/max/mean/median/stddev per call and throughput. Results
+are written as JSON together with the calibration time of regression.py
+and can be compared with a saved run:
+
+    python src/benchsuite.py --json bench.json
+    python src/benchsuite.py --group fill --compare bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import fig_kernel
+from fig_dp import FIGDP
+from rmq_fig import RMQFIG, RMQStructure, RMQ_BACKENDS
+from lcs_fig_greedy import GreedyLCSFIG
+from predecessors import PredecessorTable, window_backtrack
+from sparse_fig import MatchLevels
+from bitparallel_fig import BitRows
+from batch import solve_batch
+from regression import DEFAULT_TOLERANCE, calibrate, compare
+from workload import PROTEIN, workload_pair
+
+# name: (group, unit, setup); setup() returns (function, units per call),
+# or None when the benchmark cannot run here
+BENCHMARKS: Dict[str, Tuple[str, str, Callable]] = {}
+
+def benchmark(name: str, group: str, unit: str) -> Callable:
+    """Register a benchmark setup function under name."""
+    def register(setup: Callable) -> Callable:
+        BENCHMARKS[name] = (group, unit, setup)
+        return setup
+    return register
+
+def _register_fill(name: str, solver, size: int, K: int, **options) -> None:
+    def setup():
+        X, Y = workload_pair('uniform', size, seed=1, **options)
+        return (lambda: solver.score(X, Y, K)), len(X) * len(Y)
+    benchmark(f'fill/{name}', 'fill', 'cells')(setup)
+
+_register_fill('figdp-python', FIGDP('python'), 120, 4)
+_register_fill('figdp-numpy', FIGDP('numpy'), 600, 4)
+_register_fill('figdp-sparse', FIGDP('sparse'), 3000, 4, alphabet=PROTEIN)
+_register_fill('figdp-bitparallel', FIGDP('bitparallel'), 4000, 4)
+_register_fill('rmqfig-python', RMQFIG(), 120, 4)
+
+@benchmark('fill/figdp-numba', 'fill', 'cells')
+def _fill_numba():
+    if fig_kernel.load_kernel() is None:
+        return None
+    solver = FIGDP('numba')
+    X, Y = workload_pair('uniform', 2000, seed=1)
+    return (lambda: solver.score(X, Y, 4)), len(X) * len(Y)
+
+@benchmark('fill/banded-auto', 'fill', 'cells')
+def _fill_banded():
+    solver = FIGDP()
+    X, Y = workload_pair('mutated', 8000, seed=1, rate=0.02)
+    # Throughput relative to the full table the band stands in for
+    return (lambda: solver.score(X, Y, 4, band='auto')), len(X) * len(Y)
+
+def _register_rmq(backend: str, K: int, rows: int = 12, m: int = 200) -> None:
+    def setup():
+        values = np.random.default_rng(2).integers(0, 50, (rows + 1, m + 1)).tolist()
+
+        def fill():
+            # A row fill as RMQ-FIG does it, querying at every cell
+            rmq = RMQStructure(rows, m, K, backend)
+            for i in range(1, rows + 1):
+                row = values[i]
+                for j in range(1, m + 1):
+                    rmq.query(max(0, i-K-1), i-1, max(0, j-K-1), j-1)
+                    rmq.update(i, j, row[j])
+        return fill, rows * m
+    benchmark(f'rmq-query/{backend}-K{K}', 'rmq-query', 'queries')(setup)
+
+for _backend in RMQ_BACKENDS:
+    for _K in (2, 8, 32):
+        _register_rmq(_backend, _K)
+
+@benchmark('traceback/predecessor-table', 'traceback', 'bases')
+def _traceback_predecessors():
+    X, Y = workload_pair('uniform', 200, seed=3)
+    prev = PredecessorTable(len(X), len(Y), 4)
+    dp = RMQFIG()._table(X, Y, 4, prev)
+    return (lambda: prev.backtrack(X, dp)), len(X) + len(Y)
+
+@benchmark('traceback/window', 'traceback', 'bases')
+def _traceback_window():
+    X, Y = workload_pair('uniform', 200, seed=3)
+    dp = RMQFIG()._table(X, Y, 4)
+    return (lambda: window_backtrack(X, Y, 4, dp)), len(X) + len(Y)
+
+@benchmark('traceback/bitparallel', 'traceback', 'bases')
+def _traceback_bitparallel():
+    X, Y = workload_pair('uniform', 3000, seed=3)
+    table = BitRows(X, Y)
+    return (lambda: table.backtrack(X, Y, 4)), len(X) + len(Y)
+
+@benchmark('traceback/sparse', 'traceback', 'bases')
+def _traceback_sparse():
+    X, Y = workload_pair('uniform', 3000, seed=3, alphabet=PROTEIN)
+    table = MatchLevels(X, Y)
+    return (lambda: table.backtrack(X, Y, 4)), len(X) + len(Y)
+
+@benchmark('greedy/uniform', 'greedy', 'bases')
+def _greedy():
+    X, Y = workload_pair('uniform', 500000, seed=4)
+    return (lambda: GreedyLCSFIG(X, Y, 4).solve()), len(X) + len(Y)
+
+@benchmark('macro/figdp-python', 'macro', 'pairs')
+def _macro_figdp():
+    X, Y = workload_pair('uniform', 100, seed=5)
+    solver = FIGDP()
+    return (lambda: solver.solve(X, Y, 4, record=False)), 1
+
+@benchmark('macro/rmqfig-python', 'macro', 'pairs')
+def _macro_rmqfig():
+    X, Y = workload_pair('uniform', 100, seed=5)
+    solver = RMQFIG()
+    return (lambda: solver.solve(X, Y, 4, record=False)), 1
+
+@benchmark('macro/figdp-auto', 'macro', 'pairs')
+def _macro_auto():
+    X, Y = workload_pair('mutated', 3000, seed=5)
+    solver = FIGDP('auto')
+    return (lambda: solver.solve(X, Y, 4, record=False)), 1
+
+@benchmark('macro/batch-bitparallel', 'macro', 'pairs')
+def _macro_batch():
+    pairs = [workload_pair('uniform', 300, seed=(6, k)) for k in range(64)]
+    return (lambda: list(solve_batch(pairs, 4, workers=1, engine='bitparallel'))), len(pairs)
+
+def _register_import(name: str, statement: str) -> None:
+    def setup():
+        command = [sys.executable, '-c', statement]
+        cwd = os.path.dirname(os.path.abspath(__file__))
+        return (lambda: subprocess.run(command, cwd=cwd, check=True)), 1
+    benchmark(f'import/{name}', 'import', 'starts')(setup)
+
+# The bare interpreter is the floor the module imports are measured against
+_register_import('interpreter', 'pass')
+_register_import('numpy', 'import numpy')
+for _module in ('fig_dp', 'rmq_fig', 'lcs_fig_greedy', 'batch', 'lcsfig', 'compare_algorithms'):
+    _register_import(_module, f'import {_module}')
+
+def run_one(fn: Callable, units: int, rounds: int = 5, min_time: float = 0.05) -> dict:
+    """
+    Time a benchmark function.
+
+    Args:
+        fn: Function doing units of work per call
+        units: Work per call
+        rounds: Timed rounds
+        min_time: Seconds each round lasts at least
+
+    Returns:
+        Per-call statistics in seconds and the throughput in units/s
+    """
+    start = time.perf_counter()
+    fn()
+    once = time.perf_counter() - start
+    iterations = max(1, int(min_time / once) if once > 0 else 1)
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        times.append((time.perf_counter() - start) / iterations)
+    return {
+        'rounds': rounds,
+        'iterations': iterations,
+        'min': min(times),
+        'max': max(times),
+        'mean': statistics.mean(times),
+        'median': statistics.median(times),
+        'stddev': statistics.stdev(times) if rounds > 1 else 0.0,
+        'throughput': units / min(times),
+    }
+
+def run_suite(select: Optional[str] = None, group: Optional[str] = None,
+              rounds: int = 5, min_time: float = 0.05) -> dict:
+    """
+    Run the selected benchmarks.
+
+    Args:
+        select: Only run benchmarks whose name contains this
+        group: Only run benchmarks of this group
+        rounds: Timed rounds per benchmark
+        min_time: Seconds each round lasts at least
+
+    Returns:
+        JSON-serializable results: machine info, calibration and one
+        entry per benchmark that could run
+    """
+    results = []
+    for name, (bench_group, unit, setup) in BENCHMARKS.items():
+        if (select and select not in name) or (group and group != bench_group):
+            continue
+        prepared = setup()
+        if prepared is None:
+            continue
+        fn, units = prepared
+        result = {'name': name, 'group': bench_group, 'unit': unit}
+        result.update(run_one(fn, units, rounds, min_time))
+        results.append(result)
+    return {
+        'machine': {'python': platform.python_version(), 'numpy': np.__version__,
+                    'platform': platform.platform(), 'processor': platform.processor()},
+        'calibration': calibrate(),
+        'benchmarks': results,
+    }
+
+def regressions(current: dict, baseline: dict,
+                tolerance: float = DEFAULT_TOLERANCE) -> List[Tuple[str, float, float]]:
+    """Find benchmarks slower than a saved run allows, see regression.compare."""
+    def as_cases(run):
+        return {'calibration': run['calibration'],
+                'cases': {b['name']: b['min'] for b in run['benchmarks']}}
+    return compare(as_cases(current), as_cases(baseline), tolerance)
+
+def main() -> int:
+    """Run the suite, print a table and optionally save or compare; return the exit status."""
+    parser = argparse.ArgumentParser(description="LCS-FIG hot path benchmarks")
+    parser.add_argument('-k', dest='select', help="only benchmarks whose name contains this")
+    parser.add_argument('--group', choices=sorted({g for g, _, _ in BENCHMARKS.values()}))
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.05, help="seconds per round")
+    parser.add_argument('--json', help="write the results to this file")
+    parser.add_argument('--compare', help="saved results to compare with")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed relative slowdown (default: %(default)s)")
+    args = parser.parse_args()
+
+    results = run_suite(args.select, args.group, args.rounds, args.min_time)
+    print(f"{'benchmark':34s} {'min':>11s} {'median':>11s} {'stddev':>10s}  throughput")
+    for b in results['benchmarks']:
+        print(f"{b['name']:34s} {b['min'] * 1e3:9.3f}ms {b['median'] * 1e3:9.3f}ms "
+              f"{b['stddev'] * 1e3:8.3f}ms  {b['throughput']:12.4g} {b['unit']}/s")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=4)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        slower = regressions(results, baseline, args.tolerance)
+        for name, expected, seconds in slower:
+            print(f"REGRESSION {name}: {seconds * 1e3:.3f}ms vs {expected * 1e3:.3f}ms "
+                  f"(+{(seconds / expected - 1) * 100:.0f}%)")
+        return 1 if slower else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Bit-parallel LCS-FIG engine for small alphabets.
+
+The gap-window maximum of a match (i,j) is always the cell (i-1,j-1), since
+the table is non-decreasing along rows and columns, so the table is the
+plain LCS table and the bit-vector LCS recurrence (Allison-Dix, in Hyyro's
+formulation) computes it exactly. Each table row is kept as one Python
+integer whose bit j-1 is set iff cell (i,j) is one more than cell (i,j-1),
+and a row is derived from the previous one with a handful of big-integer
+operations over m bits, i.e. O(nm/w) machine-word operations overall.
+
+Cells are read back as popcounts of row prefixes, so
+predecessors.monotone_backtrack recovers the same subsequence as
+PredecessorTable.backtrack from n+1 rows of m bits instead of the table.
+"""
+
+from typing import Dict, List
+from predecessors import monotone_backtrack
+
+def _popcount(v: int) -> int:
+    return bin(v).count('1')
+
+# int.bit_count is only available from Python 3.10
+popcount = getattr(int, 'bit_count', _popcount)
+
+def match_masks(Y: str) -> Dict[str, int]:
+    """Map each symbol of Y to the integer with bit j set iff Y[j] is that symbol."""
+    masks = {}
+    for j, ch in enumerate(Y):
+        masks[ch] = masks.get(ch, 0) | 1 << j
+    return masks
+
+class BitRows:
+    """The LCS-FIG table of two sequences, one bit vector per row."""
+    def __init__(self, X: str, Y: str):
+        """Compute all n+1 rows of the table of X and Y."""
+        masks = match_masks(Y)
+        full = (1 << len(Y)) - 1
+        # V has a 0 bit wherever the row steps up, see score()
+        V = full
+        self.rows = [0]
+        for ch in X:
+            U = V & masks.get(ch, 0)
+            V = ((V + U) | (V - U)) & full
+            self.rows.append(V ^ full)
+
+    def __len__(self) -> int:
+        """Get the length of LCS-FIG, the bottom-right cell."""
+        return popcount(self.rows[-1])
+
+    @staticmethod
+    def score(X: str, Y: str) -> int:
+        """Compute only the length of LCS-FIG, which does not depend on K."""
+        masks = match_masks(Y)
+        full = (1 << len(Y)) - 1
+        V = full
+        for ch in X:
+            U = V & masks.get(ch, 0)
+            V = ((V + U) | (V - U)) & full
+        return len(Y) - popcount(V)
+
+    def value(self, i: int, j: int) -> int:
+        """Get the table cell (i,j)."""
+        return popcount(self.rows[i] & ((1 << j) - 1))
+
+    def backtrack(self, X: str, Y: str, K: int) -> List[str]:
+        """Recover the subsequence PredecessorTable.backtrack gives for K."""
+        return monotone_backtrack(X, Y, K, self.value)
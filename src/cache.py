@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Result cache for repeated LCS-FIG solves.
+
+Results are keyed by a content hash of both sequences, K, the algorithm with
+its engine and backend, and any solve options, so the same (X, Y, K) triple
+is only solved once per configuration. ResultCache holds a bounded LRU in
+memory and can write through to an SQLite file that later runs (and other
+processes) read from. CachedSolver wraps FIGDP, RMQFIG or GreedyLCSFIG.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from lcs_fig_greedy import GreedyLCSFIG
+
+def sequence_hash(seq: str) -> str:
+    """Get a 128-bit BLAKE2b hex digest of a sequence."""
+    return hashlib.blake2b(seq.encode('utf-8'), digest_size=16).hexdigest()
+
+class ResultCache:
+    """
+    LRU cache of JSON-serializable results with optional SQLite persistence.
+
+    Attributes:
+        hits: Lookups answered from memory or disk
+        misses: Lookups not found
+        disk_hits: Hits that were only found in the SQLite store
+    """
+    def __init__(self, maxsize: int = 1024, path: Optional[str] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Number of results kept in memory
+            path: SQLite file results are also stored in and looked up from
+        """
+        if maxsize < 1:
+            raise ValueError(f"Cache size must be positive, got {maxsize}")
+        self.maxsize = maxsize
+        self._lru = OrderedDict()
+        self.hits = self.misses = self.disk_hits = 0
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, isolation_level=None)
+            self._db.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT)")
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def _remember(self, key: str, value: Any) -> None:
+        self._lru[key] = value
+        self._lru.move_to_end(key)
+        if len(self._lru) > self.maxsize:
+            self._lru.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Look up a result, or None if it is not cached."""
+        if key in self._lru:
+            self._lru.move_to_end(key)
+            self.hits += 1
+            return self._lru[key]
+        if self._db is not None:
+            row = self._db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                value = json.loads(row[0])
+                self._remember(key, value)
+                self.hits += 1
+                self.disk_hits += 1
+                return value
+        self.misses += 1
+        return None
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a result in memory and, if persistent, on disk."""
+        # Round-trip through JSON so memory and disk hits look the same
+        text = json.dumps(value)
+        self._remember(key, json.loads(text))
+        if self._db is not None:
+            self._db.execute("INSERT OR REPLACE INTO results VALUES (?, ?)", (key, text))
+
+    def stats(self) -> dict:
+        """Get the hit and miss counters and the number of results in memory."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'disk_hits': self.disk_hits,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self._lru),
+        }
+
+    def clear(self) -> None:
+        """Drop all results from memory and disk and reset the counters."""
+        self._lru.clear()
+        self.hits = self.misses = self.disk_hits = 0
+        if self._db is not None:
+            self._db.execute("DELETE FROM results")
+
+    def close(self) -> None:
+        """Close the SQLite store."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+class CachedSolver:
+    """Cache in front of a FIGDP or RMQFIG instance or the GreedyLCSFIG class."""
+    def __init__(self, solver, cache: Optional[ResultCache] = None):
+        """
+        Wrap a solver.
+
+        Args:
+            solver: A FIGDP or RMQFIG instance, or GreedyLCSFIG
+            cache: Cache to use, possibly shared between solvers (default a
+                new in-memory ResultCache)
+        """
+        self.solver = solver
+        self.cache = cache if cache is not None else ResultCache()
+        if solver is GreedyLCSFIG:
+            self.name = 'greedy'
+        else:
+            parts = [type(solver).__name__.lower(), getattr(solver, 'engine', '')]
+            if hasattr(solver, 'backend'):
+                parts.append(solver.backend)
+            self.name = '/'.join(parts)
+
+    def _key(self, method: str, X: str, Y: str, K: int, options: dict) -> str:
+        options = {name: value for name, value in options.items() if name != 'record'}
+        return json.dumps([self.name, method, K, sequence_hash(X), sequence_hash(Y), options],
+                          sort_keys=True)
+
+    def solve(self, X: str, Y: str, K: int, **options) -> Tuple[int, Any]:
+        """
+        Solve through the cache.
+
+        Args:
+            X: First sequence
+            Y: Second sequence
+            K: Gap constraint
+            **options: Passed on to the solver's solve(), e.g. band
+
+        Returns:
+            What the solver returns: (length, subsequence) for FIGDP and
+            RMQFIG, (length, execution time) for GreedyLCSFIG, where a hit
+            reports the time of the lookup
+        """
+        start_time = time.time()
+        key = self._key('solve', X, Y, K, options)
+        cached = self.cache.get(key)
+        if self.solver is GreedyLCSFIG:
+            if cached is None:
+                length, elapsed = GreedyLCSFIG(X, Y, K).solve()
+                self.cache.put(key, length)
+                return length, elapsed
+            return cached, time.time() - start_time
+        if cached is None:
+            length, lcs = self.solver.solve(X, Y, K, **options)
+            self.cache.put(key, [length, lcs])
+            return length, lcs
+        return cached[0], list(cached[1])
+
+    def score(self, X: str, Y: str, K: int, **options) -> int:
+        """Compute the length of LCS-FIG through the cache, see solve()."""
+        if self.solver is GreedyLCSFIG:
+            return self.solve(X, Y, K)[0]
+        key = self._key('score', X, Y, K, options)
+        cached = self.cache.get(key)
+        if cached is None:
+            cached = self.solver.score(X, Y, K, **options)
+            self.cache.put(key, cached)
+        return cached
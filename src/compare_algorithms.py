@@ -1,23 +1,45 @@
 #!/usr/bin/env python3
 
 import os
-import time
 import json
-import random
-import string
+import argparse
 import numpy as np
-import matplotlib.pyplot as plt
-from typing import List, Tuple, Dict
-from rmq_fig import RMQFIG
-from fig_dp import FIGDP
-from lcs_fig_greedy import GreedyLCSFIG
+from typing import List, Dict, Optional
+from benchmark import grid, run_benchmark
 
-def generate_random_sequence(length: int) -> str:
-    """Generate random sequence of given length."""
-    return ''.join(random.choices(string.ascii_uppercase, k=length))
+def _mean(values: List[float]) -> float:
+    """Get the mean of values, nan for cells that all timed out or failed."""
+    return float(np.mean(values)) if values else float('nan')
 
-def run_comparison(sizes: List[int], k_values: List[int], num_trials: int = 3) -> Dict:
-    """Run comparison between all algorithms."""
+def run_comparison(sizes: List[int], k_values: List[int], num_trials: int = 3,
+                   workers: Optional[int] = None, checkpoint: Optional[str] = None,
+                   timeout: Optional[float] = None, engine: str = 'python',
+                   warmup: int = 1, repeat: int = 3) -> Dict:
+    """
+    Run comparison between all algorithms.
+    
+    The sizes x K x trials grid runs through benchmark.run_benchmark, so
+    cells are spread over workers processes, finished cells are kept in
+    checkpoint and skipped when the comparison is run again, and cells
+    exceeding timeout seconds are left out of the averages. The time of a
+    trial is the median of its repeat timed solves, its memory the traced
+    allocation peak of its first warmup solve.
+    
+    Args:
+        sizes: Sequence lengths
+        k_values: Gap constraints
+        num_trials: Sequence pairs per size
+        workers: Number of worker processes (default os.cpu_count())
+        checkpoint: JSON-lines file to resume from and append to
+        timeout: Seconds per cell
+        engine: Engine of FIG-DP and RMQ-FIG
+        warmup: Untimed solves per cell
+        repeat: Timed solves per cell
+        
+    Returns:
+        Per algorithm and K the mean time, memory and length at each size,
+        and the time and length ratios between the algorithms
+    """
     results = {
         'sizes': sizes,
         'k_values': k_values,
@@ -34,71 +56,44 @@ def run_comparison(sizes: List[int], k_values: List[int], num_trials: int = 3) -
         } for k in k_values}
     }
     
+    cells = grid(['figdp', 'rmqfig', 'greedy'], sizes, k_values, num_trials, engine)
+    records = run_benchmark(cells, checkpoint, workers, warmup, repeat, timeout)
+    trials = {}
+    for record in records:
+        if record['status'] == 'ok':
+            trials.setdefault((record['algorithm'], record['size'], record['k']), []).append(record)
+    
     for size in sizes:
-        print(f"Processing size {size}...")
         for k in k_values:
-            print(f"  K = {k}")
-            figdp_metrics = {'time': [], 'memory': [], 'length': []}
-            rmqfig_metrics = {'time': [], 'memory': [], 'length': []}
-            greedy_metrics = {'time': [], 'memory': [], 'length': []}
-            
-            for trial in range(num_trials):
-                print(f"    Trial {trial + 1}/{num_trials}")
-                X = generate_random_sequence(size)
-                Y = generate_random_sequence(size)
-                
-                # Run FIG-DP (optimal solution)
-                figdp = FIGDP()
-                start_time = time.time()
-                length_dp, _ = figdp.solve(X, Y, k)
-                dp_time = time.time() - start_time
-                figdp_metrics['time'].append(dp_time)
-                figdp_metrics['memory'].append(figdp.get_memory_usage())
-                figdp_metrics['length'].append(length_dp)
-                
-                # Run RMQ-FIG
-                rmqfig = RMQFIG()
-                start_time = time.time()
-                length_rmq, _ = rmqfig.solve(X, Y, k)
-                rmq_time = time.time() - start_time
-                rmqfig_metrics['time'].append(rmq_time)
-                rmqfig_metrics['memory'].append(rmqfig.get_memory_usage())
-                rmqfig_metrics['length'].append(length_rmq)
-                
-                # Run Greedy LCS-FIG
-                greedy = GreedyLCSFIG(X, Y, k)
-                start_time = time.time()
-                length_greedy, greedy_time = greedy.solve()
-                greedy_metrics['time'].append(greedy_time)
-                greedy_metrics['memory'].append(0)  # Constant memory usage
-                greedy_metrics['length'].append(length_greedy)
-            
             # Calculate averages
-            for algo, metrics in [('figdp', figdp_metrics), 
-                                ('rmqfig', rmqfig_metrics), 
-                                ('greedy', greedy_metrics)]:
-                results[algo][k]['time'].append(np.mean(metrics['time']))
-                results[algo][k]['memory'].append(np.mean(metrics['memory']))
-                results[algo][k]['lcs_length'].append(np.mean(metrics['length']))
+            for algo in ['figdp', 'rmqfig', 'greedy']:
+                runs = trials.get((algo, size, k), [])
+                results[algo][k]['time'].append(_mean([np.median(r['times']) for r in runs]))
+                results[algo][k]['memory'].append(_mean([r['peak_memory_mb'] for r in runs
+                                                         if r['peak_memory_mb'] is not None]))
+                results[algo][k]['lcs_length'].append(_mean([r['length'] for r in runs]))
             
             # Calculate relative performance
-            avg_dp_time = np.mean(figdp_metrics['time'])
-            avg_rmq_time = np.mean(rmqfig_metrics['time'])
-            avg_greedy_time = np.mean(greedy_metrics['time'])
+            avg_dp_time = results['figdp'][k]['time'][-1]
+            avg_rmq_time = results['rmqfig'][k]['time'][-1]
+            avg_greedy_time = results['greedy'][k]['time'][-1]
             
             results['relative_performance'][k]['figdp_vs_rmq'].append(avg_dp_time / avg_rmq_time)
             results['relative_performance'][k]['figdp_vs_greedy'].append(avg_dp_time / avg_greedy_time)
             results['relative_performance'][k]['rmq_vs_greedy'].append(avg_rmq_time / avg_greedy_time)
             
             # Calculate solution quality (compared to optimal FIG-DP solution)
-            avg_dp_length = np.mean(figdp_metrics['length'])
-            avg_greedy_length = np.mean(greedy_metrics['length'])
-            results['solution_quality'][k]['greedy_vs_optimal'].append(avg_greedy_length / avg_dp_length)
+            avg_dp_length = results['figdp'][k]['lcs_length'][-1]
+            avg_greedy_length = results['greedy'][k]['lcs_length'][-1]
+            results['solution_quality'][k]['greedy_vs_optimal'].append(
+                avg_greedy_length / avg_dp_length if avg_dp_length else float('nan'))
     
     return results
 
 def plot_results(results: Dict, output_dir: str) -> None:
     """Generate plots from comparison results."""
+    # Imported here so running and saving comparisons does not load matplotlib
+    import matplotlib.pyplot as plt
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
     
@@ -200,17 +195,35 @@ def save_results(results: Dict, output_dir: str) -> None:
 
 def main():
     """Main function to run algorithm comparison."""
+    parser = argparse.ArgumentParser(description="Compare FIG-DP, RMQ-FIG and greedy LCS-FIG")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes (default: all CPUs)")
+    parser.add_argument('--timeout', type=float, default=600,
+                        help="seconds per benchmark cell (default: 600)")
+    parser.add_argument('--engine', default='python',
+                        help="engine of FIG-DP and RMQ-FIG (default: python)")
+    parser.add_argument('--trials', type=int, default=3, help="sequence pairs per size")
+    parser.add_argument('--size', type=int, nargs='+', default=[100, 500, 1000, 2000, 5000],
+                        help="sequence lengths")
+    parser.add_argument('--gap', type=int, nargs='+', default=[2, 5, 10, 20, 40],
+                        help="gap constraints K")
+    args = parser.parse_args()
+    
     # Test parameters
-    sizes = [100, 500, 1000, 2000, 5000]
-    k_values = [2, 5, 10, 20, 40]
+    sizes = args.size
+    k_values = args.gap
     output_dir = "results/algorithm_comparison"
+    os.makedirs(output_dir, exist_ok=True)
+    checkpoint = os.path.join(output_dir, f'checkpoint_{args.engine}.jsonl')
     
     print("Starting comprehensive algorithm comparison...")
     print(f"Input sizes: {sizes}")
     print(f"K values: {k_values}")
+    print(f"Finished cells are kept in {checkpoint}; rerun to resume")
     
     # Run comparison
-    results = run_comparison(sizes, k_values)
+    results = run_comparison(sizes, k_values, args.trials, args.workers, checkpoint,
+                             args.timeout, args.engine)
     
     print("Generating plots...")
     plot_results(results, output_dir)
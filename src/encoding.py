@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Integer encoding of input sequences for the vectorized and compiled solvers.
+
+Sequences are mapped to unsigned code arrays that preserve character order
+(GreedyLCSFIG compares characters with <), so equality and ordering can be
+evaluated with NumPy instead of per-character Python comparisons:
+
+    ASCII    -- the bytes themselves, uint8, without a copy
+    Unicode  -- ranks in the joint sorted alphabet, smallest dtype
+
+DP tables are sized with table_dtype(): an LCS-FIG is never longer than the
+shorter sequence, so a 200x200 table fits in uint8 instead of int64.
+"""
+
+import numpy as np
+from typing import Tuple
+
+def smallest_uint(max_value: int) -> np.dtype:
+    """Get the smallest unsigned dtype holding values up to max_value."""
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if max_value <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.uint64)
+
+def table_dtype(n: int, m: int) -> np.dtype:
+    """Get the smallest dtype for a DP table of two sequences of lengths n and m."""
+    return smallest_uint(min(n, m))
+
+def encode_pair(X: str, Y: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode two sequences over their joint alphabet.
+
+    Args:
+        X: First sequence
+        Y: Second sequence
+
+    Returns:
+        Tuple of code arrays for X and Y, comparable with == and <
+    """
+    if X.isascii() and Y.isascii():
+        return (np.frombuffer(X.encode('ascii'), dtype=np.uint8),
+                np.frombuffer(Y.encode('ascii'), dtype=np.uint8))
+    alphabet = sorted(set(X) | set(Y))
+    rank = {ch: code for code, ch in enumerate(alphabet)}
+    dtype = smallest_uint(len(alphabet))
+    x = np.fromiter((rank[ch] for ch in X), dtype=dtype, count=len(X))
+    y = np.fromiter((rank[ch] for ch in Y), dtype=dtype, count=len(Y))
+    return x, y
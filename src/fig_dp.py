@@ -1,29 +1,283 @@
 #!/usr/bin/env python3
 
 import time
-import psutil
 import numpy as np
-from typing import List, Tuple
-import json
-import os
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from numpy.lib.stride_tricks import sliding_window_view
+from predecessors import PredecessorTable, bounded_backtrack, window_backtrack
+import fig_kernel
+import sparse_fig
+import bitparallel_fig
+from instrument import Instrumentation, measure, phase
+from metrics import MetricsRecorder, SOLVER_FIELDS
+import banded
+from encoding import encode_pair, table_dtype
+
+# Row kernels selectable with FIGDP(engine=...)
+ENGINES = ('python', 'numpy', 'numba', 'sparse', 'bitparallel', 'auto')
+
+# Engines that keep a compact form of the table instead of the DP table
+COMPACT_TABLES = {
+    'sparse': sparse_fig.MatchLevels,
+    'bitparallel': bitparallel_fig.BitRows,
+}
 
 class FIGDP:
     """Implementation of the basic FIG-DP algorithm."""
-    def __init__(self):
-        self.performance_data = {
-            'time': [],
-            'memory': [],
-            'size': [],
-            'k': [],
-            'lcs_length': []
-        }
+    def __init__(self, engine: str = 'python', instrument: Optional[Instrumentation] = None):
+        """
+        Initialize FIG-DP algorithm.
+        
+        Args:
+            engine: Row kernel, 'python' (reference loops), 'numpy'
+                (vectorized rows, no backpointers stored) or 'numba' (the
+                compiled kernel shared with RMQ-FIG; falls back to 'python'
+                when Numba is not installed), 'sparse' (only visits matching
+                cells, see sparse_fig), 'bitparallel' (one bit vector per
+                row, see bitparallel_fig) or 'auto' ('sparse' for inputs
+                with very few matches, else 'bitparallel')
+            instrument: Accumulates phase timers, counters and allocation
+                peaks of solve(), score() and solve_multi_k() (see
+                instrument); None measures nothing
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown FIG-DP engine '{engine}', expected one of {list(ENGINES)}")
+        self.engine = engine
+        self.instrument = instrument
+        self._compiled = fig_kernel.load_kernel() if engine == 'numba' else None
+        self._vectorized = engine == 'numpy'
+        self._kernel = self._fill_row_numpy if self._vectorized else self._fill_row
+        self.performance_data = MetricsRecorder(SOLVER_FIELDS)
     
     def get_memory_usage(self) -> float:
-        """Get current memory usage in MB."""
-        process = psutil.Process(os.getpid())
+        """Get current memory usage (RSS) in MB; psutil is only imported here."""
+        import psutil
+        process = psutil.Process()
         return process.memory_info().rss / 1024 / 1024
     
-    def solve(self, X: str, Y: str, K: int) -> Tuple[int, List[str]]:
+    def _peak_mb(self) -> float:
+        """Get the traced allocation peak of the last call in MB, or 0.0 if not traced."""
+        inst = self.instrument
+        if inst is None or not inst.trace_memory:
+            return 0.0
+        return inst.last_peak / 1024 / 1024
+    
+    def _count(self, X: str, Y: str, queried: bool) -> None:
+        """Count the cells and matches of a solve, and its window queries if queried."""
+        matches = sparse_fig.match_count(X, Y)
+        self.instrument.count(cells=len(X) * len(Y), matches=matches,
+                              queries=matches if queried else 0)
+    
+    @staticmethod
+    def _fill_row(rows: np.ndarray, i: int, X: str, Y: str, K: int,
+                  prev: Optional[PredecessorTable] = None) -> None:
+        """
+        Fill row i of the DP table.
+        
+        Row r of the table lives at rows[r % len(rows)], so rows is either
+        the full (n+1)x(m+1) table or a ring buffer of at least K+2 rows.
+        """
+        size = len(rows)
+        row = rows[i % size]
+        up = rows[(i-1) % size]
+        for j in range(1, len(Y)+1):
+            if X[i-1] == Y[j-1]:
+                # Check previous positions within gap constraint
+                max_prev = 0
+                max_pos = None
+                for pi in range(max(0, i-K-1), i):
+                    prow = rows[pi % size]
+                    for pj in range(max(0, j-K-1), j):
+                        if prow[pj] > max_prev:
+                            max_prev = prow[pj]
+                            max_pos = (pi, pj)
+                
+                if max_prev > 0:
+                    row[j] = max_prev + 1
+                    if prev is not None:
+                        prev.set(i, j, *max_pos)
+                else:
+                    row[j] = 1
+            else:
+                row[j] = max(up[j], row[j-1])
+    
+    @staticmethod
+    def _fill_row_numpy(rows: np.ndarray, i: int, X: np.ndarray, Y: np.ndarray, K: int,
+                        prev: Optional[PredecessorTable] = None) -> None:
+        """
+        Vectorized _fill_row; X and Y are code arrays from
+        encoding.encode_pair and prev is never filled.
+        
+        The gap window maximum of every column is the column-wise maximum
+        of the last K+1 rows followed by a width-(K+1) sliding maximum. A
+        mismatch takes the larger of the cell above and the cell to its
+        left, so the row is a running maximum that restarts at every match;
+        offsetting each run by its index times m+1 lets one
+        np.maximum.accumulate compute all runs at once.
+        """
+        m = len(Y)
+        if not m:
+            return
+        size = len(rows)
+        window = rows[[r % size for r in range(max(0, i-K-1), i)]]
+        colmax = window.max(axis=0)[:m]
+        if K + 1 >= m:
+            gap = np.maximum.accumulate(colmax)
+        else:
+            padded = np.concatenate((np.zeros(K, dtype=rows.dtype), colmax))
+            gap = sliding_window_view(padded, K+1).max(axis=1)
+        match = Y == X[i-1]
+        base = np.where(match, gap + 1, rows[(i-1) % size][1:])
+        runs = np.cumsum(match) * (m + 1)
+        rows[i % size][1:] = np.maximum.accumulate(base + runs) - runs
+    
+    def _prepare(self, X: str, Y: str) -> tuple:
+        """Convert X and Y to the representation the selected row kernel expects."""
+        if self._vectorized:
+            return encode_pair(X, Y)
+        return X, Y
+    
+    def _compact(self, X: str, Y: str) -> Optional[type]:
+        """Get the compact table class solving this pair instead of the DP table, or None."""
+        if self.engine == 'auto':
+            return sparse_fig.MatchLevels if sparse_fig.is_sparse(X, Y) else bitparallel_fig.BitRows
+        return COMPACT_TABLES.get(self.engine)
+    
+    def score(self, X: str, Y: str, K: int, band: Optional[Union[int, str]] = None) -> int:
+        """
+        Compute only the length of LCS-FIG in O(Km) memory.
+        
+        The recurrence looks back at most K+1 rows, so the table is kept as
+        a ring buffer of K+2 rows and no backpointers are stored. No
+        performance data is recorded.
+        
+        Args:
+            X: First sequence
+            Y: Second sequence
+            K: Gap constraint
+            band: Only compute a diagonal band of this width, see solve()
+            
+        Returns:
+            Length of LCS-FIG
+        """
+        inst = self.instrument
+        if inst is None:
+            return self._score(X, Y, K, band)
+        with inst.measure(), inst.phase('fill'):
+            length = self._score(X, Y, K, band)
+        self._count(X, Y, band is None and self._compact(X, Y) is None)
+        return length
+    
+    def _score(self, X: str, Y: str, K: int, band: Optional[Union[int, str]]) -> int:
+        """Compute the length of LCS-FIG, see score()."""
+        if band is not None:
+            return len(banded.BandedTable.fit(X, Y, None, band))
+        table = self._compact(X, Y)
+        if table is not None:
+            return table.score(X, Y)
+        if self._compiled is not None:
+            return fig_kernel.score(self._compiled, X, Y, K)
+        n, m = len(X), len(Y)
+        rows = np.zeros((min(n, K+1) + 1, m+1), dtype=table_dtype(n, m))
+        X, Y = self._prepare(X, Y)
+        for i in range(1, n+1):
+            self._kernel(rows, i, X, Y, K)
+        return int(rows[n % len(rows)][m])
+    
+    def _band_rows(self, band: List[np.ndarray], lo: int, hi: int,
+                   X: str, Y: str, K: int) -> Iterator[np.ndarray]:
+        """Yield DP rows lo+1..hi computed from the rows ending at row lo."""
+        if self._compiled is not None:
+            yield from fig_kernel.band_rows(self._compiled, band, lo, hi, X, Y, K)
+            return
+        rows = np.zeros((K+2, len(Y)+1), dtype=table_dtype(len(X), len(Y)))
+        for r, row in enumerate(band, lo - len(band) + 1):
+            rows[r % (K+2)] = row
+        X, Y = self._prepare(X, Y)
+        for i in range(lo+1, hi+1):
+            self._kernel(rows, i, X, Y, K)
+            yield rows[i % (K+2)].copy()
+    
+    def solve_bounded(self, X: str, Y: str, K: int) -> Tuple[int, List[str]]:
+        """
+        Solve LCS-FIG in O(Km log n) memory by divide-and-conquer traceback.
+        
+        Returns the same result as solve() at about log n times the work,
+        for inputs whose full table does not fit in memory. The compact
+        engines solve directly: 'sparse' needs O(r) memory for r matches
+        and 'bitparallel' nm bits. No performance data is recorded.
+        
+        Args:
+            X: First sequence
+            Y: Second sequence
+            K: Gap constraint
+            
+        Returns:
+            Tuple of (length of LCS-FIG, the actual subsequence)
+        """
+        table = self._compact(X, Y)
+        if table is not None:
+            table = table(X, Y)
+            return len(table), table.backtrack(X, Y, K)
+        return bounded_backtrack(
+            X, Y, K, lambda band, lo, hi, Yp: self._band_rows(band, lo, hi, X, Yp, K))
+    
+    def _table(self, X: str, Y: str, K: int,
+               prev: Optional[PredecessorTable] = None) -> np.ndarray:
+        """Fill the full DP table, recording backpointers into prev if given."""
+        if self._compiled is not None:
+            return fig_kernel.solve_table(self._compiled, X, Y, K,
+                                          None if prev is None else prev.codes)
+        n, m = len(X), len(Y)
+        dp = np.zeros((n+1, m+1), dtype=table_dtype(n, m))
+        Xs, Ys = self._prepare(X, Y)
+        for i in range(1, n+1):
+            self._kernel(dp, i, Xs, Ys, K, prev)
+        return dp
+    
+    def solve_multi_k(self, X: str, Y: str, ks: Iterable[int]) -> Dict[int, Tuple[int, List[str]]]:
+        """
+        Solve LCS-FIG for several gap constraints with one table fill.
+        
+        The table values do not depend on K: it is non-decreasing along rows
+        and columns, so the maximum of any gap window is its bottom-right
+        cell (i-1,j-1). K only decides which window cell is the predecessor
+        of a match. The table is therefore filled once with the smallest K,
+        the cheapest fill, and only the traceback is repeated per K.
+        Performance data is not recorded.
+        
+        Args:
+            X: First sequence
+            Y: Second sequence
+            ks: Gap constraints
+            
+        Returns:
+            Dict mapping each K to the result solve(X, Y, K) gives
+        """
+        ks = sorted(set(ks))
+        if not ks:
+            return {}
+        inst = self.instrument
+        with measure(inst):
+            with phase(inst, 'fill'):
+                table = self._compact(X, Y)
+                if table is not None:
+                    table = table(X, Y)
+                    length = len(table)
+                else:
+                    dp = self._table(X, Y, ks[0])
+                    length = int(dp[len(X)][len(Y)])
+            with phase(inst, 'traceback'):
+                if table is not None:
+                    results = {K: (length, table.backtrack(X, Y, K)) for K in ks}
+                else:
+                    results = {K: (length, window_backtrack(X, Y, K, dp)) for K in ks}
+        if inst is not None:
+            self._count(X, Y, table is None)
+        return results
+    
+    def solve(self, X: str, Y: str, K: int, record: bool = True,
+              band: Optional[Union[int, str]] = None) -> Tuple[int, List[str]]:
         """
         Solve LCS-FIG using basic dynamic programming approach.
         
@@ -31,74 +285,71 @@ class FIGDP:
             X: First sequence
             Y: Second sequence
             K: Gap constraint
+            record: Whether to time the table fill into performance_data;
+                its 'memory' entry is the traced allocation peak in MB
+                with a memory-tracing instrument, else 0.0
+            band: If given, only the diagonals within this width of the
+                corners are computed (see banded), in O(n * (|n-m| + band)) time
+                and memory whatever the engine; the result is the best one
+                inside the band. 'auto' doubles the width from
+                banded.AUTO_BAND until the result is proven to be the one
+                of the full table
             
         Returns:
             Tuple of (length of LCS-FIG, the actual subsequence)
         """
-        start_time = time.time()
-        initial_memory = self.get_memory_usage()
+        inst = self.instrument
+        if record:
+            start_time = time.perf_counter()
         
         n, m = len(X), len(Y)
-        dp = np.zeros((n+1, m+1), dtype=int)
-        prev = {}  # Store previous positions for backtracking
         
-        # Main algorithm
-        for i in range(1, n+1):
-            for j in range(1, m+1):
-                if X[i-1] == Y[j-1]:
-                    # Check previous positions within gap constraint
-                    max_prev = 0
-                    max_pos = None
-                    for pi in range(max(0, i-K-1), i):
-                        for pj in range(max(0, j-K-1), j):
-                            if dp[pi][pj] > max_prev:
-                                max_prev = dp[pi][pj]
-                                max_pos = (pi, pj)
-                    
-                    if max_prev > 0:
-                        dp[i][j] = max_prev + 1
-                        prev[(i,j)] = max_pos
-                    else:
-                        dp[i][j] = 1
+        with measure(inst):
+            # Main algorithm
+            with phase(inst, 'fill'):
+                if band is not None:
+                    table = banded.BandedTable.fit(X, Y, K, band)
                 else:
-                    dp[i][j] = max(dp[i-1][j], dp[i][j-1])
-        
-        # Record performance data
-        end_time = time.time()
-        final_memory = self.get_memory_usage()
+                    table = self._compact(X, Y)
+                    table = table(X, Y) if table is not None else None
+                if table is not None:
+                    max_length = len(table)
+                else:
+                    prev = PredecessorTable(n, m, K) if not self._vectorized else None
+                    dp = self._table(X, Y, K, prev)
+                    max_length = int(dp[n][m])
+            if record:
+                end_time = time.perf_counter()
+            
+            # Backtrack to get the subsequence
+            with phase(inst, 'traceback'):
+                if table is not None:
+                    lcs = table.backtrack(X, Y, K)
+                elif prev is not None:
+                    lcs = prev.backtrack(X, dp)
+                else:
+                    lcs = window_backtrack(X, Y, K, dp)
         
-        self.performance_data['time'].append(end_time - start_time)
-        self.performance_data['memory'].append(final_memory - initial_memory)
-        self.performance_data['size'].append(max(n, m))
-        self.performance_data['k'].append(K)
-        self.performance_data['lcs_length'].append(int(dp[n][m]))
+        if inst is not None:
+            self._count(X, Y, table is None)
         
-        # Backtrack to get the subsequence
-        lcs = []
-        i, j = n, m
-        max_length = dp[n][m]
-        while i > 0 and j > 0:
-            if (i,j) in prev:
-                lcs.append(X[i-1])
-                i, j = prev[(i,j)]
-            elif dp[i][j] == dp[i-1][j]:
-                i -= 1
-            else:
-                j -= 1
+        # Record performance data
+        if record:
+            self.performance_data.record(time=end_time - start_time, memory=self._peak_mb(),
+                                         size=max(n, m), k=K, lcs_length=max_length)
         
-        return max_length, lcs[::-1]
+        return max_length, lcs
     
     def save_performance_data(self, filename: str) -> None:
-        """Save performance data to a JSON file."""
-        with open(filename, 'w') as f:
-            json.dump(self.performance_data, f, indent=4)
+        """Save the performance summary and recent records to a JSON file."""
+        self.performance_data.to_json(filename)
     
     def get_average_performance(self) -> dict:
-        """Get average performance metrics."""
+        """Get average performance metrics over all recorded solves."""
         return {
-            'avg_time': np.mean(self.performance_data['time']),
-            'avg_memory': np.mean(self.performance_data['memory']),
-            'avg_length': np.mean(self.performance_data['lcs_length'])
+            'avg_time': self.performance_data.mean('time'),
+            'avg_memory': self.performance_data.mean('memory'),
+            'avg_length': self.performance_data.mean('lcs_length')
         }
 
 if __name__ == "__main__":
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Compiled row kernel shared by FIG-DP and RMQ-FIG.
+
+fill_rows() computes the LCS-FIG table with the two-level sliding-window
+maximum of RMQ-FIG (see rmq_fig.SlidingWindowRMQ) written with plain loops
+over NumPy arrays, so Numba can compile it. It is compiled lazily by
+load_kernel() the first time a solver asks for engine='numba'; when Numba
+is not importable load_kernel() returns None and the solvers fall back to
+their reference engines.
+"""
+
+import numpy as np
+from typing import Callable, Iterator, List, Optional
+from encoding import encode_pair, table_dtype
+
+def fill_rows(x: np.ndarray, y: np.ndarray, K: int, rows: np.ndarray,
+              lo: int, hi: int, prev: np.ndarray) -> None:
+    """
+    Compute DP rows lo+1..hi.
+
+    Row r lives at rows[r % len(rows)] and rows max(0, lo-K)..lo must
+    already be there, so rows is either the full table or a ring buffer
+    with room for K+1 rows plus the rows being computed. Window maxima are
+    tracked as int64 packed keys value*S + S-1-(r*(m+1)+c), whose maximum
+    is the row-major first cell holding the maximum value, so predecessors
+    match the reference solvers. With S = (hi+1)(m+1) and values at most
+    min(hi, m), the keys fit in int64 while (min(hi, m)+1) * S < 2^63, about
+    n^2 m < 9.2e18; larger tables raise ValueError rather than overflow.
+
+    Args:
+        x: Codes of the first sequence, see encoding.encode_pair
+        y: Codes of the second sequence
+        K: Gap constraint
+        rows: DP rows, see above
+        lo: Last row already present
+        hi: Last row to compute
+        prev: Predecessor codes as in PredecessorTable.codes, or an empty
+            array to skip recording them
+    """
+    size = rows.shape[0]
+    m = y.shape[0]
+    width = K + 1
+    cols = m + 1
+    S = (hi + 1) * cols
+    if (min(hi, m) + 1.0) * S >= 9223372036854775808.0:
+        raise ValueError("Table too large for the int64 keys of fill_rows")
+    record = prev.shape[0] > 0
+    # Per-column deques over the last K+1 row window maxima (ring arrays)
+    qkey = np.zeros((cols, width + 1), dtype=np.int64)
+    qrow = np.zeros((cols, width + 1), dtype=np.int64)
+    qhead = np.zeros(cols, dtype=np.int64)
+    qlen = np.zeros(cols, dtype=np.int64)
+    # Deque over the columns of the row being pushed
+    hkey = np.zeros(cols, dtype=np.int64)
+    hcol = np.zeros(cols, dtype=np.int64)
+
+    for r in range(max(0, lo - K), hi + 1):
+        row = rows[r % size]
+        if r > lo:
+            up = rows[(r - 1) % size]
+            xr = x[r - 1]
+            for j in range(1, cols):
+                if xr == y[j - 1]:
+                    c = j - 1
+                    key = qkey[c, qhead[c]]
+                    best = key // S
+                    if best > 0:
+                        row[j] = best + 1
+                        if record:
+                            flat = S - 1 - key % S
+                            prev[r, j] = (r - flat // cols) * (K + 2) + (j - flat % cols)
+                    else:
+                        row[j] = 1
+                else:
+                    row[j] = max(up[j], row[j - 1])
+
+        # Push row r into the column deques
+        h = 0
+        t = 0
+        base = S - 1 - r * cols
+        for c in range(cols):
+            key = np.int64(row[c]) * S + base - c
+            while t > h and hkey[t - 1] < key:
+                t -= 1
+            hkey[t] = key
+            hcol[t] = c
+            t += 1
+            if hcol[h] <= c - width:
+                h += 1
+            best = hkey[h]
+            n = qlen[c]
+            while n > 0 and qkey[c, (qhead[c] + n - 1) % (width + 1)] < best:
+                n -= 1
+            tail = (qhead[c] + n) % (width + 1)
+            qkey[c, tail] = best
+            qrow[c, tail] = r
+            n += 1
+            if qrow[c, qhead[c]] <= r - width:
+                qhead[c] = (qhead[c] + 1) % (width + 1)
+                n -= 1
+            qlen[c] = n
+
+_compiled = None
+
+def load_kernel() -> Optional[Callable]:
+    """Return fill_rows compiled with Numba, or None if Numba is not importable."""
+    global _compiled
+    if _compiled is None:
+        try:
+            import numba
+        except ImportError:
+            return None
+        _compiled = numba.njit(cache=True)(fill_rows)
+    return _compiled
+
+_NO_PREV = np.zeros((0, 0), dtype=np.uint16)
+
+def solve_table(kernel: Callable, X: str, Y: str, K: int,
+                prev: Optional[np.ndarray] = None) -> np.ndarray:
+    """Fill the full (n+1)x(m+1) table, recording predecessor codes into prev."""
+    dp = np.zeros((len(X)+1, len(Y)+1), dtype=table_dtype(len(X), len(Y)))
+    x, y = encode_pair(X, Y)
+    kernel(x, y, K, dp, 0, len(X), _NO_PREV if prev is None else prev)
+    return dp
+
+def score(kernel: Callable, X: str, Y: str, K: int) -> int:
+    """Compute only the length of LCS-FIG with a ring buffer of K+2 rows."""
+    rows = np.zeros((K+2, len(Y)+1), dtype=table_dtype(len(X), len(Y)))
+    x, y = encode_pair(X, Y)
+    kernel(x, y, K, rows, 0, len(X), _NO_PREV)
+    return int(rows[len(X) % (K+2)][len(Y)])
+
+def band_rows(kernel: Callable, band: List[np.ndarray], lo: int, hi: int,
+              X: str, Y: str, K: int, chunk: int = 64) -> Iterator[np.ndarray]:
+    """Yield DP rows lo+1..hi from the rows ending at row lo, chunk rows per call."""
+    x, y = encode_pair(X, Y)
+    size = K + 1 + chunk
+    rows = np.zeros((size, len(Y)+1), dtype=table_dtype(len(X), len(Y)))
+    for r, row in enumerate(band, lo - len(band) + 1):
+        rows[r % size] = row
+    while lo < hi:
+        end = min(hi, lo + chunk)
+        kernel(x, y, K, rows, lo, end, _NO_PREV)
+        for i in range(lo+1, end+1):
+            yield rows[i % size].copy()
+        lo = end
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Incremental LCS-FIG against a fixed sequence while the other one grows.
+
+IncrementalSolver keeps only what the next rows need: with the 'python'
+engine the last two DP rows and the sliding-window RMQ structure of
+RMQ-FIG (K+1 rows of column window maxima), with 'bitparallel' the last
+row as one m-bit integer (see bitparallel_fig). Appending c characters to X
+costs O(c*m), respectively O(c*m/w), whatever was appended before.
+"""
+
+import numpy as np
+from typing import Iterable
+from encoding import table_dtype
+from bitparallel_fig import match_masks, popcount
+from rmq_fig import RMQFIG, RMQStructure
+
+# Engines selectable with IncrementalSolver(engine=...)
+ENGINES = ('python', 'bitparallel')
+
+class IncrementalSolver:
+    """LCS-FIG length of a growing sequence X against a fixed sequence Y."""
+    def __init__(self, Y: str, K: int, engine: str = 'bitparallel'):
+        """
+        Initialize the solver with X empty.
+
+        Args:
+            Y: The fixed sequence
+            K: Gap constraint
+            engine: 'python' (RMQ-FIG rows with the sliding backend) or
+                'bitparallel' (one bit vector per row)
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown incremental engine '{engine}', expected one of {list(ENGINES)}")
+        self.Y = Y
+        self.K = K
+        self.engine = engine
+        self.n = 0
+        m = len(Y)
+        if engine == 'python':
+            # The sliding backend never needs the number of rows
+            self._rmq = RMQStructure(0, m, K, 'sliding')
+            self._rows = np.zeros((2, m+1), dtype=table_dtype(m, m))
+        else:
+            self._masks = match_masks(Y)
+            self._full = (1 << m) - 1
+            self._V = self._full
+
+    @property
+    def length(self) -> int:
+        """Get the length of LCS-FIG of the X appended so far and Y."""
+        if self.engine == 'python':
+            return int(self._rows[self.n % 2][len(self.Y)])
+        return len(self.Y) - popcount(self._V)
+
+    def extend_x(self, chars: Iterable[str]) -> int:
+        """
+        Append characters to X.
+
+        Args:
+            chars: Characters to append, e.g. a string
+
+        Returns:
+            The updated length of LCS-FIG
+        """
+        if self.engine == 'python':
+            for ch in chars:
+                self.n += 1
+                RMQFIG._fill_row(self._rows, self.n, ch, self.Y, self.K, self._rmq)
+        else:
+            masks, full, V = self._masks, self._full, self._V
+            for ch in chars:
+                U = V & masks.get(ch, 0)
+                V = ((V + U) | (V - U)) & full
+                self.n += 1
+            self._V = V
+        return self.length
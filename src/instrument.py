@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Opt-in instrumentation of LCS-FIG solves.
+
+An Instrumentation passed to FIGDP or RMQFIG (instrument=...) accumulates
+perf_counter_ns timers per phase ('fill' for the table or its compact form,
+'traceback' for the subsequence), counters of table cells, matching cells
+and gap-window queries, and the tracemalloc peak of every measured call,
+i.e. the most memory allocated at once, which RSS deltas miss once it is
+freed. Solvers without one only pay an `is None` check per call.
+
+tracemalloc sees Python and NumPy allocations but not memory allocated by
+compiled Numba code, and slows allocation-heavy code down while tracing;
+trace_memory=False keeps the timers and counters only.
+"""
+
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from typing import Iterator, Optional
+
+# Shared by phase() and measure() when instrumentation is disabled
+_DISABLED = nullcontext()
+
+class Instrumentation:
+    """
+    Accumulated measurements of the solver calls it is attached to.
+
+    Attributes:
+        calls: Number of measured calls
+        timers: Nanoseconds spent per phase name
+        counters: Event counts per name ('cells', 'matches', 'queries')
+        last_peak: Peak traced allocation of the last call in bytes
+        peak_memory: Largest peak of any call in bytes
+    """
+    def __init__(self, trace_memory: bool = True):
+        """
+        Initialize empty measurements.
+
+        Args:
+            trace_memory: Whether to trace allocations with tracemalloc
+        """
+        self.trace_memory = trace_memory
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear all measurements."""
+        self.calls = 0
+        self.timers = {}
+        self.counters = Counter()
+        self.last_peak = 0
+        self.peak_memory = 0
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Add the time spent in the block to the timer of phase name."""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.timers[name] = self.timers.get(name, 0) + time.perf_counter_ns() - start
+
+    @contextmanager
+    def measure(self) -> Iterator[None]:
+        """Count one call and, if tracing memory, record its allocation peak."""
+        self.calls += 1
+        if not self.trace_memory:
+            yield
+            return
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        elif hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        try:
+            yield
+        finally:
+            self.last_peak = max(0, tracemalloc.get_traced_memory()[1] - base)
+            self.peak_memory = max(self.peak_memory, self.last_peak)
+            if started:
+                tracemalloc.stop()
+
+    def count(self, **counts: int) -> None:
+        """Add to the named counters, e.g. count(cells=n*m)."""
+        self.counters.update(counts)
+
+    def report(self) -> dict:
+        """Get the measurements as a JSON-serializable dict; times are in seconds."""
+        return {
+            'calls': self.calls,
+            'time': {name: ns / 1e9 for name, ns in self.timers.items()},
+            'counters': dict(self.counters),
+            'peak_memory_mb': self.peak_memory / 1024 / 1024,
+        }
+
+def phase(instrument: Optional[Instrumentation], name: str):
+    """Get instrument.phase(name), or a no-op context without instrumentation."""
+    return _DISABLED if instrument is None else instrument.phase(name)
+
+def measure(instrument: Optional[Instrumentation]):
+    """Get instrument.measure(), or a no-op context without instrumentation."""
+    return _DISABLED if instrument is None else instrument.measure()
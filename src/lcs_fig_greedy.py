@@ -9,9 +9,10 @@ Time Complexity: O(n + m) where n and m are the lengths of input sequences
 Space Complexity: O(1) as it uses only constant extra space
 """
 
-import random
 import string
 import time
+from typing import Optional
+from metrics import MetricsRecorder
 
 class GreedyLCSFIG:
     """
@@ -36,10 +37,7 @@ class GreedyLCSFIG:
         self.seq1 = seq1
         self.seq2 = seq2
         self.k = k
-        self.performance_data = {
-            'time': [],
-            'length': []
-        }
+        self.performance_data = MetricsRecorder(('time', 'length'))
         
     def solve(self) -> tuple[int, float]:
         """
@@ -65,8 +63,7 @@ class GreedyLCSFIG:
                 j += 1
                 
         execution_time = time.time() - start_time
-        self.performance_data['time'].append(execution_time)
-        self.performance_data['length'].append(lcs_length)
+        self.performance_data.record(time=execution_time, length=lcs_length)
         
         return lcs_length, execution_time
     
@@ -77,37 +74,42 @@ class GreedyLCSFIG:
         Returns:
             dict: Dictionary containing performance metrics
         """
+        runs = self.performance_data.count
         return {
-            'avg_time': sum(self.performance_data['time']) / len(self.performance_data['time']) if self.performance_data['time'] else 0,
-            'avg_length': sum(self.performance_data['length']) / len(self.performance_data['length']) if self.performance_data['length'] else 0,
-            'num_runs': len(self.performance_data['time'])
+            'avg_time': self.performance_data.mean('time') if runs else 0,
+            'avg_length': self.performance_data.mean('length') if runs else 0,
+            'num_runs': runs
         }
     
     @staticmethod
-    def generate_random_sequence(length: int) -> str:
+    def generate_random_sequence(length: int, seed: Optional[int] = None) -> str:
         """
         Generate a random sequence of specified length containing lowercase letters.
         
         Args:
             length (int): Length of sequence to generate
+            seed (int, optional): Seed making the sequence reproducible
             
         Returns:
             str: Random sequence of lowercase letters
         """
-        return ''.join(random.choices(string.ascii_lowercase, k=length))
+        from workload import uniform
+        return uniform(length, string.ascii_lowercase, seed)
     
     @staticmethod
-    def generate_random_dna_sequence(length: int) -> str:
+    def generate_random_dna_sequence(length: int, seed: Optional[int] = None) -> str:
         """
         Generate a random DNA sequence of specified length.
         
         Args:
             length (int): Length of sequence to generate
+            seed (int, optional): Seed making the sequence reproducible
             
         Returns:
             str: Random DNA sequence
         """
-        return ''.join(random.choices(['A', 'C', 'G', 'T'], k=length))
+        from workload import DNA, uniform
+        return uniform(length, DNA, seed)
 
 if __name__ == "__main__":
     # Example usage
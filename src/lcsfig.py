@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Command-line LCS-FIG solver for streams of sequence pairs.
+
+Pairs are read lazily from files (plain or gzip) or standard input ('-',
+the default), in one of the INPUT_FORMATS:
+
+    pairs   one pair per line, 'X Y' or 'ID X Y' separated by whitespace;
+            blank lines and lines starting with '#' are skipped
+    fasta   FASTA records, consecutive records forming a pair
+    fastq   FASTQ records, paired the same way
+
+'auto' picks the format from the first non-blank line of each input. Every
+result is written to standard output as one JSON line as soon as it is
+known, with the pair's 'index' (0-based over all inputs), 'id' (pairs
+format) or 'x' and 'y' (record names), 'length' and, unless --length-only
+or for greedy, the subsequence 'lcs'. With --workers N the pairs are solved
+across N processes by batch.solve_stream in bounded memory, and results
+come in completion order unless --ordered is given:
+
+    python src/lcsfig.py -k 5 pairs.txt
+    zcat reads.fa.gz | python src/lcsfig.py -k 3 --format fasta --workers 8 | jq .length
+
+The repository has no packaging metadata, so there is no installed console
+entry point; scripts/lcsfig runs this file from anywhere on PATH.
+"""
+
+import argparse
+import json
+import os
+import sys
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from batch import ALGORITHMS, solve_stream
+from fig_dp import ENGINES
+from seqio import open_input, parse_fasta, parse_fastq
+
+INPUT_FORMATS = ('auto', 'pairs', 'fasta', 'fastq')
+
+# Command-line algorithms; 'auto' is FIG-DP picking its engine per pair
+CLI_ALGORITHMS = ALGORITHMS + ('auto',)
+
+# Identifying fields and sequences of one input pair
+Pair = Tuple[Dict[str, str], str, str]
+
+def _decode(seq: bytes) -> str:
+    return seq.decode('utf-8')
+
+def parse_pairs(lines: Iterable[bytes]) -> Iterator[Pair]:
+    """
+    Parse the pairs format.
+
+    Args:
+        lines: Lines of the input
+
+    Yields:
+        Tuples of ({'id': ID} or {}, X, Y)
+
+    Raises:
+        ValueError: If a line has other than 2 or 3 fields
+    """
+    for number, line in enumerate(lines, 1):
+        fields = line.split()
+        if not fields or fields[0].startswith(b'#'):
+            continue
+        if len(fields) == 2:
+            yield {}, _decode(fields[0]), _decode(fields[1])
+        elif len(fields) == 3:
+            yield {'id': _decode(fields[0])}, _decode(fields[1]), _decode(fields[2])
+        else:
+            raise ValueError(f"Line {number}: expected 'X Y' or 'ID X Y', got {len(fields)} fields")
+
+def pair_records(records: Iterable[Tuple[str, bytes]]) -> Iterator[Pair]:
+    """
+    Pair consecutive FASTA/FASTQ records.
+
+    Raises:
+        ValueError: If the number of records is odd
+    """
+    records = iter(records)
+    for x_name, X in records:
+        try:
+            y_name, Y = next(records)
+        except StopIteration:
+            raise ValueError(f"Record '{x_name}' has no partner, expected an even number of records")
+        yield {'x': x_name, 'y': y_name}, _decode(X), _decode(Y)
+
+def _sniff(lines: Iterator[bytes]) -> Tuple[str, Iterator[bytes]]:
+    """Detect the format of lines from the first non-blank one, and put it back."""
+    skipped = []
+    for line in lines:
+        skipped.append(line)
+        if line.strip():
+            fmt = {b'>': 'fasta', b'@': 'fastq'}.get(line.lstrip()[:1], 'pairs')
+            return fmt, chain(skipped, lines)
+    return 'pairs', iter(skipped)
+
+def read_pairs(lines: Iterable[bytes], fmt: str = 'auto') -> Iterator[Pair]:
+    """
+    Parse the pairs of one input.
+
+    Args:
+        lines: Lines of the input, as bytes
+        fmt: One of INPUT_FORMATS
+
+    Yields:
+        Tuples of (identifying fields, X, Y)
+    """
+    if fmt not in INPUT_FORMATS:
+        raise ValueError(f"Unknown input format '{fmt}', expected one of {list(INPUT_FORMATS)}")
+    lines = iter(lines)
+    if fmt == 'auto':
+        fmt, lines = _sniff(lines)
+    if fmt == 'fasta':
+        return pair_records(parse_fasta(lines))
+    if fmt == 'fastq':
+        return pair_records(parse_fastq(lines))
+    return parse_pairs(lines)
+
+def read_inputs(paths: Iterable[str], fmt: str = 'auto') -> Iterator[Pair]:
+    """Read the pairs of every input in turn, '-' being standard input."""
+    for path in paths:
+        if path == '-':
+            yield from read_pairs(sys.stdin.buffer, fmt)
+        else:
+            with open_input(path) as f:
+                yield from read_pairs(f, fmt)
+
+def format_result(index: int, fields: Dict[str, str], length: int,
+                  subsequence: Optional[List[str]]) -> str:
+    """Format one result as a JSON line, without the newline."""
+    result = {'index': index}
+    result.update(fields)
+    result['length'] = length
+    if subsequence is not None:
+        result['lcs'] = ''.join(subsequence)
+    return json.dumps(result)
+
+def run(pairs: Iterable[Pair], K: int, out, workers: int = 1, algorithm: str = 'auto',
+        engine: Optional[str] = None, length_only: bool = False, ordered: bool = False,
+        chunk_size: int = 64) -> int:
+    """
+    Solve a stream of pairs and write one JSON line per result.
+
+    Args:
+        pairs: Pairs as given by read_inputs()
+        K: Gap constraint
+        out: Text stream the JSON lines are written to
+        workers: Number of worker processes; 1 solves in this process
+        algorithm: One of CLI_ALGORITHMS
+        engine: Engine of FIGDP/RMQFIG (default 'python', or 'auto' for
+            the 'auto' algorithm)
+        length_only: Only compute lengths
+        ordered: Write results in input order; with workers > 1 results
+            that finish early are held back until their predecessors are
+            written
+        chunk_size: Pairs per task sent to a worker
+
+    Returns:
+        Number of pairs solved
+    """
+    if algorithm == 'auto':
+        algorithm, engine = 'figdp', engine or 'auto'
+    # Identifying fields of the pairs read but not yet written; with
+    # workers > 1 only the pairs in flight are held
+    fields = {}
+
+    def sequences():
+        for index, (names, X, Y) in enumerate(pairs):
+            fields[index] = names
+            yield X, Y
+
+    results = solve_stream(sequences(), K, workers, algorithm, engine, length_only, chunk_size)
+    held = {}
+    count = 0
+    try:
+        for index, length, subsequence in results:
+            if not ordered:
+                out.write(format_result(index, fields.pop(index), length, subsequence) + '\n')
+                count += 1
+                continue
+            held[index] = (length, subsequence)
+            while count in held:
+                length, subsequence = held.pop(count)
+                out.write(format_result(count, fields.pop(count), length, subsequence) + '\n')
+                count += 1
+    finally:
+        # Stop the pool now rather than when the generator is collected
+        results.close()
+    return count
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Solve the pairs of the inputs; return the exit status."""
+    parser = argparse.ArgumentParser(
+        description="Solve LCS-FIG for sequence pairs, writing one JSON line per pair")
+    parser.add_argument('inputs', nargs='*', default=['-'],
+                        help="input files, plain or gzip; '-' is standard input (default)")
+    parser.add_argument('-k', '--gap', type=int, required=True, help="gap constraint K")
+    parser.add_argument('-a', '--algorithm', choices=CLI_ALGORITHMS, default='auto',
+                        help="solver (default: %(default)s, FIG-DP choosing its engine)")
+    parser.add_argument('-e', '--engine', choices=ENGINES,
+                        help="engine of figdp/rmqfig (default: python)")
+    parser.add_argument('-f', '--format', choices=INPUT_FORMATS, default='auto',
+                        help="input format (default: %(default)s)")
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help="worker processes, 0 for all CPUs (default: %(default)s)")
+    parser.add_argument('--chunk-size', type=int, default=64, help="pairs per worker task")
+    parser.add_argument('--length-only', action='store_true', help="only compute lengths")
+    parser.add_argument('--ordered', action='store_true',
+                        help="write results in input order when using workers")
+    args = parser.parse_args(argv)
+    if args.gap < 0:
+        parser.error("the gap constraint must be non-negative")
+
+    try:
+        run(read_inputs(args.inputs, args.format), args.gap, sys.stdout,
+            args.workers or os.cpu_count() or 1, args.algorithm, args.engine,
+            args.length_only, args.ordered, args.chunk_size)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # The reader went away (e.g. head), which is not an error; keep the
+        # interpreter's final flush from failing again
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except (OSError, ValueError) as e:
+        print(f"lcsfig: error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
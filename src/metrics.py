@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Constant-memory performance metrics shared by the LCS-FIG solvers.
+
+MetricsRecorder keeps the last `capacity` records of a fixed set of numeric
+fields in a ring buffer (an array of doubles) and, for every field, all-time streaming
+statistics: Welford's mean and variance, the extremes, and a QuantileSketch
+of logarithmic buckets whose quantiles are within SKETCH_ACCURACY of the
+true value. A solver can therefore record millions of calls without its
+history growing, and averages are read in O(1) instead of recomputed.
+Only the standard library is used, so the pure-Python greedy solver stays
+free of NumPy.
+"""
+
+import csv
+import json
+import math
+from array import array
+from typing import Dict, Iterable, List
+
+# Records kept per recorder in the ring buffer
+DEFAULT_CAPACITY = 4096
+
+# Relative accuracy of the quantiles of QuantileSketch
+SKETCH_ACCURACY = 0.01
+
+# Fields FIGDP and RMQFIG record per solve
+SOLVER_FIELDS = ('time', 'memory', 'size', 'k', 'lcs_length')
+
+# Quantiles reported by MetricsRecorder.summary()
+PERCENTILES = (50, 90, 99)
+
+class RunningStats:
+    """Count, mean, variance and extremes of a stream, by Welford's method."""
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x: float) -> None:
+        """Add a value to the stream."""
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    @property
+    def variance(self) -> float:
+        """Get the sample variance, 0.0 for fewer than two values."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+class QuantileSketch:
+    """
+    Quantiles of a stream of non-negative values from logarithmic buckets.
+
+    A positive value x falls into bucket ceil(log(x) / log(gamma)) with
+    gamma = (1 + a) / (1 - a) and is estimated as the bucket midpoint, which
+    is within relative accuracy a of every value in the bucket. Values of at
+    most 0 are counted as 0. Memory grows with the log of the value range,
+    not with the number of values.
+    """
+    def __init__(self, accuracy: float = SKETCH_ACCURACY):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            accuracy: Relative accuracy a of the quantiles, in (0, 1)
+        """
+        if not 0 < accuracy < 1:
+            raise ValueError(f"Sketch accuracy must be in (0, 1), got {accuracy}")
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, x: float) -> None:
+        """Add a value to the sketch."""
+        self.count += 1
+        if x <= 0:
+            self.zeros += 1
+            return
+        key = math.ceil(math.log(x) / self._log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def quantile(self, q: float) -> float:
+        """Get the estimated q-quantile, q in [0, 1], or nan if empty."""
+        if not self.count:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+class MetricsRecorder:
+    """Ring buffer of recent records plus all-time per-field statistics."""
+    def __init__(self, fields: Iterable[str], capacity: int = DEFAULT_CAPACITY):
+        """
+        Initialize an empty recorder.
+
+        Args:
+            fields: Names of the numeric fields of every record
+            capacity: Number of recent records kept
+        """
+        if capacity < 1:
+            raise ValueError(f"Recorder capacity must be positive, got {capacity}")
+        self.fields = tuple(fields)
+        self.capacity = capacity
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop all records and statistics."""
+        # Record k occupies the doubles [k*w, (k+1)*w) of slot k % capacity;
+        # the buffer grows by doubling up to capacity, so short-lived
+        # solvers do not allocate it in full
+        self._buffer = array('d')
+        self.count = 0
+        self._stats = {field: RunningStats() for field in self.fields}
+        self._sketches = {field: QuantileSketch() for field in self.fields}
+
+    def __len__(self) -> int:
+        """Get the number of records kept, at most capacity."""
+        return min(self.count, self.capacity)
+
+    def record(self, **values: float) -> None:
+        """Add a record; every field must be given."""
+        row = [float(values[field]) for field in self.fields]
+        width = len(self.fields)
+        start = (self.count % self.capacity) * width
+        if start >= len(self._buffer):
+            slots = min(self.capacity, max(16, 2 * len(self._buffer) // max(1, width)))
+            self._buffer.extend([0.0] * (slots * width - len(self._buffer)))
+        self._buffer[start:start + width] = array('d', row)
+        self.count += 1
+        for field, x in zip(self.fields, row):
+            self._stats[field].add(x)
+            self._sketches[field].add(x)
+
+    def _ordered(self) -> List[List[float]]:
+        """Get the records kept, oldest first."""
+        width = len(self.fields)
+        first = self.count - len(self)
+        return [self._buffer[(k % self.capacity) * width:(k % self.capacity + 1) * width].tolist()
+                for k in range(first, self.count)]
+
+    def __getitem__(self, field: str) -> List[float]:
+        """Get the kept values of a field, oldest first."""
+        width, column = len(self.fields), self.fields.index(field)
+        first = self.count - len(self)
+        return [self._buffer[(k % self.capacity) * width + column] for k in range(first, self.count)]
+
+    def mean(self, field: str) -> float:
+        """Get the all-time mean of a field, or nan if nothing was recorded."""
+        stats = self._stats[field]
+        return stats.mean if stats.count else math.nan
+
+    def summary(self) -> Dict[str, dict]:
+        """
+        Get the all-time statistics of every field.
+
+        Returns:
+            Dict mapping each field to its count, mean, std, min, max and
+            the PERCENTILES as 'p50' etc., nan where nothing was recorded
+        """
+        summary = {}
+        for field in self.fields:
+            stats, sketch = self._stats[field], self._sketches[field]
+            empty = not stats.count
+            summary[field] = {
+                'count': stats.count,
+                'mean': math.nan if empty else stats.mean,
+                'std': math.nan if empty else math.sqrt(stats.variance),
+                'min': math.nan if empty else stats.min,
+                'max': math.nan if empty else stats.max,
+            }
+            for p in PERCENTILES:
+                summary[field][f'p{p}'] = sketch.quantile(p / 100)
+        return summary
+
+    def to_json(self, filename: str) -> None:
+        """Write the summary and the kept records, per field, to a JSON file."""
+        # nan is not valid JSON
+        summary = {field: {name: None if isinstance(x, float) and math.isnan(x) else x
+                           for name, x in stats.items()}
+                   for field, stats in self.summary().items()}
+        data = {
+            'count': self.count,
+            'summary': summary,
+            'records': {field: self[field] for field in self.fields},
+        }
+        with open(filename, 'w') as f:
+            json.dump(data, f, indent=4)
+
+    def to_csv(self, filename: str) -> None:
+        """Write the kept records to a CSV file, one row per record."""
+        with open(filename, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.fields)
+            writer.writerows(self._ordered())
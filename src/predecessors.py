@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+
+import numpy as np
+from typing import Callable, Iterator, List, Optional, Tuple
+
+class PredecessorTable:
+    """
+    Packed backpointers for the FIG-DP and RMQ-FIG tables.
+
+    A predecessor of (i,j) always lies in the gap window, so it is stored as
+    the offset pair (di, dj), both in 1..K+1, packed into one code
+    di*(K+2) + dj. Code 0 means the cell has no predecessor. The codes fit
+    in uint16 for K <= 254 (uint32 beyond), instead of a dict entry per
+    matching cell.
+    """
+    def __init__(self, n: int, m: int, K: int):
+        """Initialize an empty predecessor table for an (n+1)x(m+1) DP table."""
+        self.span = K + 2
+        dtype = np.uint16 if self.span * self.span <= 1 << 16 else np.uint32
+        self.codes = np.zeros((n+1, m+1), dtype=dtype)
+
+    def set(self, i: int, j: int, pi: int, pj: int) -> None:
+        """Record (pi,pj) as the predecessor of (i,j)."""
+        self.codes[i, j] = (i - pi) * self.span + (j - pj)
+
+    def get(self, i: int, j: int) -> Optional[Tuple[int, int]]:
+        """Get the predecessor of (i,j), or None if it has none."""
+        code = int(self.codes[i, j])
+        if not code:
+            return None
+        di, dj = divmod(code, self.span)
+        return i - di, j - dj
+
+    def backtrack(self, X: str, dp: np.ndarray) -> List[str]:
+        """
+        Recover the subsequence ending at the bottom-right cell of dp.
+
+        Args:
+            X: First sequence
+            dp: The filled DP table
+
+        Returns:
+            The subsequence as a list of characters
+        """
+        lcs = []
+        i, j = dp.shape[0] - 1, dp.shape[1] - 1
+        while i > 0 and j > 0:
+            pos = self.get(i, j)
+            if pos is not None:
+                lcs.append(X[i-1])
+                i, j = pos
+            elif dp[i][j] == dp[i-1][j]:
+                i -= 1
+            else:
+                j -= 1
+        return lcs[::-1]
+
+def _walk(X: str, Y: str, K: int, rows: List[np.ndarray], base: int, lo: int,
+          i: int, j: int, lcs: List[str]) -> Tuple[int, int]:
+    """
+    Follow the traceback from (i,j) while i > lo, reading row r of the DP
+    table at rows[r - base] and appending emitted characters to lcs.
+    
+    Predecessors are recomputed from the window: a match cell has one iff
+    its value is at least 2, and it is the row-major first cell holding the
+    window maximum, exactly as the solvers record it.
+    """
+    while i > lo and j > 0:
+        row = rows[i - base]
+        if X[i-1] == Y[j-1] and row[j] >= 2:
+            lcs.append(X[i-1])
+            i1, j1 = max(0, i-K-1), max(0, j-K-1)
+            window = np.array([rows[r - base][j1:j] for r in range(i1, i)])
+            di, dj = divmod(int(np.argmax(window)), j - j1)
+            i, j = i1 + di, j1 + dj
+        elif row[j] == rows[i - 1 - base][j]:
+            i -= 1
+        else:
+            j -= 1
+    return i, j
+
+def window_backtrack(X: str, Y: str, K: int, dp: np.ndarray) -> List[str]:
+    """
+    Recover the same subsequence as PredecessorTable.backtrack from the
+    filled DP table alone, for engines that do not record backpointers.
+    Each emitted character costs one O(K^2) window scan.
+    """
+    lcs = []
+    _walk(X, Y, K, dp, 0, 0, dp.shape[0] - 1, dp.shape[1] - 1, lcs)
+    return lcs[::-1]
+
+def monotone_backtrack(X: str, Y: str, K: int, value: Callable[[int, int], int]) -> List[str]:
+    """
+    Recover the same subsequence as PredecessorTable.backtrack from a table
+    that can only be read cell by cell, value(i,j) giving the cell (i,j).
+    
+    The table is non-decreasing along rows and columns, so the predecessor
+    of a match holding v >= 2, the row-major first window cell holding v-1,
+    lies in the first window row whose cell in column j-1 holds v-1, at the
+    first column of that row holding v-1. Both are found by binary search,
+    O(log K) cell reads per emitted character.
+    """
+    lcs = []
+    i, j = len(X), len(Y)
+    while i > 0 and j > 0:
+        v = value(i, j)
+        if X[i-1] == Y[j-1] and v >= 2:
+            lcs.append(X[i-1])
+            lo, hi = max(0, i-K-1), i - 1
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if value(mid, j-1) >= v - 1:
+                    hi = mid
+                else:
+                    lo = mid + 1
+            i = lo
+            lo, hi = max(0, j-K-1), j - 1
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if value(i, mid) >= v - 1:
+                    hi = mid
+                else:
+                    lo = mid + 1
+            j = lo
+        elif v == value(i-1, j):
+            i -= 1
+        else:
+            j -= 1
+    return lcs[::-1]
+
+def bounded_backtrack(X: str, Y: str, K: int,
+                      band_rows: Callable[[List[np.ndarray], int, int, str], Iterator[np.ndarray]],
+                      leaf_rows: int = 64) -> Tuple[int, List[str]]:
+    """
+    Recover the same subsequence as PredecessorTable.backtrack without
+    keeping the DP table or the backpointers.
+    
+    The traceback only ever reads the gap window, i.e. the K+1 rows above
+    the current cell. Rows are therefore split at the middle: the bottom
+    half is traced first from the band of K+1 rows ending at the middle row,
+    then the top half is traced from the band it was started with. Each
+    half is recomputed from its band, so time is O(nm log n) row fills while
+    only one band per recursion level is held, O(Km log n) memory. The path
+    only moves left, so each half only computes columns up to the column the
+    path enters it at. Predecessors are recomputed from the window as in
+    window_backtrack.
+    
+    Args:
+        X: First sequence
+        Y: Second sequence
+        K: Gap constraint
+        band_rows: band_rows(band, lo, hi, Y[:c]) yields DP rows lo+1..hi
+            over columns 0..c, given band, the rows max(0, lo-K)..lo
+        leaf_rows: Segments of at most this many rows are traced directly
+        
+    Returns:
+        Tuple of (length of LCS-FIG, the actual subsequence)
+    """
+    n, m = len(X), len(Y)
+    leaf_rows = max(leaf_rows, K + 1)
+    lcs = []
+    length = 0
+    
+    def trace(band: List[np.ndarray], lo: int, hi: int, i: int, j: int) -> Tuple[int, int]:
+        nonlocal length
+        band = [row[:j+1] for row in band]
+        if hi - lo > leaf_rows:
+            mid = (lo + hi) // 2
+            if i > mid:
+                mid_band = band
+                for row in band_rows(band, lo, mid, Y[:j]):
+                    mid_band = (mid_band + [row])[-(K+1):]
+                i, j = trace(mid_band, mid, hi, i, j)
+            if i > lo and j > 0:
+                i, j = trace(band, lo, mid, i, j)
+            return i, j
+        
+        base = lo - len(band) + 1
+        rows = band + list(band_rows(band, lo, hi, Y[:j]))
+        if (i, j) == (n, m):
+            length = rows[i - base][j]
+        return _walk(X, Y, K, rows, base, lo, i, j, lcs)
+    
+    if n > 0 and m > 0:
+        trace([np.zeros(m+1, dtype=int)], 0, n, n, m)
+    return int(length), lcs[::-1]
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Performance regression check of the solvers against a stored baseline.
+
+Every case of REGRESSION_CASES solves one seeded workload pair (see
+workload). Like timeit, solves run with the garbage collector off in loops
+of as many as fill min_time seconds, and the time of a case is the fastest
+per-solve time of `repeat` loops. Machine speed drifts over seconds, so the
+loops alternate with loops of a fixed calibration workload of the kind of
+work the case's engine does (CALIBRATION_LOOPS: interpreted Python, big
+integer bit operations or NumPy array passes), timed the same way. Cases
+are compared after scaling the baseline by the ratio of their calibration
+times, so a slow phase or a slower machine affects both alike and a
+baseline recorded on one machine roughly carries over to another. Run as
+a script it exits with status 1 when a case got more than its tolerance
+slower:
+
+    python src/regression.py                # check against the baseline
+    python src/regression.py --update       # record a new baseline
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from batch import make_solver, solve_one
+from workload import PROTEIN, workload_pair
+
+# name: (algorithm, engine, workload, size, K, workload options, tolerance);
+# a tolerance of None is the default one, the noisiest cases allow more
+REGRESSION_CASES = {
+    'figdp-python-uniform': ('figdp', 'python', 'uniform', 150, 3, {}, None),
+    'figdp-numpy-uniform': ('figdp', 'numpy', 'uniform', 800, 5, {}, None),
+    'figdp-bitparallel-mutated': ('figdp', 'bitparallel', 'mutated', 4000, 5, {}, None),
+    'figdp-sparse-protein': ('figdp', 'sparse', 'uniform', 2000, 5, {'alphabet': PROTEIN}, 0.6),
+    'rmqfig-python-uniform': ('rmqfig', 'python', 'uniform', 150, 3, {}, None),
+    'rmqfig-bitparallel-repetitive': ('rmqfig', 'bitparallel', 'repetitive', 4000, 10, {}, None),
+    'greedy-skewed': ('greedy', None, 'skewed', 200000, 5, {}, 0.5),
+}
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                'regression_baseline.json')
+
+# Allowed slowdown over the scaled baseline
+DEFAULT_TOLERANCE = 0.4
+
+# Seconds each timed loop of a case lasts at least
+MIN_TIME = 0.2
+
+def _python_loop() -> None:
+    total = 0
+    for i in range(300000):
+        total += i & 7
+
+def _bigint_loop() -> None:
+    # The row update of bitparallel_fig on 4000-bit rows
+    full = (1 << 4000) - 1
+    mask = full // 3
+    V = full
+    for _ in range(2000):
+        U = V & mask
+        V = ((V + U) | (V - U)) & full
+
+_numpy_row = np.random.default_rng(0).integers(0, 100, 4000)
+
+def _numpy_loop() -> None:
+    # Row passes as in the numpy engine of FIG-DP
+    row = _numpy_row
+    for _ in range(200):
+        np.maximum.accumulate(np.maximum(row[1:], row[:-1]))
+
+# Calibration workloads by kind
+CALIBRATION_LOOPS: Dict[str, Callable[[], None]] = {
+    'python': _python_loop,
+    'bigint': _bigint_loop,
+    'numpy': _numpy_loop,
+}
+
+# Calibration kind by engine, 'python' for the others
+ENGINE_KINDS = {'bitparallel': 'bigint', 'numpy': 'numpy'}
+
+def _number(fn: Callable[[], None], min_time: float) -> int:
+    """Call fn once untimed and get the calls per loop lasting min_time."""
+    start = time.perf_counter()
+    fn()
+    once = time.perf_counter() - start
+    return max(1, int(min_time / once) + 1 if once > 0 else 1)
+
+def _loop(fn: Callable[[], None], number: int) -> float:
+    """Time number calls of fn with the garbage collector off; get the time per call."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        return (time.perf_counter() - start) / number
+    finally:
+        if enabled:
+            gc.enable()
+
+def calibrate(kind: str = 'python', repeat: int = 5, min_time: float = 0.1) -> float:
+    """Get the fastest time of repeat loops of a calibration workload."""
+    fn = CALIBRATION_LOOPS[kind]
+    number = _number(fn, min_time)
+    return min(_loop(fn, number) for _ in range(repeat))
+
+def time_case(case: Tuple, repeat: int = 9, seed: int = 0,
+              min_time: float = MIN_TIME) -> Tuple[float, float]:
+    """
+    Time the solves of a case, interleaved with its calibration workload.
+
+    Args:
+        case: Case as in REGRESSION_CASES
+        repeat: Timed loops of each
+        seed: Seed of the workload pair
+        min_time: Seconds each loop of solves lasts at least
+
+    Returns:
+        Tuple of the fastest seconds per solve and per calibration loop
+    """
+    algorithm, engine, name, size, K, options, _ = case
+    X, Y = workload_pair(name, size, seed=seed, **options)
+    solver = make_solver(algorithm, engine)
+    solve = lambda: solve_one(solver, X, Y, K)
+    calibration = CALIBRATION_LOOPS[ENGINE_KINDS.get(engine, 'python')]
+    solves, loops = _number(solve, min_time), _number(calibration, min_time / 2)
+    best_solve = best_calibration = float('inf')
+    for _ in range(repeat):
+        best_calibration = min(best_calibration, _loop(calibration, loops))
+        best_solve = min(best_solve, _loop(solve, solves))
+    return best_solve, best_calibration
+
+def measure(cases: Optional[Dict[str, Tuple]] = None, repeat: int = 9,
+            min_time: float = MIN_TIME) -> dict:
+    """
+    Time the cases.
+
+    Args:
+        cases: Cases by name (default REGRESSION_CASES)
+        repeat: Timed loops per case
+        min_time: Seconds each loop lasts at least
+
+    Returns:
+        Dict with the 'cases' times in seconds per solve and the
+        'calibration' times measured alongside them, both by case name
+    """
+    cases = REGRESSION_CASES if cases is None else cases
+    times = {name: time_case(case, repeat, min_time=min_time) for name, case in cases.items()}
+    return {
+        'calibration': {name: calibration for name, (_, calibration) in times.items()},
+        'cases': {name: seconds for name, (seconds, _) in times.items()},
+    }
+
+def _scale(current: dict, baseline: dict, name: str) -> float:
+    """Get the calibration ratio of a case; a single calibration time applies to every case."""
+    now, then = current['calibration'], baseline['calibration']
+    if isinstance(now, dict):
+        now = now[name]
+    if isinstance(then, dict):
+        then = then[name]
+    return now / then
+
+def compare(current: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE,
+            cases: Optional[Dict[str, Tuple]] = None) -> List[Tuple[str, float, float]]:
+    """
+    Find the cases that got slower than the baseline allows.
+
+    Args:
+        current: Result of measure()
+        baseline: Stored result of measure()
+        tolerance: Allowed relative slowdown over the baseline time scaled
+            by the ratio of the calibrations, for cases without their own
+        cases: Cases giving the tolerance of each name (default
+            REGRESSION_CASES)
+
+    Returns:
+        (name, scaled baseline time, current time) of every regressed case
+        in both results
+    """
+    cases = REGRESSION_CASES if cases is None else cases
+    regressions = []
+    for name, seconds in current['cases'].items():
+        if name not in baseline['cases']:
+            continue
+        case = cases.get(name)
+        allowed = case[6] if case and case[6] is not None else tolerance
+        expected = baseline['cases'][name] * _scale(current, baseline, name)
+        if seconds > expected * (1 + allowed):
+            regressions.append((name, expected, seconds))
+    return regressions
+
+def main() -> int:
+    """Check against or update the baseline; return the exit status."""
+    parser = argparse.ArgumentParser(description="LCS-FIG performance regression check")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument('--update', action='store_true', help="record a new baseline")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed relative slowdown of cases without their own "
+                             "(default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=9, help="timed loops per case")
+    parser.add_argument('--min-time', type=float, default=MIN_TIME,
+                        help="seconds per timed loop (default: %(default)s)")
+    args = parser.parse_args()
+
+    current = measure(repeat=args.repeat, min_time=args.min_time)
+    if args.update:
+        with open(args.baseline, 'w') as f:
+            json.dump(current, f, indent=4)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    for name, seconds in current['cases'].items():
+        if name in baseline['cases']:
+            scale = _scale(current, baseline, name)
+            print(f"{name:32s} {seconds:10.4f}s  baseline {baseline['cases'][name] * scale:10.4f}s")
+    regressions = compare(current, baseline, args.tolerance)
+    for name, expected, seconds in regressions:
+        print(f"REGRESSION {name}: {seconds:.4f}s vs {expected:.4f}s "
+              f"(+{(seconds / expected - 1) * 100:.0f}%)")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,46 +1,509 @@
 #!/usr/bin/env python3
 
 import time
-import psutil
+from abc import ABC, abstractmethod
+from collections import deque
 import numpy as np
-from typing import List, Tuple
-import json
-import os
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from predecessors import PredecessorTable, bounded_backtrack, window_backtrack
+import fig_kernel
+import sparse_fig
+import bitparallel_fig
+from instrument import Instrumentation, measure, phase
+from metrics import MetricsRecorder, SOLVER_FIELDS
+from encoding import table_dtype
 
-class RMQStructure:
+class DenseRMQ:
+    """Dense table answering each query by scanning the rectangle, O(K^2)."""
+    def __init__(self, n: int, m: int, K: int, first_row: int = 0):
+        self.table = np.zeros((n+1, m+1), dtype=int)
+
+    def update(self, i: int, j: int, value: int) -> None:
+        self.table[i][j] = value
+
+    def query(self, i1: int, i2: int, j1: int, j2: int) -> Tuple[int, int, int]:
+        window = self.table[i1:i2+1, j1:j2+1]
+        di, dj = divmod(int(np.argmax(window)), j2 - j1 + 1)
+        return int(window[di, dj]), i1 + di, j1 + dj
+
+class _PackedKeys:
+    """
+    Pack (value, i, j) into one integer key whose maximum is the row-major
+    first cell holding the maximum value, so max() alone tracks the argmax.
+    """
     def __init__(self, n: int, m: int):
-        """Initialize RMQ structure for a 2D table."""
+        self.cols = m + 1
+        self.size = (n + 1) * (m + 1)
+
+    def pack(self, i: int, j: int, value: int) -> int:
+        return int(value) * self.size + self.size - 1 - (i * self.cols + j)
+
+    def unpack(self, key: int) -> Tuple[int, int, int]:
+        value, rest = divmod(int(key), self.size)
+        i, j = divmod(self.size - 1 - rest, self.cols)
+        return value, i, j
+
+class _RowBufferedRMQ(ABC):
+    """Base for backends that index whole rows once they are finished."""
+    def __init__(self, n: int, m: int, K: int, first_row: int = 0):
         self.n = n
         self.m = m
-        self.table = np.zeros((n+1, m+1), dtype=int)
+        self.width = K + 1
+        self._row = [0] * (m + 1)
+        self._row_index = first_row
+
+    @abstractmethod
+    def _push_row(self) -> None:
+        """Index the finished row self._row as row self._row_index."""
+
+    def _advance(self, i: int) -> None:
+        """Finish all rows before row i."""
+        while self._row_index < i:
+            self._push_row()
+            self._row = [0] * (self.m + 1)
+            self._row_index += 1
+
+    def update(self, i: int, j: int, value: int) -> None:
+        self._advance(i)
+        self._row[j] = value
+
+class SlidingWindowRMQ(_RowBufferedRMQ):
+    """
+    Two-level monotone deques answering gap-window queries in amortized O(1).
+
+    Each finished row is reduced to its width-(K+1) column window maxima, and
+    a deque per column keeps the maxima of those reduced values over the last
+    K+1 rows. Ties keep the earlier entry, so the front of a column deque is
+    the row-major first maximum. Only the gap window ending at (i2, j2) can
+    be queried, in row-major order.
+    """
+    def __init__(self, n: int, m: int, K: int, first_row: int = 0):
+        super().__init__(n, m, K, first_row)
+        self._columns = [deque() for _ in range(m + 1)]
+
+    def _push_row(self) -> None:
+        row = self._row
+        r = self._row_index
+        width = self.width
+        window = deque()
+        for j2 in range(self.m + 1):
+            value = row[j2]
+            while window and row[window[-1]] < value:
+                window.pop()
+            window.append(j2)
+            if window[0] <= j2 - width:
+                window.popleft()
+            best = row[window[0]]
+            column = self._columns[j2]
+            while column and column[-1][0] < best:
+                column.pop()
+            column.append((best, r, window[0]))
+            if column[0][1] <= r - width:
+                column.popleft()
+
+    def query(self, i1: int, i2: int, j1: int, j2: int) -> Tuple[int, int, int]:
+        self._advance(i2 + 1)
+        return self._columns[j2][0]
+
+class SparseTableRMQ(_RowBufferedRMQ):
+    """
+    2D sparse table answering any query of at most (K+1)x(K+1) cells in O(1).
+
+    Level (a, b) holds the maxima of 2^a x 2^b blocks and is built with
+    NumPy as each row is finished, O(m log^2 K) per row. Only the last K+1
+    block rows of each of the log^2 K levels are kept, which is all a gap
+    window can reach, so memory is O(Km log^2 K). Cells are stored as
+    packed keys so the maxima carry their argmax.
+    """
+    def __init__(self, n: int, m: int, K: int, first_row: int = 0):
+        super().__init__(n, m, K, first_row)
+        self._log = [0, 0]
+        for size in range(2, self.width + 1):
+            self._log.append(self._log[size // 2] + 1)
+        levels = self._log[self.width] + 1
+        self.keys = _PackedKeys(n, m)
+        self.levels = np.zeros((levels, levels, self.width, m+1), dtype=np.int64)
+        self._offsets = np.arange(m + 1, dtype=np.int64)
+
+    def _push_row(self) -> None:
+        r = self._row_index
+        width = self.width
+        levels = self.levels
+        row = levels[0, 0, r % width]
+        row[:] = self._row
+        row *= self.keys.size
+        row += self.keys.size - 1 - r * self.keys.cols - self._offsets
+        for b in range(1, len(levels)):
+            half = 1 << (b - 1)
+            prev = levels[0, b-1, r % width]
+            np.maximum(prev[:-half], prev[half:], out=levels[0, b, r % width, :-half])
+        for a in range(1, len(levels)):
+            s = r - (1 << a) + 1
+            if s < 0:
+                break
+            mid = s + (1 << (a - 1))
+            np.maximum(levels[a-1, :, s % width], levels[a-1, :, mid % width],
+                       out=levels[a, :, s % width])
+
+    def query(self, i1: int, i2: int, j1: int, j2: int) -> Tuple[int, int, int]:
+        self._advance(i2 + 1)
+        width = self.width
+        a = self._log[i2 - i1 + 1]
+        b = self._log[j2 - j1 + 1]
+        level = self.levels[a, b]
+        top = level[i1 % width]
+        bottom = level[(i2 - (1 << a) + 1) % width]
+        right = j2 - (1 << b) + 1
+        return self.keys.unpack(max(top[j1], top[right], bottom[j1], bottom[right]))
+
+class SegmentTreeRMQ:
+    """
+    2D segment tree with point updates, O(log K log m) per update and query.
+
+    Rows live in a ring of K+2 slots (the gap window plus the row being
+    filled), so a query spanning the wrap-around is split in two. Cells are
+    stored as packed keys so the maxima carry their argmax.
+    """
+    def __init__(self, n: int, m: int, K: int, first_row: int = 0):
+        self.slots = K + 2
+        self.cols = m + 1
+        self.keys = _PackedKeys(n, m)
+        self.tree = [[0] * (2 * self.cols) for _ in range(2 * self.slots)]
+        self._row_index = first_row
+        for j in range(self.cols):
+            self.update(first_row, j, 0)
+
+    def update(self, i: int, j: int, value: int) -> None:
+        if i != self._row_index:
+            # Column 0 is never written by RMQ-FIG; reset the reused slot
+            self._row_index = i
+            self.update(i, 0, 0)
+        tree = self.tree
+        cols = self.cols
+        r = i % self.slots + self.slots
+        c = j + cols
+        row = tree[r]
+        row[c] = self.keys.pack(i, j, value)
+        c >>= 1
+        while c:
+            row[c] = max(row[2*c], row[2*c+1])
+            c >>= 1
+        r >>= 1
+        while r:
+            row, lo, hi = tree[r], tree[2*r], tree[2*r+1]
+            c = j + cols
+            while c:
+                row[c] = max(lo[c], hi[c])
+                c >>= 1
+            r >>= 1
+
+    def _query_row(self, row: List[int], j1: int, j2: int) -> int:
+        best = 0
+        lo, hi = j1 + self.cols, j2 + self.cols + 1
+        while lo < hi:
+            if lo & 1:
+                best = max(best, row[lo])
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                best = max(best, row[hi])
+            lo >>= 1
+            hi >>= 1
+        return best
+
+    def _query_slots(self, s1: int, s2: int, j1: int, j2: int) -> int:
+        best = 0
+        lo, hi = s1 + self.slots, s2 + self.slots + 1
+        while lo < hi:
+            if lo & 1:
+                best = max(best, self._query_row(self.tree[lo], j1, j2))
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                best = max(best, self._query_row(self.tree[hi], j1, j2))
+            lo >>= 1
+            hi >>= 1
+        return best
+
+    def query(self, i1: int, i2: int, j1: int, j2: int) -> Tuple[int, int, int]:
+        s1, s2 = i1 % self.slots, i2 % self.slots
+        if s1 <= s2:
+            return self.keys.unpack(self._query_slots(s1, s2, j1, j2))
+        return self.keys.unpack(max(self._query_slots(s1, self.slots - 1, j1, j2),
+                                    self._query_slots(0, s2, j1, j2)))
+
+RMQ_BACKENDS = {
+    'dense': DenseRMQ,
+    'sliding': SlidingWindowRMQ,
+    'sparse': SparseTableRMQ,
+    'segment': SegmentTreeRMQ,
+}
+
+class RMQStructure:
+    """
+    Range maximum structure over the RMQ-FIG DP table.
+
+    Cells are written in row-major order with update() and every query is
+    the gap window of at most (K+1)x(K+1) cells above and left of the cell
+    being filled. A query returns the maximum together with its position,
+    the row-major first cell holding it, so RMQ-FIG gets the predecessor of
+    a match without rescanning the window. The work is delegated to one of
+    RMQ_BACKENDS:
+
+        dense    -- scan the rectangle with np.max, O(K^2) per query
+        sliding  -- monotone deques, amortized O(1) per query (default)
+        sparse   -- 2D sparse table, O(1) per query, O(m log^2 K) per row
+        segment  -- 2D segment tree, O(log K log m) per update and query
+    """
+    def __init__(self, n: int, m: int, K: int, backend: str = 'sliding', first_row: int = 0):
+        """
+        Initialize RMQ structure for a 2D table with gap constraint K.
+        
+        Rows before first_row are never written or queried, which lets a
+        solve resume from a band of rows in the middle of the table.
+        """
+        if backend not in RMQ_BACKENDS:
+            raise ValueError(f"Unknown RMQ backend '{backend}', expected one of {sorted(RMQ_BACKENDS)}")
+        self.n = n
+        self.m = m
+        self.backend = RMQ_BACKENDS[backend](n, m, K, first_row)
         
     def update(self, i: int, j: int, value: int) -> None:
-        """Update value at position (i,j)."""
-        self.table[i][j] = value
+        """Update value at position (i,j). Rows must be filled in order."""
+        self.backend.update(i, j, value)
         
-    def query(self, i1: int, i2: int, j1: int, j2: int) -> int:
-        """Query maximum value in rectangle [(i1,j1), (i2,j2)]."""
+    def query(self, i1: int, i2: int, j1: int, j2: int) -> Tuple[int, int, int]:
+        """Query maximum value in rectangle [(i1,j1), (i2,j2)] and its position (i, j)."""
         if i1 < 0 or j1 < 0:
-            return 0
-        return np.max(self.table[i1:i2+1, j1:j2+1])
+            return 0, -1, -1
+        return self.backend.query(i1, i2, j1, j2)
+
+# Engines selectable with RMQFIG(engine=...)
+ENGINES = ('python', 'numba', 'sparse', 'bitparallel', 'auto')
+
+# Engines that keep a compact form of the table instead of the DP table
+COMPACT_TABLES = {
+    'sparse': sparse_fig.MatchLevels,
+    'bitparallel': bitparallel_fig.BitRows,
+}
 
 class RMQFIG:
-    def __init__(self):
-        """Initialize RMQ-FIG algorithm."""
-        self.performance_data = {
-            'time': [],
-            'memory': [],
-            'size': [],
-            'k': [],
-            'lcs_length': []
-        }
+    def __init__(self, backend: str = 'sliding', engine: str = 'python',
+                 instrument: Optional[Instrumentation] = None):
+        """
+        Initialize RMQ-FIG algorithm.
+
+        Args:
+            backend: RMQ backend used for gap-window queries, one of RMQ_BACKENDS
+            engine: 'python' (reference loops over RMQStructure) or 'numba'
+                (the compiled sliding-window kernel shared with FIG-DP, which
+                ignores backend; falls back to 'python' when Numba is not
+                installed), 'sparse' (only visits matching cells, see
+                sparse_fig), 'bitparallel' (one bit vector per row, see
+                bitparallel_fig) or 'auto' ('sparse' for inputs with very
+                few matches, else 'bitparallel'); the last three ignore
+                backend
+            instrument: Accumulates phase timers, counters and allocation
+                peaks of solve(), score() and solve_multi_k() (see
+                instrument); None measures nothing
+        """
+        if backend not in RMQ_BACKENDS:
+            raise ValueError(f"Unknown RMQ backend '{backend}', expected one of {sorted(RMQ_BACKENDS)}")
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown RMQ-FIG engine '{engine}', expected one of {list(ENGINES)}")
+        self.backend = backend
+        self.engine = engine
+        self.instrument = instrument
+        self._compiled = fig_kernel.load_kernel() if engine == 'numba' else None
+        self.performance_data = MetricsRecorder(SOLVER_FIELDS)
         
     def get_memory_usage(self) -> float:
-        """Get current memory usage in MB."""
-        process = psutil.Process(os.getpid())
+        """Get current memory usage (RSS) in MB; psutil is only imported here."""
+        import psutil
+        process = psutil.Process()
         return process.memory_info().rss / 1024 / 1024  # Convert to MB
+    
+    def _peak_mb(self) -> float:
+        """Get the traced allocation peak of the last call in MB, or 0.0 if not traced."""
+        inst = self.instrument
+        if inst is None or not inst.trace_memory:
+            return 0.0
+        return inst.last_peak / 1024 / 1024
+    
+    def _count(self, X: str, Y: str, queried: bool) -> None:
+        """Count the cells and matches of a solve, and its window queries if queried."""
+        matches = sparse_fig.match_count(X, Y)
+        self.instrument.count(cells=len(X) * len(Y), matches=matches,
+                              queries=matches if queried else 0)
+        
+    @staticmethod
+    def _fill_row(rows: np.ndarray, i: int, x: str, Y: str, K: int,
+                  rmq: RMQStructure, prev: Optional[PredecessorTable] = None) -> None:
+        """
+        Fill row i of the DP table, whose character is x = X[i-1], and feed
+        it to the RMQ structure.
         
-    def solve(self, X: str, Y: str, K: int) -> Tuple[int, List[str]]:
+        Row r of the table lives at rows[r % len(rows)]; only rows i-1 and i
+        are read, so a ring buffer of two rows is enough.
+        """
+        size = len(rows)
+        row = rows[i % size]
+        up = rows[(i-1) % size]
+        for j in range(1, len(Y)+1):
+            if x == Y[j-1]:
+                # Query best previous value within gap constraint
+                prev_best, pi, pj = rmq.query(
+                    max(0, i-K-1), i-1,
+                    max(0, j-K-1), j-1
+                )
+                if prev_best > 0:
+                    row[j] = prev_best + 1
+                    if prev is not None:
+                        prev.set(i, j, pi, pj)
+                else:
+                    row[j] = 1
+            else:
+                row[j] = max(up[j], row[j-1])
+            rmq.update(i, j, row[j])
+    
+    def _compact(self, X: str, Y: str) -> Optional[type]:
+        """Get the compact table class solving this pair instead of the DP table, or None."""
+        if self.engine == 'auto':
+            return sparse_fig.MatchLevels if sparse_fig.is_sparse(X, Y) else bitparallel_fig.BitRows
+        return COMPACT_TABLES.get(self.engine)
+    
+    def score(self, X: str, Y: str, K: int) -> int:
+        """
+        Compute only the length of LCS-FIG without the full table.
+        
+        Only two DP rows and no backpointers are kept; with the default
+        sliding backend the RMQ structure holds K+1 rows, so memory is
+        O(Km). No performance data is recorded.
+        
+        Args:
+            X: First sequence
+            Y: Second sequence
+            K: Gap constraint
+            
+        Returns:
+            Length of LCS-FIG
+        """
+        inst = self.instrument
+        if inst is None:
+            return self._score(X, Y, K)
+        with inst.measure(), inst.phase('fill'):
+            length = self._score(X, Y, K)
+        self._count(X, Y, self._compact(X, Y) is None)
+        return length
+    
+    def _score(self, X: str, Y: str, K: int) -> int:
+        """Compute the length of LCS-FIG, see score()."""
+        table = self._compact(X, Y)
+        if table is not None:
+            return table.score(X, Y)
+        if self._compiled is not None:
+            return fig_kernel.score(self._compiled, X, Y, K)
+        n, m = len(X), len(Y)
+        rmq = RMQStructure(n, m, K, self.backend)
+        rows = np.zeros((2, m+1), dtype=table_dtype(n, m))
+        for i in range(1, n+1):
+            self._fill_row(rows, i, X[i-1], Y, K, rmq)
+        return int(rows[n % 2][m])
+    
+    def _band_rows(self, band: List[np.ndarray], lo: int, hi: int,
+                   X: str, Y: str, K: int) -> Iterator[np.ndarray]:
+        """Yield DP rows lo+1..hi computed from the rows ending at row lo."""
+        if self._compiled is not None:
+            yield from fig_kernel.band_rows(self._compiled, band, lo, hi, X, Y, K)
+            return
+        first = lo - len(band) + 1
+        rmq = RMQStructure(len(X), len(Y), K, self.backend, first_row=first)
+        for r, row in enumerate(band, first):
+            for j in range(1, len(Y)+1):
+                rmq.update(r, j, row[j])
+        rows = np.zeros((2, len(Y)+1), dtype=table_dtype(len(X), len(Y)))
+        rows[lo % 2] = band[-1]
+        for i in range(lo+1, hi+1):
+            self._fill_row(rows, i, X[i-1], Y, K, rmq)
+            yield rows[i % 2].copy()
+    
+    def solve_bounded(self, X: str, Y: str, K: int) -> Tuple[int, List[str]]:
+        """
+        Solve LCS-FIG in O(Km log n) memory by divide-and-conquer traceback.
+        
+        Returns the same result as solve() at about log n times the work,
+        for inputs whose full table does not fit in memory. Memory is only
+        bounded with the sliding backend. The compact engines solve
+        directly: 'sparse' needs O(r) memory for r matches and
+        'bitparallel' nm bits. No performance data is recorded.
+        
+        Args:
+            X: First sequence
+            Y: Second sequence
+            K: Gap constraint
+            
+        Returns:
+            Tuple of (length of LCS-FIG, the actual subsequence)
+        """
+        table = self._compact(X, Y)
+        if table is not None:
+            table = table(X, Y)
+            return len(table), table.backtrack(X, Y, K)
+        return bounded_backtrack(
+            X, Y, K, lambda band, lo, hi, Yp: self._band_rows(band, lo, hi, X, Yp, K))
+    
+    def _table(self, X: str, Y: str, K: int,
+               prev: Optional[PredecessorTable] = None) -> np.ndarray:
+        """Fill the full DP table, recording backpointers into prev if given."""
+        if self._compiled is not None:
+            return fig_kernel.solve_table(self._compiled, X, Y, K,
+                                          None if prev is None else prev.codes)
+        n, m = len(X), len(Y)
+        rmq = RMQStructure(n, m, K, self.backend)
+        dp = np.zeros((n+1, m+1), dtype=table_dtype(n, m))
+        for i in range(1, n+1):
+            self._fill_row(dp, i, X[i-1], Y, K, rmq, prev)
+        return dp
+    
+    def solve_multi_k(self, X: str, Y: str, ks: Iterable[int]) -> Dict[int, Tuple[int, List[str]]]:
+        """
+        Solve LCS-FIG for several gap constraints with one table fill.
+        
+        As in FIGDP.solve_multi_k, the table does not depend on K, so it is
+        filled once with the smallest K (the smallest RMQ windows) and only
+        the traceback is repeated per K. Performance data is not recorded.
+        
+        Args:
+            X: First sequence
+            Y: Second sequence
+            ks: Gap constraints
+            
+        Returns:
+            Dict mapping each K to the result solve(X, Y, K) gives
+        """
+        ks = sorted(set(ks))
+        if not ks:
+            return {}
+        inst = self.instrument
+        with measure(inst):
+            with phase(inst, 'fill'):
+                table = self._compact(X, Y)
+                if table is not None:
+                    table = table(X, Y)
+                    length = len(table)
+                else:
+                    dp = self._table(X, Y, ks[0])
+                    length = int(dp[len(X)][len(Y)])
+            with phase(inst, 'traceback'):
+                if table is not None:
+                    results = {K: (length, table.backtrack(X, Y, K)) for K in ks}
+                else:
+                    results = {K: (length, window_backtrack(X, Y, K, dp)) for K in ks}
+        if inst is not None:
+            self._count(X, Y, table is None)
+        return results
+    
+    def solve(self, X: str, Y: str, K: int, record: bool = True) -> Tuple[int, List[str]]:
         """
         Solve LCS-FIG using RMQ approach.
         
@@ -48,79 +511,57 @@ class RMQFIG:
             X: First sequence
             Y: Second sequence
             K: Gap constraint
+            record: Whether to time the table fill into performance_data;
+                its 'memory' entry is the traced allocation peak in MB
+                with a memory-tracing instrument, else 0.0
             
         Returns:
             Tuple of (length of LCS-FIG, the actual subsequence)
         """
-        start_time = time.time()
-        initial_memory = self.get_memory_usage()
+        inst = self.instrument
+        if record:
+            start_time = time.perf_counter()
         
         n, m = len(X), len(Y)
-        rmq = RMQStructure(n, m)
-        dp = np.zeros((n+1, m+1), dtype=int)
-        prev = {}  # Store previous positions for backtracking
         
-        # Main algorithm
-        for i in range(1, n+1):
-            for j in range(1, m+1):
-                if X[i-1] == Y[j-1]:
-                    # Query best previous value within gap constraint
-                    prev_best = rmq.query(
-                        max(0, i-K-1), i-1,
-                        max(0, j-K-1), j-1
-                    )
-                    if prev_best > 0:
-                        dp[i][j] = prev_best + 1
-                        # Store previous position for backtracking
-                        for pi in range(max(0, i-K-1), i):
-                            for pj in range(max(0, j-K-1), j):
-                                if dp[pi][pj] == prev_best:
-                                    prev[(i,j)] = (pi, pj)
-                                    break
-                            if (i,j) in prev:
-                                break
-                    else:
-                        dp[i][j] = 1
+        with measure(inst):
+            # Main algorithm
+            with phase(inst, 'fill'):
+                table = self._compact(X, Y)
+                if table is not None:
+                    table = table(X, Y)
+                    max_length = len(table)
                 else:
-                    dp[i][j] = max(dp[i-1][j], dp[i][j-1])
-                rmq.update(i, j, dp[i][j])
+                    prev = PredecessorTable(n, m, K)
+                    dp = self._table(X, Y, K, prev)
+                    max_length = int(dp[n][m])
+            if record:
+                end_time = time.perf_counter()
+            
+            # Backtrack to get the subsequence
+            with phase(inst, 'traceback'):
+                lcs = table.backtrack(X, Y, K) if table is not None else prev.backtrack(X, dp)
+        
+        if inst is not None:
+            self._count(X, Y, table is None)
         
         # Record performance data
-        end_time = time.time()
-        final_memory = self.get_memory_usage()
-        
-        self.performance_data['time'].append(end_time - start_time)
-        self.performance_data['memory'].append(final_memory - initial_memory)
-        self.performance_data['size'].append(max(n, m))
-        self.performance_data['k'].append(K)
-        self.performance_data['lcs_length'].append(int(dp[n][m]))
-        
-        # Backtrack to get the subsequence
-        lcs = []
-        i, j = n, m
-        max_length = dp[n][m]
-        while i > 0 and j > 0:
-            if (i,j) in prev:
-                lcs.append(X[i-1])
-                i, j = prev[(i,j)]
-            elif dp[i][j] == dp[i-1][j]:
-                i -= 1
-            else:
-                j -= 1
-                
-        return max_length, lcs[::-1]
+        if record:
+            self.performance_data.record(time=end_time - start_time, memory=self._peak_mb(),
+                                         size=max(n, m), k=K, lcs_length=max_length)
+        
+        return max_length, lcs
     
     def save_performance_data(self, filename: str) -> None:
-        """Save performance data to a JSON file."""
-        with open(filename, 'w') as f:
-            json.dump(self.performance_data, f, indent=4)
+        """Save the performance summary and recent records to a JSON file."""
+        self.performance_data.to_json(filename)
     
     def get_average_performance(self) -> dict:
-        """Get average performance metrics."""
+        """Get average performance metrics over all recorded solves."""
         return {
-            'avg_time': np.mean(self.performance_data['time']),
-            'avg_memory': np.mean(self.performance_data['memory']),
-            'avg_length': np.mean(self.performance_data['lcs_length'])
+            'avg_time': self.performance_data.mean('time'),
+            'avg_memory': self.performance_data.mean('memory'),
+            'avg_length': self.performance_data.mean('lcs_length')
         }
 
 if __name__ == "__main__":
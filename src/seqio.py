@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Streaming FASTA/FASTQ input and memory-mapped sequence storage.
+
+read_records() parses FASTA or FASTQ, plain or gzip-compressed, lazily as
+a generator of (name, sequence bytes), one record at a time. SequenceFile
+writes such records back to back into one uint8 file with an offset index
+next to it and maps it read-only, so batch.solve_batch and batch.all_pairs
+can let every worker map the same file (page cache, no copies) instead of
+materializing all sequences as Python strings.
+"""
+
+import gzip
+import hashlib
+import numpy as np
+from array import array
+from itertools import chain
+from typing import BinaryIO, Iterable, Iterator, List, Tuple
+
+def open_input(path: str) -> BinaryIO:
+    """Open a file for binary reading, decompressing it if it is gzip."""
+    with open(path, 'rb') as f:
+        magic = f.read(2)
+    if magic == b'\x1f\x8b':
+        return gzip.open(path, 'rb')
+    return open(path, 'rb')
+
+def parse_fasta(lines: Iterable[bytes]) -> Iterator[Tuple[str, bytes]]:
+    """Parse FASTA lines into (name, sequence) records; sequence lines are joined."""
+    name, chunks = None, []
+    for line in lines:
+        line = line.strip()
+        if line.startswith(b'>'):
+            if name is not None:
+                yield name, b''.join(chunks)
+            name, chunks = line[1:].decode('utf-8', 'replace'), []
+        elif line:
+            if name is None:
+                raise ValueError("FASTA sequence data before the first '>' header")
+            chunks.append(line)
+    if name is not None:
+        yield name, b''.join(chunks)
+
+def parse_fastq(lines: Iterable[bytes]) -> Iterator[Tuple[str, bytes]]:
+    """Parse four-line FASTQ records into (name, sequence); qualities are skipped."""
+    lines = iter(lines)
+    for header in lines:
+        header = header.strip()
+        if not header:
+            continue
+        if not header.startswith(b'@'):
+            raise ValueError(f"Expected a FASTQ '@' header, got {header[:40]!r}")
+        sequence = next(lines, b'').strip()
+        separator = next(lines, b'').strip()
+        next(lines, None)
+        if not separator.startswith(b'+'):
+            raise ValueError(f"Expected a FASTQ '+' line in record {header[1:].decode('utf-8', 'replace')}")
+        yield header[1:].decode('utf-8', 'replace'), sequence
+
+def read_records(path: str) -> Iterator[Tuple[str, bytes]]:
+    """
+    Read FASTA or FASTQ records lazily, detecting the format and gzip.
+
+    Args:
+        path: Path of the (optionally gzip-compressed) FASTA or FASTQ file
+
+    Yields:
+        Tuples of (record name, sequence bytes)
+    """
+    with open_input(path) as f:
+        lines = iter(f)
+        for first in lines:
+            if first.strip():
+                break
+        else:
+            return
+        parse = parse_fastq if first.lstrip().startswith(b'@') else parse_fasta
+        yield from parse(chain([first], lines))
+
+class SequenceFile:
+    """
+    Sequences stored back to back in a memory-mapped uint8 file.
+
+    The data file at path holds the sequence bytes; path + '.idx.npz' holds
+    the offsets (sequence k is data[offsets[k]:offsets[k+1]]) and the names.
+    """
+    def __init__(self, path: str):
+        """Map an existing sequence file read-only."""
+        self.path = path
+        with np.load(path + '.idx.npz') as index:
+            self.offsets = index['offsets']
+            self.names = list(index['names'])
+        # np.memmap cannot map an empty file
+        if self.offsets[-1] > 0:
+            self.data = np.memmap(path, dtype=np.uint8, mode='r')
+        else:
+            self.data = np.zeros(0, dtype=np.uint8)
+
+    @classmethod
+    def create(cls, path: str, records: Iterable[Tuple[str, bytes]]) -> 'SequenceFile':
+        """
+        Write records to a new sequence file at path and map it.
+
+        Records are streamed to disk, so only one is held in memory.
+
+        Args:
+            path: Path of the data file; the index is written next to it
+            records: (name, sequence) records, e.g. from read_records();
+                str sequences are UTF-8 encoded
+
+        Returns:
+            The mapped sequence file
+        """
+        offsets = array('q', [0])
+        names = []
+        with open(path, 'wb') as f:
+            for name, seq in records:
+                if isinstance(seq, str):
+                    seq = seq.encode('utf-8')
+                f.write(seq)
+                offsets.append(offsets[-1] + len(seq))
+                names.append(name)
+        with open(path + '.idx.npz', 'wb') as f:
+            np.savez(f, offsets=np.array(offsets, dtype=np.int64), names=np.array(names, dtype=str))
+        return cls(path)
+
+    @classmethod
+    def from_fastx(cls, source: str, path: str) -> 'SequenceFile':
+        """Convert a FASTA/FASTQ file (optionally gzip) into a sequence file at path."""
+        return cls.create(path, read_records(source))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def view(self, k: int) -> np.ndarray:
+        """Get sequence k as a uint8 view of the mapped file, without copying."""
+        return self.data[self.offsets[k]:self.offsets[k+1]]
+
+    def __getitem__(self, k: int) -> str:
+        """Get sequence k as a string."""
+        return bytes(self.view(k)).decode('utf-8')
+
+    def __iter__(self) -> Iterator[str]:
+        return (self[k] for k in range(len(self)))
+
+    def lengths(self) -> np.ndarray:
+        """Get the length in bytes of every sequence."""
+        return np.diff(self.offsets)
+
+    def unique(self) -> Tuple[np.ndarray, List[int]]:
+        """
+        Find identical sequences by a content hash of their mapped bytes.
+
+        Returns:
+            Tuple of (the distinct-sequence id of every record, the first
+            record holding each distinct sequence)
+        """
+        ids = np.empty(len(self), dtype=np.int64)
+        first = {}
+        records = []
+        for k in range(len(self)):
+            digest = hashlib.blake2b(self.view(k), digest_size=16).digest()
+            if digest not in first:
+                first[digest] = len(records)
+                records.append(k)
+            ids[k] = first[digest]
+        return ids, records
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Match-sparse LCS-FIG engine for large alphabets.
+
+The FIG-DP table is non-decreasing along rows and columns, so the gap-window
+maximum of a match (i,j) is the cell (i-1,j-1), i.e. the best match strictly
+dominated by (i,j). MatchLevels therefore only visits the r match pairs,
+enumerated in row order from per-symbol position lists of Y, and keeps the
+Hunt-Szymanski thresholds (the smallest column reaching each value so far)
+as the dynamic structure: one binary search per match, O(r log L) time.
+
+Every threshold change is kept per value, so any table cell can be read
+back in O(log L log r) and predecessors.monotone_backtrack makes the same
+choices as PredecessorTable.backtrack without the (n+1)x(m+1) table.
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import List
+from predecessors import monotone_backtrack
+
+# Matches per table cell below which engine='auto' picks the sparse engine.
+# bitparallel_fig is faster at any density measured; below this the match
+# lists are smaller than its n*m bits and time is within a factor of two
+SPARSE_DENSITY = 0.0005
+
+def match_count(X: str, Y: str) -> int:
+    """Count the pairs (i,j) with X[i] == Y[j] from the symbol counts."""
+    counts = Counter(Y)
+    return sum(k * counts[ch] for ch, k in Counter(X).items())
+
+def is_sparse(X: str, Y: str, density: float = SPARSE_DENSITY) -> bool:
+    """Check whether at most density of the table cells are matches."""
+    return match_count(X, Y) <= density * len(X) * len(Y)
+
+class MatchLevels:
+    """
+    The LCS-FIG table of two sequences, stored as threshold changes.
+
+    After row p, the smallest column holding a value of at least v is the
+    last entry of cols[v-1] whose row in rows[v-1] is at most p.
+    """
+    def __init__(self, X: str, Y: str):
+        """Process the matches of X and Y in row order."""
+        positions = {}
+        for j, ch in enumerate(Y, 1):
+            positions.setdefault(ch, []).append(j)
+        thresholds = []
+        self.rows = []
+        self.cols = []
+        for i, ch in enumerate(X, 1):
+            # Columns are visited right to left so matches in row i do
+            # not see each other
+            for j in reversed(positions.get(ch, ())):
+                v = bisect_left(thresholds, j)
+                if v == len(thresholds):
+                    thresholds.append(j)
+                    self.rows.append([i])
+                    self.cols.append([j])
+                elif j < thresholds[v]:
+                    thresholds[v] = j
+                    self.rows[v].append(i)
+                    self.cols[v].append(j)
+
+    def __len__(self) -> int:
+        """Get the length of LCS-FIG, the largest value in the table."""
+        return len(self.rows)
+
+    @staticmethod
+    def score(X: str, Y: str) -> int:
+        """Compute only the length of LCS-FIG, which does not depend on K."""
+        thresholds = []
+        positions = {}
+        for j, ch in enumerate(Y, 1):
+            positions.setdefault(ch, []).append(j)
+        for ch in X:
+            for j in reversed(positions.get(ch, ())):
+                v = bisect_left(thresholds, j)
+                if v == len(thresholds):
+                    thresholds.append(j)
+                else:
+                    thresholds[v] = j
+        return len(thresholds)
+
+    def value(self, i: int, j: int) -> int:
+        """Get the table cell (i,j)."""
+        lo, hi = 0, len(self.rows)
+        while lo < hi:
+            v = (lo + hi) // 2
+            k = bisect_right(self.rows[v], i) - 1
+            if k >= 0 and self.cols[v][k] <= j:
+                lo = v + 1
+            else:
+                hi = v
+        return lo
+
+    def backtrack(self, X: str, Y: str, K: int) -> List[str]:
+        """Recover the subsequence PredecessorTable.backtrack gives for K."""
+        return monotone_backtrack(X, Y, K, self.value)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+import unittest
+import random
+from fig_dp import FIGDP
+from banded import BandedTable
+
+def mutate(seq: str, edits: int, alphabet: str, rng: random.Random) -> str:
+    """Apply random substitutions, insertions and deletions to seq."""
+    seq = list(seq)
+    for _ in range(edits):
+        pos = rng.randint(0, len(seq))
+        op = rng.choice(['sub', 'ins', 'del'])
+        if op == 'ins' or not seq:
+            seq.insert(pos, rng.choice(alphabet))
+        elif op == 'del':
+            del seq[min(pos, len(seq) - 1)]
+        else:
+            seq[min(pos, len(seq) - 1)] = rng.choice(alphabet)
+    return ''.join(seq)
+
+class TestBandedTable(unittest.TestCase):
+    def setUp(self):
+        """Set up related and unrelated pairs."""
+        rng = random.Random(15)
+        self.pairs = [("", "ACG"), ("ACG", "")]
+        for _ in range(20):
+            alphabet = rng.choice(['AB', 'ACGT'])
+            X = ''.join(rng.choices(alphabet, k=rng.randint(1, 60)))
+            Y = mutate(X, rng.randint(0, 8), alphabet, rng)
+            self.pairs.append((X, Y))
+            self.pairs.append((X, ''.join(rng.choices(alphabet, k=rng.randint(1, 60)))))
+        self.fig_dp = FIGDP()
+        
+    def test_proven_cells_exact(self):
+        """Test that cells proven exact equal the full table and the rest are lower bounds."""
+        for X, Y in self.pairs:
+            dp = self.fig_dp._table(X, Y, 0)
+            for width in [0, 2, 5]:
+                table = BandedTable(X, Y, width)
+                for i in range(len(X) + 1):
+                    for j in range(len(Y) + 1):
+                        table.proven = True
+                        value = table.value(i, j)
+                        self.assertLessEqual(value, dp[i][j])
+                        if table.proven:
+                            self.assertEqual(value, dp[i][j])
+                            
+    def test_auto_band(self):
+        """Test that the adaptive band gives the result of the full table."""
+        for X, Y in self.pairs:
+            for K in [0, 3]:
+                expected = self.fig_dp.solve(X, Y, K, record=False)
+                self.assertEqual(self.fig_dp.solve(X, Y, K, band='auto'), expected)
+                self.assertEqual(self.fig_dp.score(X, Y, K, band='auto'), expected[0])
+                length, _ = self.fig_dp.solve(X, Y, K, band=1)
+                self.assertLessEqual(length, expected[0])
+                
+    def test_wide_band_exact(self):
+        """Test that a band covering the table is always exact."""
+        X, Y = self.pairs[3]
+        table = BandedTable(X, Y, len(X) + len(Y))
+        self.assertEqual((len(table), table.backtrack(X, Y, 2)), self.fig_dp.solve(X, Y, 2))
+        self.assertTrue(table.proven)
+        with self.assertRaises(ValueError):
+            BandedTable(X, Y, -1)
+
+if __name__ == '__main__':
+    unittest.main()
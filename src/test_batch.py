@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+import unittest
+import os
+import random
+import tempfile
+import numpy as np
+from batch import SequenceStore, all_pairs, solve_batch, solve_stream
+from seqio import SequenceFile
+from fig_dp import FIGDP
+from lcs_fig_greedy import GreedyLCSFIG
+
+class TestSolveBatch(unittest.TestCase):
+    def setUp(self):
+        """Set up random pairs sharing some sequences."""
+        rng = random.Random(4)
+        seqs = [''.join(rng.choices('ACGT', k=rng.randint(0, 30))) for _ in range(6)]
+        self.pairs = [(rng.choice(seqs), rng.choice(seqs)) for _ in range(25)]
+        self.K = 2
+        
+    def test_sequence_store(self):
+        """Test that repeated sequences are stored once."""
+        store = SequenceStore()
+        self.assertEqual(store.add("ACGT"), 0)
+        self.assertEqual(store.add("GG"), 1)
+        self.assertEqual(store.add("ACGT"), 0)
+        self.assertEqual(store.offsets, [0, 4, 6])
+        
+    def test_matches_direct_solves(self):
+        """Test that every algorithm and worker count gives the direct results."""
+        fig_dp = FIGDP()
+        expected = {i: fig_dp.solve(X, Y, self.K) for i, (X, Y) in enumerate(self.pairs)}
+        for workers in [1, 2]:
+            results = list(solve_batch(self.pairs, self.K, workers=workers, chunk_size=4))
+            self.assertEqual(sorted(i for i, _, _ in results), list(range(len(self.pairs))))
+            for index, length, subsequence in results:
+                self.assertEqual((length, subsequence), expected[index])
+            for index, length, subsequence in solve_batch(self.pairs, self.K, workers=workers,
+                                                          algorithm='figdp', length_only=True):
+                self.assertEqual((length, subsequence), (expected[index][0], None))
+            for index, length, _ in solve_batch(self.pairs, self.K, workers=workers, algorithm='greedy'):
+                X, Y = self.pairs[index]
+                self.assertEqual(length, GreedyLCSFIG(X, Y, self.K).solve()[0])
+                
+    def test_invalid_algorithm(self):
+        """Test that unknown algorithms are rejected."""
+        with self.assertRaises(ValueError):
+            list(solve_batch(self.pairs, self.K, algorithm='unknown'))
+        with self.assertRaises(ValueError):
+            list(solve_stream(iter(self.pairs), self.K, workers=2, algorithm='unknown'))
+            
+    def test_solve_stream(self):
+        """Test that streamed pairs give the batch results, read lazily."""
+        expected = sorted(solve_batch(self.pairs, self.K, workers=1))
+        for workers in [1, 2]:
+            read = []
+            def pairs():
+                for pair in self.pairs:
+                    read.append(pair)
+                    yield pair
+            results = solve_stream(pairs(), self.K, workers=workers, chunk_size=2)
+            first = next(results)
+            # One worker solves as it reads; a pool holds a few chunks
+            self.assertLessEqual(len(read), 1 if workers == 1 else (4 * workers + 1) * 2)
+            self.assertEqual(sorted([first] + list(results)), expected)
+
+class TestAllPairs(unittest.TestCase):
+    def test_matches_direct_scores(self):
+        """Test the score matrix with duplicate sequences and several tiles."""
+        rng = random.Random(5)
+        seqs = [''.join(rng.choices('ACGT', k=rng.randint(0, 20))) for _ in range(7)]
+        seqs += [seqs[1], seqs[4], seqs[1]]
+        K = 2
+        fig_dp = FIGDP()
+        expected = np.array([[fig_dp.score(X, Y, K) for Y in seqs] for X in seqs])
+        for workers in [1, 2]:
+            matrix = all_pairs(seqs, K, workers=workers, tile=3)
+            np.testing.assert_array_equal(matrix, expected)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'scores.npy')
+            matrix = all_pairs(seqs, K, workers=1, algorithm='figdp', out=path)
+            self.assertIsInstance(matrix, np.memmap)
+            np.testing.assert_array_equal(np.load(path), expected)
+            del matrix
+            
+    def test_sequence_file(self):
+        """Test that memory-mapped sequences give the same results as strings."""
+        rng = random.Random(6)
+        seqs = [''.join(rng.choices('ACGT', k=rng.randint(0, 20))) for _ in range(5)]
+        seqs.append(seqs[2])
+        pairs = [(0, 1), (2, 5), (4, 3)]
+        K = 1
+        expected = all_pairs(seqs, K, workers=1)
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SequenceFile.create(os.path.join(tmp, 'seqs.bin'),
+                                        ((str(k), seq) for k, seq in enumerate(seqs)))
+            for workers in [1, 2]:
+                np.testing.assert_array_equal(all_pairs(store, K, workers=workers, tile=2), expected)
+                results = sorted(solve_batch(pairs, K, workers=workers, sequences=store))
+                self.assertEqual(results, sorted(solve_batch([(seqs[x], seqs[y]) for x, y in pairs],
+                                                             K, workers=1)))
+
+if __name__ == '__main__':
+    unittest.main()
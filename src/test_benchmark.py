@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+import unittest
+import os
+import tempfile
+from benchmark import cell_key, grid, load_checkpoint, run_benchmark, run_cell, sequence_pair
+from fig_dp import FIGDP
+
+class TestBenchmark(unittest.TestCase):
+    def test_grid(self):
+        """Test the cells of a grid."""
+        cells = grid(['figdp', 'greedy'], [10, 20], [1, 2], 3)
+        self.assertEqual(len(cells), 24)
+        self.assertIn(('greedy', '', 20, 2, 1), cells)
+        self.assertIn(('figdp', 'python', 10, 1, 0), cells)
+        
+    def test_run_cell(self):
+        """Test the record of a cell against a direct solve."""
+        record = run_cell(('rmqfig', 'python', 30, 2, 1), warmup=2, repeat=4)
+        X, Y = sequence_pair(30, 1)
+        self.assertEqual(record['status'], 'ok')
+        self.assertEqual(record['length'], FIGDP().score(X, Y, 2))
+        self.assertEqual(len(record['times']), 4)
+        self.assertGreater(record['peak_memory_mb'], 0)
+        
+    def test_timeout(self):
+        """Test that a cell exceeding the timeout is stopped."""
+        record = run_cell(('figdp', 'python', 2000, 3, 0), timeout=0.05)
+        self.assertEqual(record['status'], 'timeout')
+        self.assertEqual(record['times'], [])
+        
+    def test_resume_timeout(self):
+        """Test that timed-out cells are only retried under a larger limit."""
+        cells = [('figdp', 'python', 300, 3, 0)]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'checkpoint.jsonl')
+            record, = run_benchmark(cells, path, workers=1, repeat=1, timeout=0.001)
+            self.assertEqual((record['status'], record['timeout']), ('timeout', 0.001))
+            run_benchmark(cells, path, workers=1, repeat=1, timeout=0.0005)
+            with open(path) as f:
+                self.assertEqual(len(f.readlines()), 1)
+            record, = run_benchmark(cells, path, workers=1, repeat=1)
+            self.assertEqual((record['status'], record['timeout']), ('ok', None))
+            
+    def test_resume(self):
+        """Test that finished cells are checkpointed and not run again."""
+        cells = grid(['figdp', 'greedy'], [15], [1, 3], 2)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'checkpoint.jsonl')
+            first = run_benchmark(cells[:3], path, workers=1, repeat=1)
+            # A line cut short by an interrupted run is ignored
+            with open(path, 'a') as f:
+                f.write('{"key": "figdp/py')
+            records = run_benchmark(cells, path, workers=2, repeat=1)
+            self.assertEqual([r['key'] for r in records], [cell_key(cell) for cell in cells])
+            self.assertEqual(records[:3], first)
+            self.assertTrue(all(r['status'] == 'ok' for r in records))
+            self.assertEqual(len(load_checkpoint(path)), len(cells))
+            with open(path) as f:
+                self.assertEqual(len(f.readlines()), len(cells) + 1)
+            # Other settings do not reuse the records
+            records = run_benchmark(cells, path, workers=1, repeat=2)
+            self.assertTrue(all(len(r['times']) == 2 for r in records))
+            self.assertTrue(all(len(r['times']) == 2 for r in load_checkpoint(path).values()))
+
+if __name__ == '__main__':
+    unittest.main()
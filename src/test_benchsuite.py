@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+
+import unittest
+from benchsuite import BENCHMARKS, regressions, run_one, run_suite
+
+class TestBenchSuite(unittest.TestCase):
+    def test_run_one(self):
+        """Test the statistics of a timed function."""
+        calls = []
+        result = run_one(lambda: calls.append(1), 10, rounds=3, min_time=0.001)
+        self.assertEqual(len(calls), 1 + 3 * result['iterations'])
+        self.assertLessEqual(result['min'], result['median'])
+        self.assertLessEqual(result['median'], result['max'])
+        self.assertAlmostEqual(result['throughput'], 10 / result['min'])
+        
+    def test_run_suite(self):
+        """Test selecting benchmarks and the machine-readable result."""
+        self.assertTrue({'fill', 'rmq-query', 'traceback', 'greedy', 'macro'}
+                        <= {group for group, _, _ in BENCHMARKS.values()})
+        results = run_suite(select='rmq-query/sliding', rounds=2, min_time=0)
+        self.assertEqual([b['name'] for b in results['benchmarks']],
+                         ['rmq-query/sliding-K2', 'rmq-query/sliding-K8', 'rmq-query/sliding-K32'])
+        self.assertTrue(all(b['unit'] == 'queries' for b in results['benchmarks']))
+        self.assertGreater(results['calibration'], 0)
+        
+    def test_regressions(self):
+        """Test the comparison with a saved run."""
+        def run(calibration, **times):
+            return {'calibration': calibration,
+                    'benchmarks': [{'name': name, 'min': t} for name, t in times.items()]}
+        self.assertEqual(regressions(run(1.0, a=1.0, b=1.5), run(1.0, a=1.0, b=1.0)),
+                         [('b', 1.0, 1.5)])
+        self.assertEqual(regressions(run(2.0, a=2.0), run(1.0, a=1.0)), [])
+
+if __name__ == '__main__':
+    unittest.main()
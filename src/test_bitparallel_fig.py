@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+import unittest
+import random
+from fig_dp import FIGDP
+from rmq_fig import RMQFIG
+from bitparallel_fig import BitRows, match_masks, popcount
+
+class TestBitParallelFIG(unittest.TestCase):
+    def setUp(self):
+        """Set up random pairs, mostly DNA."""
+        rng = random.Random(14)
+        self.pairs = [("", "ACGT"), ("ACGT", "")]
+        for alphabet in ['AB', 'ACGT', 'ACGT', 'ABCDEFGHIJ']:
+            for _ in range(6):
+                X = ''.join(rng.choices(alphabet, k=rng.randint(1, 90)))
+                Y = ''.join(rng.choices(alphabet, k=rng.randint(1, 90)))
+                self.pairs.append((X, Y))
+        
+    def test_match_masks(self):
+        """Test the per-symbol position masks."""
+        self.assertEqual(match_masks("ACCA"), {'A': 0b1001, 'C': 0b0110})
+        self.assertEqual(popcount(0b1011), 3)
+        
+    def test_matches_reference(self):
+        """Test that cells, lengths and tracebacks match the reference solver."""
+        fig_dp = FIGDP()
+        for X, Y in self.pairs:
+            rows = BitRows(X, Y)
+            dp = fig_dp._table(X, Y, 0)
+            for i in range(len(X) + 1):
+                for j in range(len(Y) + 1):
+                    self.assertEqual(rows.value(i, j), dp[i][j])
+            for K in [0, 2, 9]:
+                length, lcs = fig_dp.solve(X, Y, K, record=False)
+                self.assertEqual(len(rows), length)
+                self.assertEqual(BitRows.score(X, Y), length)
+                self.assertEqual(rows.backtrack(X, Y, K), lcs)
+                
+    def test_solver_engines(self):
+        """Test the bitparallel engine of both solvers."""
+        solvers = [FIGDP('bitparallel'), RMQFIG(engine='bitparallel')]
+        for X, Y in self.pairs:
+            expected = {K: FIGDP().solve(X, Y, K, record=False) for K in [1, 3]}
+            for solver in solvers:
+                self.assertEqual(solver.solve(X, Y, 3), expected[3])
+                self.assertEqual(solver.score(X, Y, 3), expected[3][0])
+                self.assertEqual(solver.solve_multi_k(X, Y, [1, 3]), expected)
+
+if __name__ == '__main__':
+    unittest.main()
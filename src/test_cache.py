@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+import unittest
+import os
+import tempfile
+from unittest import mock
+from cache import CachedSolver, ResultCache, sequence_hash
+from fig_dp import FIGDP
+from rmq_fig import RMQFIG
+from lcs_fig_greedy import GreedyLCSFIG
+
+class TestResultCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        """Test that the least recently used result is evicted first."""
+        cache = ResultCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.stats(), {'hits': 2, 'misses': 1, 'disk_hits': 0,
+                                         'hit_rate': 2 / 3, 'size': 2})
+        with self.assertRaises(ValueError):
+            ResultCache(maxsize=0)
+            
+    def test_persistence(self):
+        """Test that results stored in SQLite are found by a new cache."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'results.sqlite')
+            cache = ResultCache(path=path)
+            cache.put('key', [3, ['A', 'C']])
+            cache.close()
+            cache = ResultCache(path=path)
+            self.assertEqual(cache.get('key'), [3, ['A', 'C']])
+            self.assertEqual(cache.disk_hits, 1)
+            cache.clear()
+            self.assertIsNone(cache.get('key'))
+            cache.close()
+            
+    def test_sequence_hash(self):
+        """Test that equal sequences hash equal and different ones differ."""
+        self.assertEqual(sequence_hash("ACGT"), sequence_hash("AC" + "GT"))
+        self.assertNotEqual(sequence_hash("ACGT"), sequence_hash("ACGA"))
+
+class TestCachedSolver(unittest.TestCase):
+    def test_solvers(self):
+        """Test that cached results equal direct ones and repeats hit the cache."""
+        X, Y, K = "ACGTTGCAAC", "AGTCGATCA", 2
+        for solver in [FIGDP(), RMQFIG(), FIGDP('bitparallel')]:
+            cached = CachedSolver(solver)
+            expected = solver.solve(X, Y, K)
+            self.assertEqual(cached.solve(X, Y, K), expected)
+            with mock.patch.object(solver, 'solve') as solve:
+                self.assertEqual(cached.solve(X, Y, K), expected)
+                solve.assert_not_called()
+            self.assertEqual(cached.score(X, Y, K), expected[0])
+            self.assertEqual(cached.score(X, Y, K), expected[0])
+            self.assertEqual(cached.cache.stats()['hits'], 2)
+            self.assertEqual(cached.cache.stats()['misses'], 2)
+            
+    def test_greedy(self):
+        """Test caching the greedy algorithm."""
+        cached = CachedSolver(GreedyLCSFIG)
+        length, _ = GreedyLCSFIG("ABCDE", "ACE", 1).solve()
+        self.assertEqual(cached.solve("ABCDE", "ACE", 1)[0], length)
+        self.assertEqual(cached.solve("ABCDE", "ACE", 1)[0], length)
+        self.assertEqual(cached.score("ABCDE", "ACE", 1), length)
+        self.assertEqual(cached.cache.hits, 2)
+        
+    def test_keys_separate_configurations(self):
+        """Test that K, engines and options are part of the key."""
+        cache = ResultCache()
+        CachedSolver(FIGDP(), cache).solve("ACGT", "AGT", 1)
+        for solver, K, options in [(FIGDP(), 2, {}), (FIGDP('numpy'), 1, {}),
+                                   (RMQFIG(), 1, {}), (FIGDP(), 1, {'band': 0})]:
+            CachedSolver(solver, cache).solve("ACGT", "AGT", K, **options)
+        self.assertEqual(cache.misses, 5)
+        CachedSolver(FIGDP(), cache).solve("ACGT", "AGT", 1, record=False)
+        self.assertEqual(cache.hits, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+
+import unittest
+import numpy as np
+from encoding import encode_pair, table_dtype
+
+class TestEncoding(unittest.TestCase):
+    def test_ascii(self):
+        """Test that ASCII sequences are encoded as their bytes."""
+        x, y = encode_pair("ACGT", "TTGA")
+        self.assertEqual(x.dtype, np.uint8)
+        self.assertEqual(bytes(x), b"ACGT")
+        self.assertEqual(bytes(y), b"TTGA")
+        
+    def test_order_preserved(self):
+        """Test that codes compare like the characters they encode."""
+        for X, Y in [("ACGN", "NGCA"), ("hello", "world"), ("αβγ", "γaβ"), ("", "xyz")]:
+            x, y = encode_pair(X, Y)
+            for i, a in enumerate(X):
+                for j, b in enumerate(Y):
+                    self.assertEqual(x[i] == y[j], a == b)
+                    self.assertEqual(x[i] < y[j], a < b)
+                    
+    def test_table_dtype(self):
+        """Test that DP tables get the smallest dtype holding the answer."""
+        self.assertEqual(table_dtype(1000, 255), np.uint8)
+        self.assertEqual(table_dtype(256, 300), np.uint16)
+        self.assertEqual(table_dtype(70000, 70000), np.uint32)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,22 +1,23 @@
-import numpy as np
 import matplotlib.pyplot as plt
 from fig_dp import FIGDP
+from workload import DNA, uniform, uniform_pair
 import time
+import unittest
 from datetime import datetime
 
-def generate_random_dna_sequence(n: int) -> str:
+def generate_random_dna_sequence(n: int, seed: int) -> str:
     """
     Generate a random DNA sequence of length n.
     Uses standard DNA nucleotides: A (Adenine), C (Cytosine), G (Guanine), T (Thymine)
     
     Args:
         n: Length of the sequence to generate
+        seed: Seed making the sequence reproducible
         
     Returns:
         A random DNA sequence of length n
     """
-    nucleotides = ['A', 'C', 'G', 'T']
-    return ''.join(np.random.choice(nucleotides, size=n))
+    return uniform(n, DNA, seed)
 
 def format_sequence(seq: str, line_length: int = 80) -> str:
     """Format a DNA sequence with line breaks and position markers."""
@@ -27,6 +28,61 @@ def format_sequence(seq: str, line_length: int = 80) -> str:
         lines.append(f"{pos} {chunk}")
     return '\n'.join(lines)
 
+class TestFIGDP(unittest.TestCase):
+    def setUp(self):
+        """Set up test cases."""
+        self.fig_dp = FIGDP()
+        
+    def test_basic_functionality(self):
+        """Test basic functionality with simple sequences."""
+        test_cases = [
+            ("ABCDE", "ACE", 1, 3),
+            ("ABCDE", "ABCDE", 1, 5),
+            ("ABCDE", "XYZ", 1, 0),
+            ("AAAAAA", "AAA", 2, 3),
+        ]
+        
+        for X, Y, K, expected_length in test_cases:
+            length, subsequence = self.fig_dp.solve(X, Y, K)
+            self.assertEqual(length, expected_length)
+            
+    def test_score(self):
+        """Test that the length-only score matches solve."""
+        for size, K in [(1, 0), (30, 0), (40, 3), (25, 40)]:
+            X, Y = uniform_pair(size, size + 7, seed=size)
+            length, _ = self.fig_dp.solve(X, Y, K)
+            self.assertEqual(self.fig_dp.score(X, Y, K), length)
+        self.assertEqual(self.fig_dp.score("ACGT", "", 2), 0)
+        
+    def test_solve_multi_k(self):
+        """Test that one multi-K solve matches a solve per K for each engine."""
+        ks = [6, 0, 2, 1]
+        for size in [0, 45]:
+            X, Y = uniform_pair(size, size + 5, seed=size)
+            expected = {K: self.fig_dp.solve(X, Y, K) for K in ks}
+            for engine in ['python', 'numpy']:
+                self.assertEqual(FIGDP(engine).solve_multi_k(X, Y, ks), expected)
+        self.assertEqual(self.fig_dp.solve_multi_k("AC", "CA", []), {})
+        
+    def test_numpy_engine(self):
+        """Test that the vectorized engine matches the reference loops."""
+        fig_np = FIGDP(engine='numpy')
+        for size, K in [(1, 0), (60, 0), (80, 4), (50, 70)]:
+            X, Y = uniform_pair(size, size + 3, seed=size)
+            expected = self.fig_dp.solve(X, Y, K)
+            self.assertEqual(fig_np.solve(X, Y, K), expected)
+            self.assertEqual(fig_np.score(X, Y, K), expected[0])
+        self.assertEqual(fig_np.solve("ACGT", "", 1), (0, []))
+        with self.assertRaises(ValueError):
+            FIGDP(engine='unknown')
+            
+    def test_solve_bounded(self):
+        """Test that the bounded-memory traceback matches solve."""
+        for size, K in [(1, 0), (90, 0), (150, 3), (80, 12)]:
+            X, Y = uniform_pair(size, size // 2 + 1, seed=size)
+            length, subsequence = self.fig_dp.solve(X, Y, K)
+            self.assertEqual(self.fig_dp.solve_bounded(X, Y, K), (length, subsequence))
+
 def run_experiments():
     """Run experiments with varying input sizes and gap constraints."""
     sizes = [100, 200, 400, 800, 1600, 3200]
@@ -35,8 +91,8 @@ def run_experiments():
     
     for size in sizes:
         print(f"Testing with size {size}...")
-        seq1 = generate_random_dna_sequence(size)
-        seq2 = generate_random_dna_sequence(size)
+        seq1 = generate_random_dna_sequence(size, seed=2 * size)
+        seq2 = generate_random_dna_sequence(size, seed=2 * size + 1)
         
         for k in gap_constraints:
             # Run multiple times to get average
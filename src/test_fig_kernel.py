@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+import unittest
+import importlib.util
+import random
+from unittest import mock
+import numpy as np
+import fig_kernel
+from fig_dp import FIGDP
+from rmq_fig import RMQFIG
+from predecessors import PredecessorTable
+
+HAS_NUMBA = importlib.util.find_spec('numba') is not None
+
+def random_pairs(count: int, seed: int):
+    """Generate random (X, Y, K) cases including degenerate ones."""
+    rng = random.Random(seed)
+    cases = [("", "ACGT", 2), ("ACGT", "", 0), ("A", "A", 0), ("ABCDE", "ACE", 1)]
+    for _ in range(count):
+        alphabet = rng.choice(['AC', 'ACGT', 'ABCDEFGHIJ'])
+        X = ''.join(rng.choices(alphabet, k=rng.randint(1, 45)))
+        Y = ''.join(rng.choices(alphabet, k=rng.randint(1, 45)))
+        cases.append((X, Y, rng.choice([0, 1, 3, 7, 50])))
+    return cases
+
+class TestFillRows(unittest.TestCase):
+    """Run the kernel uncompiled against the FIG-DP reference."""
+    def setUp(self):
+        self.reference = FIGDP()
+        
+    def test_table_and_predecessors(self):
+        """Test the full table fill and recorded predecessors."""
+        for X, Y, K in random_pairs(25, 1):
+            prev = PredecessorTable(len(X), len(Y), K)
+            dp = fig_kernel.solve_table(fig_kernel.fill_rows, X, Y, K, prev.codes)
+            length, subsequence = self.reference.solve(X, Y, K)
+            self.assertEqual(dp[len(X)][len(Y)], length)
+            self.assertEqual(prev.backtrack(X, dp), subsequence)
+            
+    def test_score_and_bands(self):
+        """Test the ring-buffer score and chunked band rows."""
+        for X, Y, K in random_pairs(15, 2):
+            length, _ = self.reference.solve(X, Y, K)
+            self.assertEqual(fig_kernel.score(fig_kernel.fill_rows, X, Y, K), length)
+            rows = list(fig_kernel.band_rows(fig_kernel.fill_rows, [np.zeros(len(Y)+1, dtype=int)],
+                                             0, len(X), X, Y, K, chunk=4))
+            self.assertEqual(len(rows), len(X))
+            if rows:
+                self.assertEqual(rows[-1][-1], length)
+
+@unittest.skipUnless(HAS_NUMBA, "numba is not installed")
+class TestNumbaEngine(unittest.TestCase):
+    def test_equivalence(self):
+        """Test the compiled engine of both solvers against the references."""
+        reference = FIGDP()
+        fig_dp = FIGDP(engine='numba')
+        rmq_fig = RMQFIG(engine='numba')
+        self.assertIsNotNone(fig_dp._compiled)
+        for X, Y, K in random_pairs(30, 3):
+            expected = reference.solve(X, Y, K)
+            for solver in (fig_dp, rmq_fig):
+                self.assertEqual(solver.solve(X, Y, K), expected)
+                self.assertEqual(solver.score(X, Y, K), expected[0])
+                self.assertEqual(solver.solve_bounded(X, Y, K), expected)
+
+class TestFallback(unittest.TestCase):
+    def test_without_numba(self):
+        """Test that engine='numba' falls back when Numba is missing."""
+        with mock.patch.object(fig_kernel, 'load_kernel', return_value=None):
+            fig_dp = FIGDP(engine='numba')
+            rmq_fig = RMQFIG(engine='numba')
+        self.assertIsNone(fig_dp._compiled)
+        self.assertIsNone(rmq_fig._compiled)
+        expected = FIGDP().solve("ACGTTGCA", "AGTCCA", 2)
+        self.assertEqual(fig_dp.solve("ACGTTGCA", "AGTCCA", 2), expected)
+        self.assertEqual(rmq_fig.solve("ACGTTGCA", "AGTCCA", 2), expected)
+
+if __name__ == '__main__':
+    unittest.main()
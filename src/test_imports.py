@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+
+import unittest
+import os
+import subprocess
+import sys
+
+# Modules a solve needs and what they may import besides NumPy and the
+# standard library
+CORE_MODULES = ['fig_dp', 'rmq_fig', 'lcs_fig_greedy', 'batch', 'incremental', 'cache',
+                'seqio', 'banded', 'sparse_fig', 'bitparallel_fig', 'instrument', 'metrics', 'lcsfig']
+
+# Only loaded when plotting, probing RSS, compiling or running a pool
+HEAVY_MODULES = ['matplotlib', 'psutil', 'numba', 'pandas', 'plotly',
+                 'concurrent.futures.process', 'multiprocessing.shared_memory']
+
+def loaded_modules(statement: str) -> set:
+    """Get the modules loaded in a fresh interpreter after running statement."""
+    code = f"import sys\n{statement}\nprint('\\n'.join(sys.modules))"
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                         cwd=os.path.dirname(os.path.abspath(__file__)))
+    return set(out.stdout.split())
+
+class TestImports(unittest.TestCase):
+    def test_core_is_import_light(self):
+        """Test that importing the core solvers loads no heavy dependency."""
+        loaded = loaded_modules('\n'.join(f'import {name}' for name in CORE_MODULES))
+        self.assertEqual(loaded & set(HEAVY_MODULES), set())
+        
+    def test_greedy_is_pure_python(self):
+        """Test that the greedy solver does not import NumPy."""
+        loaded = loaded_modules("from lcs_fig_greedy import GreedyLCSFIG\n"
+                                "GreedyLCSFIG('ACGT', 'AGT', 1).solve()")
+        self.assertNotIn('numpy', loaded)
+        
+    def test_lazy_imports(self):
+        """Test that comparisons load matplotlib only to plot."""
+        loaded = loaded_modules("import compare_algorithms")
+        self.assertNotIn('matplotlib', loaded)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+
+import unittest
+import random
+from fig_dp import FIGDP
+from incremental import ENGINES, IncrementalSolver
+
+class TestIncrementalSolver(unittest.TestCase):
+    def test_matches_full_solve(self):
+        """Test that every prefix gets the length of a solve from scratch."""
+        rng = random.Random(18)
+        fig_dp = FIGDP()
+        for _ in range(10):
+            Y = ''.join(rng.choices('ACGT', k=rng.randint(0, 30)))
+            K = rng.randint(0, 4)
+            solvers = [IncrementalSolver(Y, K, engine) for engine in ENGINES]
+            X = ''
+            for _ in range(4):
+                chars = ''.join(rng.choices('ACGT', k=rng.randint(0, 7)))
+                X += chars
+                expected = fig_dp.score(X, Y, K)
+                for solver in solvers:
+                    self.assertEqual(solver.extend_x(chars), expected)
+                    self.assertEqual((solver.n, solver.length), (len(X), expected))
+                    
+    def test_invalid_engine(self):
+        """Test that unknown engines are rejected."""
+        with self.assertRaises(ValueError):
+            IncrementalSolver("ACGT", 1, engine='numpy')
+
+if __name__ == '__main__':
+    unittest.main()
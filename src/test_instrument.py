@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+import unittest
+from fig_dp import FIGDP
+from rmq_fig import RMQFIG
+from instrument import Instrumentation
+
+class TestInstrumentation(unittest.TestCase):
+    def test_solve_measurements(self):
+        """Test the phase timers, counters and memory peak of instrumented solves."""
+        X, Y, K = "ABCBDAB", "BDCABA", 2
+        for solver in (FIGDP, RMQFIG):
+            inst = Instrumentation()
+            length, lcs = solver(instrument=inst).solve(X, Y, K)
+            self.assertEqual((length, lcs), solver().solve(X, Y, K))
+            report = inst.report()
+            self.assertEqual(report['calls'], 1)
+            self.assertEqual(set(report['time']), {'fill', 'traceback'})
+            self.assertEqual(report['counters'], {'cells': 42, 'matches': 12, 'queries': 12})
+            self.assertGreater(inst.peak_memory, 0)
+            
+    def test_compact_engine_counters(self):
+        """Test that compact engines count no window queries."""
+        inst = Instrumentation(trace_memory=False)
+        solver = FIGDP(engine='bitparallel', instrument=inst)
+        self.assertEqual(solver.score("ACGT", "AGT", 1), 3)
+        solver.solve_multi_k("ACGT", "AGT", [0, 2])
+        self.assertEqual(inst.calls, 2)
+        self.assertEqual(inst.counters['queries'], 0)
+        self.assertEqual(inst.counters['cells'], 24)
+        self.assertEqual(inst.peak_memory, 0)
+        self.assertEqual(solver.performance_data['memory'], [])
+        
+    def test_recorded_memory(self):
+        """Test that performance_data holds the traced peak, or 0.0 without tracing."""
+        untraced = RMQFIG()
+        untraced.solve("ACGT", "AGT", 1)
+        self.assertEqual(untraced.performance_data['memory'], [0.0])
+        inst = Instrumentation()
+        traced = RMQFIG(instrument=inst)
+        traced.solve("ACGT", "AGT", 1)
+        self.assertEqual(traced.performance_data['memory'], [inst.last_peak / 1024 / 1024])
+        inst.reset()
+        self.assertEqual(inst.report()['calls'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
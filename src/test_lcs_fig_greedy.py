@@ -127,8 +127,8 @@ def run_experiments(test_dir):
         
         # Generate longer sequences for each size
         print("Generating random sequences...")
-        seq1 = GreedyLCSFIG.generate_random_dna_sequence(size)
-        seq2 = GreedyLCSFIG.generate_random_dna_sequence(size)
+        seq1 = GreedyLCSFIG.generate_random_dna_sequence(size, seed=2 * size)
+        seq2 = GreedyLCSFIG.generate_random_dna_sequence(size, seed=2 * size + 1)
         
         for k in gap_constraints:
             current_experiment += 1
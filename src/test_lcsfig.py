@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+import unittest
+import gzip
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from lcsfig import main, parse_pairs, read_pairs, run
+from fig_dp import FIGDP
+from lcs_fig_greedy import GreedyLCSFIG
+
+PAIRS = b"""# id x y
+ACGTAC AGTC
+p1\tGGATTA\tGATA
+
+TTTT ACGT
+"""
+
+class TestLCSFIG(unittest.TestCase):
+    def setUp(self):
+        """Set up the pairs of PAIRS and a temporary directory."""
+        self.pairs = [('ACGTAC', 'AGTC'), ('GGATTA', 'GATA'), ('TTTT', 'ACGT')]
+        self.K = 2
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_cli(self, data: bytes, *args: str) -> subprocess.CompletedProcess:
+        """Run lcsfig.py as a script with data on standard input."""
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lcsfig.py')
+        return subprocess.run([sys.executable, script] + list(args), input=data,
+                              capture_output=True)
+
+    def test_parse_pairs(self):
+        """Test both line layouts, comments and malformed lines."""
+        parsed = list(parse_pairs(PAIRS.splitlines()))
+        self.assertEqual([(X, Y) for _, X, Y in parsed], self.pairs)
+        self.assertEqual([fields for fields, _, _ in parsed], [{}, {'id': 'p1'}, {}])
+        with self.assertRaises(ValueError):
+            list(parse_pairs([b'A C G T']))
+
+    def test_records(self):
+        """Test that FASTA/FASTQ records are paired and the format detected."""
+        fasta = b"\n>a\nACG\nT\n>b first\nAGT\n"
+        self.assertEqual(list(read_pairs(fasta.splitlines(True))),
+                         [({'x': 'a', 'y': 'b first'}, 'ACGT', 'AGT')])
+        fastq = b"@r1\nACGT\n+\nIIII\n@r2\nCG\n+\nII\n"
+        self.assertEqual(list(read_pairs(fastq.splitlines(True), 'fastq')),
+                         [({'x': 'r1', 'y': 'r2'}, 'ACGT', 'CG')])
+        with self.assertRaises(ValueError):
+            list(read_pairs(b">a\nACGT\n".splitlines(True)))
+
+    def test_run(self):
+        """Test the JSON lines of every worker count against direct solves."""
+        fig_dp = FIGDP()
+        expected = [fig_dp.solve(X, Y, self.K) for X, Y in self.pairs]
+        for workers in [1, 2]:
+            out = io.StringIO()
+            count = run(read_pairs(PAIRS.splitlines()), self.K, out, workers=workers,
+                        algorithm='figdp', ordered=True, chunk_size=1)
+            self.assertEqual(count, len(self.pairs))
+            results = [json.loads(line) for line in out.getvalue().splitlines()]
+            self.assertEqual([r['index'] for r in results], [0, 1, 2])
+            self.assertEqual(results[1]['id'], 'p1')
+            for result, (length, subsequence) in zip(results, expected):
+                self.assertEqual((result['length'], result['lcs']), (length, ''.join(subsequence)))
+        out = io.StringIO()
+        run(read_pairs(PAIRS.splitlines()), self.K, out, algorithm='greedy')
+        for line, (X, Y) in zip(out.getvalue().splitlines(), self.pairs):
+            self.assertEqual(json.loads(line)['length'], GreedyLCSFIG(X, Y, self.K).solve()[0])
+            self.assertNotIn('lcs', json.loads(line))
+
+    def test_command_line(self):
+        """Test reading standard input and gzip files, and errors."""
+        done = self.run_cli(PAIRS, '-k', str(self.K), '--length-only', '--workers', '2',
+                            '--ordered')
+        self.assertEqual(done.returncode, 0, done.stderr)
+        lengths = [json.loads(line)['length'] for line in done.stdout.splitlines()]
+        self.assertEqual(lengths, [FIGDP().score(X, Y, self.K) for X, Y in self.pairs])
+        path = os.path.join(self.tmp.name, 'pairs.txt.gz')
+        with gzip.open(path, 'wb') as f:
+            f.write(PAIRS)
+        out = io.StringIO()
+        stdout, sys.stdout = sys.stdout, out
+        try:
+            self.assertEqual(main(['-k', str(self.K), '-a', 'rmqfig', path, path]), 0)
+        finally:
+            sys.stdout = stdout
+        self.assertEqual(len(out.getvalue().splitlines()), 2 * len(self.pairs))
+        done = self.run_cli(b'A C G T\n', '-k', '1')
+        self.assertEqual(done.returncode, 1)
+        self.assertIn(b'Line 1', done.stderr)
+
+    def test_broken_pipe(self):
+        """Test that a reader closing the pipe early is not an error."""
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lcsfig.py')
+        path = os.path.join(self.tmp.name, 'pairs.txt')
+        with open(path, 'wb') as f:
+            f.write(b'ACGTACGT ACGTTCGT\n' * 50000)
+        process = subprocess.Popen([sys.executable, script, '-k', '2', path],
+                                   stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        process.stdout.readline()
+        process.stdout.close()
+        self.assertEqual(process.wait(), 0)
+        self.assertEqual(process.stderr.read(), b'')
+        process.stderr.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+import unittest
+import csv
+import json
+import os
+import random
+import tempfile
+import numpy as np
+from metrics import MetricsRecorder, QuantileSketch, SKETCH_ACCURACY
+from lcs_fig_greedy import GreedyLCSFIG
+from fig_dp import FIGDP
+
+class TestMetricsRecorder(unittest.TestCase):
+    def test_ring_buffer(self):
+        """Test that only the last capacity records are kept, oldest first."""
+        recorder = MetricsRecorder(('x', 'y'), capacity=5)
+        for i in range(12):
+            recorder.record(x=i, y=2 * i)
+        self.assertEqual(len(recorder), 5)
+        self.assertEqual(recorder.count, 12)
+        self.assertEqual(recorder['x'], [7, 8, 9, 10, 11])
+        self.assertEqual(recorder['y'], [14, 16, 18, 20, 22])
+        
+    def test_streaming_statistics(self):
+        """Test the all-time statistics against NumPy on the full stream."""
+        rng = random.Random(20)
+        values = [rng.expovariate(1.0) for _ in range(5000)]
+        recorder = MetricsRecorder(('x',), capacity=10)
+        for x in values:
+            recorder.record(x=x)
+        summary = recorder.summary()['x']
+        self.assertEqual(summary['count'], 5000)
+        self.assertAlmostEqual(summary['mean'], np.mean(values))
+        self.assertAlmostEqual(summary['std'], np.std(values, ddof=1))
+        self.assertEqual((summary['min'], summary['max']), (min(values), max(values)))
+        for p in (50, 90, 99):
+            exact = np.percentile(values, p)
+            self.assertLess(abs(summary[f'p{p}'] - exact), 2 * SKETCH_ACCURACY * exact)
+            
+    def test_sketch_zeros_and_empty(self):
+        """Test quantiles of an empty sketch and of zero values."""
+        sketch = QuantileSketch()
+        self.assertTrue(np.isnan(sketch.quantile(0.5)))
+        for x in [0, 0, 0, 100]:
+            sketch.add(x)
+        self.assertEqual(sketch.quantile(0.5), 0.0)
+        self.assertAlmostEqual(sketch.quantile(1.0), 100, delta=100 * SKETCH_ACCURACY)
+        
+    def test_export(self):
+        """Test the JSON and CSV exports."""
+        recorder = MetricsRecorder(('time', 'length'), capacity=3)
+        for i in range(4):
+            recorder.record(time=0.5 * i, length=i)
+        with tempfile.TemporaryDirectory() as tmp:
+            recorder.to_json(os.path.join(tmp, 'metrics.json'))
+            with open(os.path.join(tmp, 'metrics.json')) as f:
+                data = json.load(f)
+            self.assertEqual(data['count'], 4)
+            self.assertEqual(data['records']['length'], [1, 2, 3])
+            self.assertEqual(data['summary']['length']['mean'], 1.5)
+            recorder.to_csv(os.path.join(tmp, 'metrics.csv'))
+            with open(os.path.join(tmp, 'metrics.csv'), newline='') as f:
+                rows = list(csv.reader(f))
+            self.assertEqual(rows, [['time', 'length'], ['0.5', '1.0'], ['1.0', '2.0'], ['1.5', '3.0']])
+            
+    def test_solvers_share_recorder(self):
+        """Test that the solvers record into bounded recorders."""
+        fig_dp = FIGDP()
+        fig_dp.performance_data = MetricsRecorder(fig_dp.performance_data.fields, capacity=2)
+        for _ in range(3):
+            fig_dp.solve("ACGT", "AGT", 1)
+        self.assertEqual(len(fig_dp.performance_data), 2)
+        self.assertEqual(fig_dp.get_average_performance()['avg_length'], 3)
+        greedy = GreedyLCSFIG("ACGT", "ACGT", 0)
+        self.assertEqual(greedy.get_performance_data()['num_runs'], 0)
+        greedy.solve()
+        self.assertEqual(greedy.get_performance_data()['avg_length'], 4)
+        
+    def test_invalid_capacity(self):
+        """Test that empty ring buffers are rejected."""
+        with self.assertRaises(ValueError):
+            MetricsRecorder(('x',), capacity=0)
+
+if __name__ == '__main__':
+    unittest.main()
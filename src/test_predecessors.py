@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+
+import unittest
+import numpy as np
+import random
+from predecessors import PredecessorTable, bounded_backtrack
+from fig_dp import FIGDP
+
+class TestPredecessorTable(unittest.TestCase):
+    def test_set_get(self):
+        """Test that predecessors round-trip through the packed codes."""
+        K = 4
+        prev = PredecessorTable(10, 10, K)
+        self.assertEqual(prev.codes.dtype, np.uint16)
+        self.assertIsNone(prev.get(5, 5))
+        for pi, pj in [(5, 5), (9, 9), (5, 9), (9, 5)]:
+            prev.set(10, 10, pi, pj)
+            self.assertEqual(prev.get(10, 10), (pi, pj))
+        prev.set(6, 6, 1, 5)
+        self.assertEqual(prev.get(6, 6), (1, 5))
+        prev.set(6, 7, 5, 2)
+        self.assertEqual(prev.get(6, 7), (5, 2))
+        
+    def test_wide_gap(self):
+        """Test that large K falls back to a wider dtype."""
+        prev = PredecessorTable(400, 400, 300)
+        self.assertEqual(prev.codes.dtype, np.uint32)
+        prev.set(400, 400, 99, 100)
+        self.assertEqual(prev.get(400, 400), (99, 100))
+        
+    def test_backtrack(self):
+        """Test following predecessors and table moves."""
+        X = "AB"
+        dp = np.array([[0, 0, 0], [0, 1, 1], [0, 1, 2]])
+        prev = PredecessorTable(2, 2, 1)
+        prev.set(2, 2, 1, 1)
+        self.assertEqual(prev.backtrack(X, dp), ['B'])
+
+class TestBoundedBacktrack(unittest.TestCase):
+    def test_leaf_sizes(self):
+        """Test that the recursion depth does not change the traceback."""
+        random.seed(2)
+        fig_dp = FIGDP()
+        X = ''.join(random.choices('ACGT', k=70))
+        Y = ''.join(random.choices('ACGT', k=40))
+        for K in [0, 1, 4]:
+            expected = fig_dp.solve(X, Y, K)
+            band_rows = lambda band, lo, hi, Yp: fig_dp._band_rows(band, lo, hi, X, Yp, K)
+            for leaf_rows in [1, 5, 100]:
+                self.assertEqual(bounded_backtrack(X, Y, K, band_rows, leaf_rows), expected)
+
+if __name__ == '__main__':
+    unittest.main()
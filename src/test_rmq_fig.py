@@ -4,19 +4,22 @@ import unittest
 import random
 import string
 import os
-from rmq_fig import RMQFIG
+import numpy as np
+from rmq_fig import RMQFIG, RMQStructure, RMQ_BACKENDS
+from fig_dp import FIGDP
 
 class TestRMQFIG(unittest.TestCase):
     def setUp(self):
         """Set up test cases."""
         self.rmq_fig = RMQFIG()
+        self.rng = random.Random(13)
         self.test_dir = "test_results"
         if not os.path.exists(self.test_dir):
             os.makedirs(self.test_dir)
             
     def generate_random_sequence(self, length: int) -> str:
         """Generate random sequence of given length."""
-        return ''.join(random.choices(string.ascii_uppercase, k=length))
+        return ''.join(self.rng.choices(string.ascii_uppercase, k=length))
     
     def test_basic_functionality(self):
         """Test basic functionality with simple sequences."""
@@ -108,11 +111,76 @@ class TestRMQFIG(unittest.TestCase):
         self.assertIn('avg_memory', avg_perf)
         self.assertIn('avg_length', avg_perf)
         
+    def test_matches_fig_dp(self):
+        """Test that RMQ-FIG reproduces the FIG-DP reference."""
+        random.seed(7)
+        fig_dp = FIGDP()
+        for _ in range(30):
+            X = ''.join(random.choices('ACGT', k=random.randint(0, 25)))
+            Y = ''.join(random.choices('ACGT', k=random.randint(0, 25)))
+            K = random.randint(0, 5)
+            self.assertEqual(self.rmq_fig.solve(X, Y, K), fig_dp.solve(X, Y, K))
+            
+    def test_backends(self):
+        """Test that every RMQ backend gives the same result."""
+        X = self.generate_random_sequence(40)
+        Y = self.generate_random_sequence(40)
+        expected = self.rmq_fig.solve(X, Y, 3)
+        for backend in RMQ_BACKENDS:
+            self.assertEqual(RMQFIG(backend=backend).solve(X, Y, 3), expected)
+        with self.assertRaises(ValueError):
+            RMQFIG(backend='unknown')
+        
+    def test_score(self):
+        """Test that the length-only score matches solve."""
+        for K in [0, 2, 6]:
+            X = self.generate_random_sequence(60)
+            Y = self.generate_random_sequence(45)
+            length, _ = self.rmq_fig.solve(X, Y, K)
+            self.assertEqual(self.rmq_fig.score(X, Y, K), length)
+        self.assertEqual(self.rmq_fig.score("", "ABC", 1), 0)
+        
+    def test_solve_multi_k(self):
+        """Test that one multi-K solve matches a solve per K."""
+        X = self.generate_random_sequence(50)
+        Y = self.generate_random_sequence(40)
+        ks = [0, 3, 1, 8]
+        expected = {K: self.rmq_fig.solve(X, Y, K) for K in ks}
+        self.assertEqual(self.rmq_fig.solve_multi_k(X, Y, ks), expected)
+        
+    def test_solve_bounded(self):
+        """Test that the bounded-memory traceback matches solve."""
+        random.seed(5)
+        for backend in RMQ_BACKENDS:
+            rmq_fig = RMQFIG(backend=backend)
+            X = ''.join(random.choices('ACGT', k=140))
+            Y = ''.join(random.choices('ACGT', k=50))
+            self.assertEqual(rmq_fig.solve_bounded(X, Y, 2), rmq_fig.solve(X, Y, 2))
+        
     def tearDown(self):
         """Clean up test files."""
         import shutil
         if os.path.exists(self.test_dir):
             shutil.rmtree(self.test_dir)
 
+class TestRMQStructure(unittest.TestCase):
+    def test_window_queries(self):
+        """Test window queries against brute-force maxima and their positions."""
+        rng = np.random.default_rng(3)
+        for n, m, K in [(1, 1, 0), (6, 9, 0), (12, 7, 2), (15, 15, 4), (5, 20, 30)]:
+            table = rng.integers(0, 10, size=(n+1, m+1))
+            table[0, :] = 0
+            table[:, 0] = 0
+            for backend in RMQ_BACKENDS:
+                rmq = RMQStructure(n, m, K, backend)
+                for i in range(1, n+1):
+                    for j in range(1, m+1):
+                        i1, j1 = max(0, i-K-1), max(0, j-K-1)
+                        window = table[i1:i, j1:j]
+                        di, dj = np.argwhere(window == window.max())[0]
+                        expected = (window.max(), i1 + di, j1 + dj)
+                        self.assertEqual(rmq.query(i1, i-1, j1, j-1), expected, backend)
+                        rmq.update(i, j, int(table[i, j]))
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+import unittest
+import gzip
+import os
+import tempfile
+from seqio import SequenceFile, read_records
+
+FASTA = b""">seq1 first
+ACGT
+ACG
+
+>seq2
+TTGA
+>empty
+"""
+
+FASTQ = b"""@read1
+ACGTN
++
+IIIII
+@read2
+GG
++read2
+II
+"""
+
+class TestSeqIO(unittest.TestCase):
+    def setUp(self):
+        """Set up a temporary directory for input and sequence files."""
+        self.tmp = tempfile.TemporaryDirectory()
+        
+    def tearDown(self):
+        self.tmp.cleanup()
+        
+    def write(self, name: str, data: bytes, compress: bool = False) -> str:
+        """Write data, optionally gzip-compressed, to a file in the temporary directory."""
+        path = os.path.join(self.tmp.name, name)
+        with (gzip.open(path, 'wb') if compress else open(path, 'wb')) as f:
+            f.write(data)
+        return path
+        
+    def test_read_fasta(self):
+        """Test that multi-line FASTA records are joined, plain and gzip."""
+        expected = [("seq1 first", b"ACGTACG"), ("seq2", b"TTGA"), ("empty", b"")]
+        self.assertEqual(list(read_records(self.write("a.fa", FASTA))), expected)
+        self.assertEqual(list(read_records(self.write("a.fa.gz", FASTA, compress=True))), expected)
+        
+    def test_read_fastq(self):
+        """Test that FASTQ records are detected and qualities skipped."""
+        expected = [("read1", b"ACGTN"), ("read2", b"GG")]
+        self.assertEqual(list(read_records(self.write("a.fq", b"\n" + FASTQ))), expected)
+        self.assertEqual(list(read_records(self.write("a.fq.gz", FASTQ, compress=True))), expected)
+        with self.assertRaises(ValueError):
+            list(read_records(self.write("bad.fq", b"@r\nAC\nII\n")))
+        with self.assertRaises(ValueError):
+            list(read_records(self.write("bad.fa", b"ACGT\n>r\nAC\n")))
+            
+    def test_sequence_file(self):
+        """Test that a sequence file maps the records it was created from."""
+        path = os.path.join(self.tmp.name, "seqs.bin")
+        store = SequenceFile.from_fastx(self.write("a.fa", FASTA + b">dup\nTTGA\n"), path)
+        self.assertEqual(len(store), 4)
+        self.assertEqual(list(store), ["ACGTACG", "TTGA", "", "TTGA"])
+        self.assertEqual(store.names, ["seq1 first", "seq2", "empty", "dup"])
+        self.assertEqual(bytes(store.view(1)), b"TTGA")
+        self.assertEqual(store.lengths().tolist(), [7, 4, 0, 4])
+        ids, records = store.unique()
+        self.assertEqual(ids.tolist(), [0, 1, 2, 1])
+        self.assertEqual(records, [0, 1, 2])
+        reopened = SequenceFile(path)
+        self.assertEqual(list(reopened), list(store))
+        empty = SequenceFile.create(os.path.join(self.tmp.name, "empty.bin"), [("e", "")])
+        self.assertEqual(list(empty), [""])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+
+import unittest
+import random
+from fig_dp import FIGDP
+from rmq_fig import RMQFIG
+from sparse_fig import MatchLevels, is_sparse, match_count
+
+class TestSparseFIG(unittest.TestCase):
+    def setUp(self):
+        """Set up random pairs over small and large alphabets."""
+        rng = random.Random(13)
+        self.pairs = []
+        for alphabet in ['AB', 'ACGT', 'ABCDEFGHIJKLMNOPQRSTUVWXYZ']:
+            for _ in range(8):
+                X = ''.join(rng.choices(alphabet, k=rng.randint(0, 40)))
+                Y = ''.join(rng.choices(alphabet, k=rng.randint(0, 40)))
+                self.pairs.append((X, Y))
+        
+    def test_match_count(self):
+        """Test the match count against the cells it counts."""
+        for X, Y in self.pairs:
+            self.assertEqual(match_count(X, Y), sum(a == b for a in X for b in Y))
+        self.assertTrue(is_sparse("ABCD", "EFGH"))
+        self.assertTrue(is_sparse("ABCD", "EFGA", density=0.1))
+        self.assertFalse(is_sparse("AAAA", "AAAA"))
+        
+    def test_matches_reference(self):
+        """Test that lengths, cells and tracebacks match the reference solver."""
+        fig_dp = FIGDP()
+        for X, Y in self.pairs:
+            levels = MatchLevels(X, Y)
+            for K in [0, 1, 4]:
+                length, lcs = fig_dp.solve(X, Y, K, record=False)
+                self.assertEqual(len(levels), length)
+                self.assertEqual(MatchLevels.score(X, Y), length)
+                self.assertEqual(levels.backtrack(X, Y, K), lcs)
+            dp = fig_dp._table(X, Y, 0)
+            for i in range(len(X) + 1):
+                for j in range(len(Y) + 1):
+                    self.assertEqual(levels.value(i, j), dp[i][j])
+                    
+    def test_solver_engines(self):
+        """Test the sparse and auto engines of both solvers."""
+        solvers = [FIGDP('sparse'), FIGDP('auto'), RMQFIG(engine='sparse'), RMQFIG(engine='auto')]
+        for X, Y in self.pairs:
+            expected = FIGDP().solve(X, Y, 2, record=False)
+            for solver in solvers:
+                self.assertEqual(solver.solve(X, Y, 2), expected)
+                self.assertEqual(solver.score(X, Y, 2), expected[0])
+                self.assertEqual(solver.solve_bounded(X, Y, 2), expected)
+
+if __name__ == '__main__':
+    unittest.main()
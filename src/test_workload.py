@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+import unittest
+from collections import Counter
+from workload import (DNA, PROTEIN, WORKLOADS, mutate, repetitive, skewed, uniform,
+                      workload_pair)
+from regression import compare
+
+class TestWorkload(unittest.TestCase):
+    def test_seeded(self):
+        """Test that every workload is reproducible from its seed."""
+        for name in WORKLOADS:
+            X, Y = workload_pair(name, 500, seed=4)
+            self.assertEqual((X, Y), workload_pair(name, 500, seed=4))
+            self.assertNotEqual((X, Y), workload_pair(name, 500, seed=5))
+            self.assertEqual(len(X), 500)
+            self.assertTrue(set(X + Y) <= set(DNA))
+            
+    def test_lengths_and_alphabet(self):
+        """Test requested lengths and alphabets."""
+        X, Y = workload_pair('uniform', 300, m=70, alphabet=PROTEIN, seed=1)
+        self.assertEqual((len(X), len(Y)), (300, 70))
+        self.assertEqual(set(X), set(PROTEIN))
+        self.assertEqual(uniform(0), '')
+        
+    def test_composition(self):
+        """Test the skewed composition and the repeat structure."""
+        counts = Counter(skewed(20000, weights=[8, 1, 1, 0], seed=2))
+        self.assertGreater(counts['A'], 7 * counts['C'])
+        self.assertEqual(counts['T'], 0)
+        seq = repetitive(1200, unit=6, rate=0.0, seed=3)
+        self.assertEqual(seq, seq[:6] * 200)
+        
+    def test_mutate(self):
+        """Test the number of differences a mutated copy has."""
+        seq = uniform(20000, seed=6)
+        self.assertEqual(mutate(seq, rate=0.0), seq)
+        substituted = mutate(seq, rate=0.1, indel_fraction=0.0, seed=7)
+        self.assertEqual(len(substituted), len(seq))
+        differences = sum(a != b for a, b in zip(seq, substituted))
+        self.assertAlmostEqual(differences / len(seq), 0.1, delta=0.01)
+        self.assertNotEqual(len(mutate(seq, rate=0.1, indel_fraction=1.0, seed=8)), len(seq))
+        
+    def test_unknown_workload(self):
+        """Test that unknown workloads are rejected."""
+        with self.assertRaises(ValueError):
+            workload_pair('random', 10)
+
+class TestRegression(unittest.TestCase):
+    def test_compare(self):
+        """Test that slowdowns beyond the scaled tolerance are reported."""
+        baseline = {'calibration': 1.0, 'cases': {'a': 1.0, 'b': 2.0, 'c': 1.0}}
+        current = {'calibration': 2.0, 'cases': {'a': 2.4, 'b': 5.2, 'd': 9.0}}
+        self.assertEqual(compare(current, baseline, tolerance=0.25), [('b', 4.0, 5.2)])
+        self.assertEqual(compare(current, baseline, tolerance=0.1), [('a', 2.0, 2.4), ('b', 4.0, 5.2)])
+
+    def test_compare_per_case(self):
+        """Test per-case calibrations and tolerances."""
+        baseline = {'calibration': {'a': 1.0, 'b': 1.0}, 'cases': {'a': 1.0, 'b': 1.0}}
+        current = {'calibration': {'a': 2.0, 'b': 1.0}, 'cases': {'a': 2.4, 'b': 1.4}}
+        cases = {'b': ('figdp', 'python', 'uniform', 10, 1, {}, 0.5)}
+        self.assertEqual(compare(current, baseline, tolerance=0.1, cases=cases), [('a', 2.0, 2.4)])
+        self.assertEqual(compare(current, baseline, tolerance=0.1, cases={}),
+                         [('a', 2.0, 2.4), ('b', 1.0, 1.4)])
+
+if __name__ == '__main__':
+    unittest.main()
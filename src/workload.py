@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Seeded, vectorized sequence workloads for reproducible benchmarks.
+
+Every generator draws from np.random.default_rng(seed), so the same seed
+gives the same sequences on every run and platform, and builds the
+sequence as one NumPy code array mapped onto the alphabet, so generating
+millions of characters takes milliseconds. WORKLOADS maps the name of each
+pair generator to it:
+
+- 'uniform': both sequences i.i.d. uniform over the alphabet
+- 'skewed': both sequences i.i.d. with a skewed symbol composition
+- 'repetitive': tandem repeats of a short unit with point mutations
+- 'mutated': a uniform sequence and a copy with substitutions and indels
+"""
+
+import numpy as np
+import string
+from typing import Optional, Sequence, Tuple
+
+DNA = 'ACGT'
+PROTEIN = 'ACDEFGHIKLMNPQRSTVWY'
+UPPERCASE = string.ascii_uppercase
+
+SeedLike = Optional[int]
+
+def _decode(codes: np.ndarray, alphabet: str) -> str:
+    """Map codes 0..len(alphabet)-1 onto the (ASCII) alphabet."""
+    symbols = np.frombuffer(alphabet.encode('ascii'), dtype=np.uint8)
+    return symbols[codes].tobytes().decode('ascii')
+
+def _encode(seq: str, alphabet: str) -> np.ndarray:
+    """Map a sequence over the (ASCII) alphabet onto codes."""
+    lookup = np.zeros(256, dtype=np.intp)
+    lookup[np.frombuffer(alphabet.encode('ascii'), dtype=np.uint8)] = np.arange(len(alphabet))
+    return lookup[np.frombuffer(seq.encode('ascii'), dtype=np.uint8)]
+
+def _mutate_codes(codes: np.ndarray, rate: float, size: int, rng: np.random.Generator,
+                  indel_fraction: float) -> np.ndarray:
+    """Substitute, delete or insert after each position with total probability rate."""
+    draws = rng.random(len(codes))
+    substitute = draws < rate * (1 - indel_fraction)
+    delete = (draws >= rate * (1 - indel_fraction)) & (draws < rate * (1 - indel_fraction / 2))
+    insert = (draws >= rate * (1 - indel_fraction / 2)) & (draws < rate)
+    # A substitution always picks a different symbol
+    codes = np.where(substitute, (codes + rng.integers(1, max(2, size), len(codes))) % size, codes)
+    counts = 1 - delete + insert
+    out = np.repeat(codes, counts)
+    # The inserted symbol is the second copy of its position
+    inserted = np.cumsum(counts)[insert] - 1
+    out[inserted] = rng.integers(0, size, len(inserted))
+    return out
+
+def uniform(n: int, alphabet: str = DNA, seed: SeedLike = 0) -> str:
+    """Generate a sequence of n symbols drawn uniformly from the alphabet."""
+    return _decode(np.random.default_rng(seed).integers(0, len(alphabet), n), alphabet)
+
+def skewed(n: int, alphabet: str = DNA, weights: Optional[Sequence[float]] = None,
+           seed: SeedLike = 0) -> str:
+    """
+    Generate a sequence with a skewed symbol composition.
+
+    Args:
+        n: Length
+        alphabet: Symbols
+        weights: Relative frequency of each symbol (default Zipf-like,
+            1/rank)
+        seed: Seed of the generator
+
+    Returns:
+        The sequence
+    """
+    if weights is None:
+        weights = 1 / np.arange(1, len(alphabet) + 1)
+    p = np.asarray(weights, dtype=float)
+    if len(p) != len(alphabet):
+        raise ValueError(f"Expected {len(alphabet)} weights, got {len(p)}")
+    rng = np.random.default_rng(seed)
+    return _decode(rng.choice(len(alphabet), size=n, p=p / p.sum()), alphabet)
+
+def repetitive(n: int, alphabet: str = DNA, unit: int = 12, rate: float = 0.02,
+               seed: SeedLike = 0) -> str:
+    """
+    Generate tandem repeats of a random unit with point substitutions.
+
+    Args:
+        n: Length
+        alphabet: Symbols
+        unit: Length of the repeated unit
+        rate: Substitution probability per position
+        seed: Seed of the generator
+
+    Returns:
+        The sequence
+    """
+    rng = np.random.default_rng(seed)
+    codes = np.resize(rng.integers(0, len(alphabet), max(1, unit)), n)
+    return _decode(_mutate_codes(codes, rate, len(alphabet), rng, 0.0), alphabet)
+
+def mutate(seq: str, rate: float = 0.05, alphabet: str = DNA, indel_fraction: float = 0.5,
+           seed: SeedLike = 0) -> str:
+    """
+    Copy a sequence with random substitutions, deletions and insertions.
+
+    Args:
+        seq: Sequence over the alphabet
+        rate: Probability that a position is mutated
+        alphabet: Symbols
+        indel_fraction: Share of the mutations that are indels, split
+            evenly between deletions and insertions
+        seed: Seed of the generator
+
+    Returns:
+        The mutated copy
+    """
+    rng = np.random.default_rng(seed)
+    return _decode(_mutate_codes(_encode(seq, alphabet), rate, len(alphabet), rng,
+                                 indel_fraction), alphabet)
+
+def uniform_pair(n: int, m: Optional[int] = None, alphabet: str = DNA,
+                 seed: SeedLike = 0) -> Tuple[str, str]:
+    """Generate two independent uniform sequences of lengths n and m (default n)."""
+    rng = np.random.default_rng(seed)
+    return (_decode(rng.integers(0, len(alphabet), n), alphabet),
+            _decode(rng.integers(0, len(alphabet), n if m is None else m), alphabet))
+
+def skewed_pair(n: int, m: Optional[int] = None, alphabet: str = DNA,
+                weights: Optional[Sequence[float]] = None, seed: SeedLike = 0) -> Tuple[str, str]:
+    """Generate two independent skewed sequences, see skewed()."""
+    seeds = np.random.SeedSequence(seed).spawn(2)
+    return (skewed(n, alphabet, weights, seeds[0]),
+            skewed(n if m is None else m, alphabet, weights, seeds[1]))
+
+def repetitive_pair(n: int, m: Optional[int] = None, alphabet: str = DNA, unit: int = 12,
+                    rate: float = 0.02, seed: SeedLike = 0) -> Tuple[str, str]:
+    """Generate two repeats of the same unit with independent substitutions."""
+    rng = np.random.default_rng(seed)
+    codes = rng.integers(0, len(alphabet), max(1, unit))
+    return tuple(_decode(_mutate_codes(np.resize(codes, length), rate, len(alphabet), rng, 0.0),
+                         alphabet)
+                 for length in (n, n if m is None else m))
+
+def mutated_pair(n: int, rate: float = 0.05, alphabet: str = DNA, indel_fraction: float = 0.5,
+                 seed: SeedLike = 0) -> Tuple[str, str]:
+    """Generate a uniform sequence of length n and a mutated copy, see mutate()."""
+    rng = np.random.default_rng(seed)
+    codes = rng.integers(0, len(alphabet), n)
+    return (_decode(codes, alphabet),
+            _decode(_mutate_codes(codes, rate, len(alphabet), rng, indel_fraction), alphabet))
+
+# Pair generators by name; all take (n, ..., seed=...)
+WORKLOADS = {
+    'uniform': uniform_pair,
+    'skewed': skewed_pair,
+    'repetitive': repetitive_pair,
+    'mutated': mutated_pair,
+}
+
+def workload_pair(name: str, n: int, seed: SeedLike = 0, **options) -> Tuple[str, str]:
+    """
+    Generate the sequence pair of a named workload.
+
+    Args:
+        name: One of WORKLOADS
+        n: Length of the first sequence (and, by default, the second)
+        seed: Seed of the generator
+        **options: Passed on to the generator, e.g. alphabet or rate
+
+    Returns:
+        The pair (X, Y)
+    """
+    if name not in WORKLOADS:
+        raise ValueError(f"Unknown workload '{name}', expected one of {list(WORKLOADS)}")
+    return WORKLOADS[name](n, seed=seed, **options)